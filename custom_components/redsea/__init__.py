@@ -28,6 +28,7 @@ except ImportError:  # pragma: no cover - depends on the installed HA version
     )
 import homeassistant.helpers.config_validation as cv
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
 from homeassistant.core import (
     HomeAssistant,
     ServiceCall,
@@ -70,6 +71,13 @@ from .coordinator import (
     ReefWaveCoordinator,
 )
 from .maintenance import MaintenanceStore, register_led_tasks
+from .snapshot import LayoutStore, SnapshotStore
+from .startup import (
+    DATA_STARTUP,
+    StartupOrchestrator,
+    async_leave_startup,
+    async_remove_setup_time,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -114,6 +122,14 @@ async def _migrate_head_device_names(hass: HomeAssistant, entry: ConfigEntry) ->
 # =============================================================================
 
 
+def _is_local_device(entry: ConfigEntry) -> bool:
+    """Return True for an entry of a physical local device."""
+    ip = entry.data.get(CONFIG_FLOW_IP_ADDRESS)
+    return CONFIG_FLOW_CLOUD_USERNAME not in entry.data and not (
+        isinstance(ip, str) and ip.startswith(VIRTUAL_LED)
+    )
+
+
 def _build_coordinator(hass: HomeAssistant, entry: ConfigEntry) -> ReefBeatCoordinator:
     """Create the correct coordinator for a local (non-cloud) device entry.
 
@@ -172,12 +188,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.exception(
             "Failed to create coordinator for entry_id=%s", entry.entry_id
         )
+        async_leave_startup(hass, entry.entry_id)
         return False
 
     try:
         await coordinator.async_setup()
     except Exception:
         _LOGGER.exception("Failed to setup coordinator for entry_id=%s", entry.entry_id)
+        async_leave_startup(hass, entry.entry_id)
         return False
 
     # Per-entry persistent storage for user-driven maintenance tasks.
@@ -227,6 +245,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the persisted device state of a removed config entry."""
+    hw_model = str(entry.data.get(CONFIG_FLOW_HW_MODEL, ""))
+    await SnapshotStore(hass, entry.entry_id, hw_model).async_remove()
+    await LayoutStore(hass, entry.entry_id, hw_model).async_remove()
+    await async_remove_setup_time(hass, entry.entry_id)
+
+
 # Frontend resources
 _FRONTEND_DIR = Path(__file__).parent / "frontend"
 _ICONS_JS_URL = f"/{DOMAIN}/frontend/redsea-icons.js"
@@ -242,6 +268,22 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     # at integration setup so const.py stays the single source of truth.
     register_led_tasks(HW_G1_LED_IDS + HW_G2_LED_IDS)
 
+    # Local devices set up while Home Assistant starts fetch their initial
+    # data in phases, with a shared concurrency budget (see startup.py).
+    if str(hass.state) != "RUNNING":
+        local_entries = [
+            entry.entry_id
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.disabled_by is None and _is_local_device(entry)
+        ]
+        if local_entries:
+            orchestrator = StartupOrchestrator(hass, local_entries)
+            await orchestrator.async_load()
+            hass.data[DATA_STARTUP] = orchestrator
+            hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_STARTED, orchestrator.async_started
+            )
+
     # Serve the frontend/ directory as a static path and register the icon JS
     if hass.http:
         await hass.http.async_register_static_paths(
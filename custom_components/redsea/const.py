@@ -10,6 +10,7 @@ This module contains:
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Final, TypedDict
 
 # -----------------------------------------------------------------------------
@@ -89,6 +90,8 @@ DO_NOT_REFRESH_TIME: Final[int] = 2  # seconds
 REFRESH_DEVICE_DELAY: Final[int] = (
     2  # Time to wait for device to take data refresh into account
 )
+# Pushes of the same source within this window are merged into one request
+WRITE_DEBOUNCE_DELAY: Final[float] = 0.25  # seconds
 # Switching a pump to (or from) sensor control makes it ramp to a new speed:
 # wait a bit longer before reading /dashboard back
 SENSOR_CONTROLLED_REFRESH_DELAY: Final[int] = 3
@@ -96,6 +99,80 @@ DEFAULT_TIMEOUT: Final[int] = 20
 
 HTTP_MAX_RETRY: Final[int] = 5
 HTTP_DELAY_BETWEEN_RETRY: Final[int] = 2
+# Retry delays double from HTTP_DELAY_BETWEEN_RETRY up to this, +/- jitter
+HTTP_RETRY_DELAY_MAX: Final[int] = 10  # seconds
+HTTP_RETRY_JITTER: Final[float] = 0.2
+
+# Per-device circuit breaker: requests in a row that did not reach the device
+# (retries included) before it is considered offline, then seconds before
+# probing it again (doubling on each failed probe, up to the max)
+BREAKER_FAILURE_THRESHOLD: Final[int] = 3
+BREAKER_RESET_TIMEOUT: Final[int] = 30
+BREAKER_RESET_TIMEOUT_MAX: Final[int] = 600
+
+# Requests in flight to one device at a time. Older firmwares (ReefWave,
+# RSLED90 without /dashboard) drop connections beyond a couple.
+REQUEST_CONCURRENCY: Final[int] = 4
+LEGACY_REQUEST_CONCURRENCY: Final[int] = 2
+# Seconds an idle connection to a device is kept for reuse. The device HTTP
+# servers close idle connections after a few seconds (sooner on older models):
+# connections are reused within a poll, not from one poll to the next.
+DEVICE_KEEPALIVE_TIMEOUT: Final[float] = 5.0
+LEGACY_KEEPALIVE_TIMEOUT: Final[float] = 2.0
+
+# Per-source request metrics: upper bounds of the latency histogram buckets
+# (ms), and number of most recent requests behind the latency percentiles and
+# failure rate
+METRICS_LATENCY_BUCKETS: Final[tuple[int, ...]] = (
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+)
+METRICS_WINDOW: Final[int] = 200
+
+# Seconds between two writes of a device state snapshot to .storage (taken
+# after successful polls, restored on the next startup)
+SNAPSHOT_SAVE_DELAY: Final[int] = 300
+
+# Startup orchestration (startup.py): local devices set up while Home Assistant
+# starts run each phase of their initial fetch (device-info, config, data)
+# together, at most this many devices at a time
+STARTUP_CONCURRENCY: Final[int] = 4
+# Longest wait (s) for the other devices to finish a phase before the next
+STARTUP_PHASE_WAIT: Final[int] = 15
+
+# Parsed JSONPath expressions kept in the process-wide parse() cache
+JSONPATH_CACHE_SIZE: Final[int] = 1024
+
+# -----------------------------------------------------------------------------
+# Per-source polling
+# -----------------------------------------------------------------------------
+
+# Polling period of each source, in coordinator polls (see `*_SCAN_INTERVAL`):
+# the source is fetched once every N polls. Keys are source names or fnmatch
+# patterns; unlisted sources are fetched on every poll. 0 means on demand only
+# (first poll, config fetches, quick refreshes after a write).
+SourcePollPeriods = Mapping[str, int]
+
+SOURCE_POLL_PERIODS: Final[SourcePollPeriods] = {
+    "/dashboard": 1,
+    "/mode": 1,
+    "/wifi": 5,
+    "/cloud": 10,
+    "/firmware": 30,
+}
+# Sources returning the same payload this many times in a row start backing
+# off: their period doubles on each further unchanged fetch, up to
+# SOURCE_POLL_BACKOFF_MAX times the configured one. Any change resets it.
+# Sources with a period of 1 are polled every time and never back off.
+SOURCE_POLL_BACKOFF_AFTER: Final[int] = 3
+SOURCE_POLL_BACKOFF_MAX: Final[int] = 4
 
 # -----------------------------------------------------------------------------
 # Wi-Fi provisioning (options flow)
@@ -156,6 +233,9 @@ HW_DEVICES_IDS: Final[tuple[str, ...]] = (
     + HW_CONTROL_IDS
 )
 
+# Models whose firmware only copes with a couple of connections at a time
+LEGACY_HW_MODELS: Final[tuple[str, ...]] = ("RSLED90",) + HW_WAVE_IDS
+
 # -----------------------------------------------------------------------------
 # Common JSONPath names
 # -----------------------------------------------------------------------------
@@ -171,6 +251,21 @@ COMMON_MAINTENANCE_SWITCH: Final[JsonPath] = "$.sources[?(@.name=='/mode')].data
 # -----------------------------------------------------------------------------
 
 LED_SCAN_INTERVAL: Final[int] = 120  # seconds
+LED_SOURCE_POLL_PERIODS: Final[SourcePollPeriods] = {
+    **SOURCE_POLL_PERIODS,
+    "/manual": 1,
+    "/acclimation": 5,
+    "/moonphase": 5,
+    "/preset_name": 5,
+    # Per-day programs, refreshed in live config mode (loaded ones only, see
+    # LED_DAY_SOURCES_PER_POLL)
+    "/auto/*": 30,
+    "/clouds/*": 30,
+    "/preset_name/*": 30,
+}
+# Per-day program sources of other days than today fetched at most per poll:
+# they are loaded (and refreshed) a few at a time instead of all at once.
+LED_DAY_SOURCES_PER_POLL: Final[int] = 3
 
 LED_WHITE_INTERNAL_NAME: Final[JsonPath] = "$.sources[?(@.name=='/manual')].data.white"
 LED_BLUE_INTERNAL_NAME: Final[JsonPath] = "$.sources[?(@.name=='/manual')].data.blue"
@@ -259,15 +354,26 @@ EVENT_WB_LIGHT_UPDATED: Final[str] = "Kelvin_wb_updated"
 # Virtual LED
 # -----------------------------------------------------------------------------
 
+# Seconds a command broadcast to the LEDs linked to a virtual LED is waited for.
+# LEDs still busy then are reported pending, not cancelled.
 VIRTUAL_LED_MAX_WAITING_TIME: Final[int] = 15
 LINKED_LED: Final[str] = "linked"
 VIRTUAL_LED_SCAN_INTERVAL: Final[int] = 10  # seconds
+# The virtual LED aggregates the data its linked LEDs already polled, and only
+# fetches a linked LED itself when that LED missed this many polls.
+VIRTUAL_LED_STALE_POLLS: Final[int] = 2
 
 # -----------------------------------------------------------------------------
 # REEFMAT
 # -----------------------------------------------------------------------------
 
 MAT_SCAN_INTERVAL: Final[int] = 300  # seconds
+MAT_SOURCE_POLL_PERIODS: Final[SourcePollPeriods] = {
+    **SOURCE_POLL_PERIODS,
+    "/wifi": 2,
+    "/cloud": 4,
+    "/firmware": 12,
+}
 MAT_MIN_ROLL_DIAMETER: Final[float] = 4.0
 # NOTE: keeping original constant name for compatibility (typo is in original name).
 MAT_MAX_ROLL_DIAMETERS: Final[dict[str, float]] = {
@@ -303,6 +409,12 @@ MAT_POSITION_INTERNAL_NAME: Final[JsonPath] = (
 # -----------------------------------------------------------------------------
 
 DOSE_SCAN_INTERVAL: Final[int] = 120  # seconds
+DOSE_SOURCE_POLL_PERIODS: Final[SourcePollPeriods] = {
+    **SOURCE_POLL_PERIODS,
+    "/dosing-queue": 1,
+    "/head/*/settings": 1,
+    "/device-settings": 10,
+}
 # DOSE_MANUAL_DOSEE_INTERNAL_NAME="$.local.head.<head_nb>.manual_dose"
 
 # -----------------------------------------------------------------------------
@@ -310,6 +422,13 @@ DOSE_SCAN_INTERVAL: Final[int] = 120  # seconds
 # -----------------------------------------------------------------------------
 
 ATO_SCAN_INTERVAL: Final[int] = 20  # seconds
+ATO_SOURCE_POLL_PERIODS: Final[SourcePollPeriods] = {
+    **SOURCE_POLL_PERIODS,
+    "/wifi": 30,
+    "/cloud": 30,
+    "/firmware": 180,
+    "/configuration": 3,
+}
 
 ATO_AUTO_FILL_INTERNAL_NAME: Final[JsonPath] = (
     "$.sources[?(@.name=='/configuration')].data.auto_fill"
@@ -325,6 +444,15 @@ ATO_MODES: Final[tuple[str, ...]] = ("auto", "empty", "error")
 # -----------------------------------------------------------------------------
 
 RUN_SCAN_INTERVAL: Final[int] = 60  # seconds
+RUN_SOURCE_POLL_PERIODS: Final[SourcePollPeriods] = {
+    **SOURCE_POLL_PERIODS,
+    "/wifi": 10,
+    "/cloud": 20,
+    "/firmware": 60,
+    "/pump/settings": 1,
+    "/calibration": 5,
+    "/pump/shortcuts": 10,
+}
 
 RETURN_MODELS: Final[tuple[str, ...]] = (
     "return-6",
@@ -348,6 +476,14 @@ OVERSKIMMING_ENABLED_INTERNAL_NAME: Final[JsonPath] = (
 # REEFWAVE
 # -----------------------------------------------------------------------------
 
+# Intervals per POST /auto tried first when uploading a schedule. Older
+# (ESP8266) firmware rejects bodies of 3+ intervals: rejected batches are
+# halved and the largest size accepted is remembered per device and firmware.
+WAVE_UPLOAD_BATCH_MAX: Final[int] = 10
+# Successful uploads after which twice the remembered size is tried again (a
+# rejection may have been a one-off, or the schedules uploaded small).
+WAVE_UPLOAD_REPROBE: Final[int] = 5
+
 WAVE_SHORTCUT_OFF_DELAY: Final[JsonPath] = (
     "$.sources[?(@.name=='/device-settings')].data.shortcut_off_delay"
 )
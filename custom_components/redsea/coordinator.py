@@ -24,15 +24,20 @@ import asyncio
 import logging
 import uuid
 from asyncio import timeout
+from collections.abc import Callable, Coroutine
 from datetime import datetime, timedelta
-from time import time
+from functools import partial
+from time import monotonic, time
 from typing import Any, cast
 
+import aiohttp
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
@@ -44,6 +49,7 @@ from .const import (
     CONFIG_FLOW_INTENSITY_COMPENSATION,
     CONFIG_FLOW_IP_ADDRESS,
     CONFIG_FLOW_SCAN_INTERVAL,
+    DEVICE_KEEPALIVE_TIMEOUT,
     DEVICE_MANUFACTURER,
     DOMAIN,
     HTTP_DELAY_BETWEEN_RETRY,
@@ -59,13 +65,23 @@ from .const import (
     HW_WAVE_IDS,
     LED_BLUE_INTERNAL_NAME,
     LED_WHITE_INTERNAL_NAME,
+    LEGACY_HW_MODELS,
+    LEGACY_KEEPALIVE_TIMEOUT,
+    LEGACY_REQUEST_CONCURRENCY,
     LINKED_LED,
     REFRESH_DEVICE_DELAY,
+    REQUEST_CONCURRENCY,
     SCAN_INTERVAL,
     VIRTUAL_LED,
+    VIRTUAL_LED_MAX_WAITING_TIME,
+    VIRTUAL_LED_SCAN_INTERVAL,
+    VIRTUAL_LED_STALE_POLLS,
+    WAVE_SCHEDULE_PATH,
     WAVES_LIBRARY,
+    WRITE_DEBOUNCE_DELAY,
 )
 from .reefbeat import (
+    DeviceOfflineError,
     ReefATOAPI,
     ReefBeatAPI,
     ReefBeatCloudAPI,
@@ -77,7 +93,15 @@ from .reefbeat import (
     ReefRunAPI,
     ReefWaveAPI,
     parse,
+    source_name,
 )
+from .reefbeat.breaker import retry_budget
+from .reefbeat.metrics import RequestMetrics
+from .reefbeat.session import DeviceSession
+from .reefbeat.write_queue import WriteQueue
+from .schedule import ScheduleIndexes, minute_of_day
+from .snapshot import LayoutStore, SnapshotStore
+from .startup import StartupGate, async_join_startup
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -96,8 +120,22 @@ class ReefBeatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     - periodic data fetches (DataUpdateCoordinator)
     - exposing a small convenience surface over the API (get/set/push/press/delete)
     - providing HA `DeviceInfo` for the device
+
+    Polls that bring no new payload (see `ReefBeatAPI.pop_changed_sources()`)
+    do not wake the entities up. Entities subscribing with a source scope (a
+    frozenset of source names passed as listener context, see
+    `ReefBeatEntity.source_scope`) are only woken up by polls that changed one
+    of their sources.
     """
 
+    # Cleared on coordinators that do not start from a persisted snapshot of
+    # their device state (cloud account, virtual LED).
+    _use_snapshot: bool = True
+    # Cleared on coordinators that do not talk to a local device (cloud
+    # account, virtual LED): they use Home Assistant's shared session instead
+    # of a connection pool of their own.
+    _own_session: bool = True
+
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the coordinator from a config entry."""
         self._entry = entry
@@ -112,14 +150,62 @@ class ReefBeatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         # Keep integration state
         self._hass = hass
-        self._session = async_get_clientsession(hass)
         self._ip: str = str(entry.data[CONFIG_FLOW_IP_ADDRESS])
         self._hw: str = str(entry.data[CONFIG_FLOW_HW_MODEL])
+        self._session: DeviceSession | aiohttp.ClientSession = (
+            self._create_session()
+            if self._own_session
+            else async_get_clientsession(hass)
+        )
+        # Closes the device connection pool with Home Assistant, registered
+        # by `async_setup()`.
+        self._unsub_close: Callable[[], None] | None = None
         self._title: str = entry.title
         self._live_config_update: bool = bool(
             entry.data.get(CONFIG_FLOW_CONFIG_TYPE, False)
         )
         self._boot = True
+        # Persisted API state: restored at startup (entities are then `stale`
+        # until the initial fetch, run as first refresh, completed).
+        self._snapshot = (
+            SnapshotStore(hass, entry.entry_id, self._hw)
+            if self._use_snapshot
+            else None
+        )
+        # Firmware variant detected by the API probes (see `ReefLedAPI.layout`).
+        self._layouts = (
+            LayoutStore(hass, entry.entry_id, self._hw) if self._use_snapshot else None
+        )
+        self.stale = False
+        # Seconds taken to load the initial data, and the startup ordering of
+        # that load while Home Assistant starts (see startup.py).
+        self.setup_time: float | None = None
+        self._setup_started: float | None = None
+        self._startup_gate: StartupGate | None = None
+        # Monotonic time the device data was last fetched successfully.
+        self.last_poll: float | None = None
+
+        # Sources whose payload changed during the last poll, and the scope of
+        # the listener fan-out following that poll (None: every listener).
+        self.changed_sources: set[str] = set()
+        self._dispatch_scope: frozenset[str] | None = None
+        # Sources changed by the update being dispatched to the listeners
+        # (None outside of a scoped fan-out: any source may have changed).
+        self.update_scope: frozenset[str] | None = None
+        # Listeners with their source scope (None: unscoped), kept here rather
+        # than read back from the private `DataUpdateCoordinator._listeners`.
+        self._scoped_listeners: dict[
+            int, tuple[Callable[[], None], frozenset[str] | None]
+        ] = {}
+        self._last_scoped_id = 0
+
+        # Debounced pushes (see `push_values`) and the follow-up refresh shared
+        # by concurrent `async_request_refresh()` callers.
+        self._writes = WriteQueue(WRITE_DEBOUNCE_DELAY)
+        self._refresh_pending: asyncio.Task[None] | None = None
+        self._refresh_sources: set[str] = set()
+        self._refresh_full = False
+        self._refresh_config = False
 
         # Default API for a generic ReefBeat device (specialized coordinators override this).
         self.my_api = ReefBeatAPI(self._ip, self._live_config_update, self._session)
@@ -128,6 +214,65 @@ class ReefBeatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             "%s live configuration update %s", self._title, self._live_config_update
         )
 
+    def _create_session(self) -> DeviceSession:
+        """Return the HTTP session of the device (its own connection pool)."""
+        legacy = self._hw in LEGACY_HW_MODELS
+        return DeviceSession(
+            limit=LEGACY_REQUEST_CONCURRENCY if legacy else REQUEST_CONCURRENCY,
+            keepalive_timeout=(
+                LEGACY_KEEPALIVE_TIMEOUT if legacy else DEVICE_KEEPALIVE_TIMEOUT
+            ),
+        )
+
+    async def _async_close_session(self, _event: Event | None = None) -> None:
+        """Close the device connection pool (on unload or HA shutdown)."""
+        if _event is not None:
+            self._unsub_close = None
+        if isinstance(self._session, DeviceSession):
+            await self._session.close()
+
+    async def _async_release_session(self) -> None:
+        """Close the device connection pool and stop waiting for HA to close."""
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        await self._async_close_session()
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending refreshes, write pending saves, close the connections."""
+        await super().async_shutdown()
+        if self._snapshot is not None:
+            await self._snapshot.async_flush()
+        if self._layouts is not None:
+            await self._layouts.async_flush()
+        await self._async_release_session()
+
+    @property
+    def connection_stats(self) -> dict[str, Any] | None:
+        """Return connection pool counters, or None on a shared session."""
+        if not isinstance(self._session, DeviceSession):
+            return None
+        return {**self._session.stats, "reuse_rate": self._session.reuse_rate}
+
+    @property
+    def request_metrics(self) -> RequestMetrics | None:
+        """Return the per-source request metrics of the device API."""
+        return getattr(self.my_api, "metrics", None)
+
+    def transport_stats(self) -> dict[str, Any]:
+        """Return the state of the HTTP layer of the device, for diagnostics."""
+        api = self.my_api
+        metrics = self.request_metrics
+        return {
+            "requests": metrics.stats() if metrics is not None else None,
+            "connections": self.connection_stats,
+            "limiter": api.limiter.stats() if hasattr(api, "limiter") else None,
+            "breaker": api.breaker.stats() if hasattr(api, "breaker") else None,
+            "scheduler": api.scheduler.stats() if hasattr(api, "scheduler") else None,
+            "coalesced_gets": dict(getattr(api, "get_stats", {})),
+            "writes": dict(self._writes.stats),
+        }
+
     def clean_message(self, msg_type) -> None:
         self.my_api.clean_message(msg_type)
         self.async_update_listeners()
@@ -138,6 +283,8 @@ class ReefBeatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         This is called by DataUpdateCoordinator. Any exception is wrapped into
         UpdateFailed so HA can handle retries/backoff.
         """
+        self._dispatch_scope = None
+        initial = self.stale
         try:
             # fetch_data() concurrently fetches multiple endpoints. Each endpoint has its
             # own per-request timeout and retry loop in the API layer.
@@ -145,18 +292,47 @@ class ReefBeatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             # If this coordinator timeout is shorter than the API retry budget, HA will
             # cancel the update (CancelledError) and timeout will surface it as a
             # TimeoutError (exactly what we saw in logs). Compute an upper bound that
-            # matches the API behavior.
+            # matches the API behavior. An unreachable device trips its circuit
+            # breaker well before that: its later polls fail fast.
             per_try_timeout = int(getattr(self.my_api, "_timeout", 10))
             overall_timeout = (
-                (per_try_timeout + HTTP_DELAY_BETWEEN_RETRY) * HTTP_MAX_RETRY
-            ) + 5  # small buffer
-            async with timeout(overall_timeout):
-                res = cast(dict[str, Any] | None, await self.my_api.fetch_data())
+                retry_budget(per_try_timeout, HTTP_MAX_RETRY, HTTP_DELAY_BETWEEN_RETRY)
+                + 5  # small buffer
+            )
+            if initial:
+                # Started from a snapshot: this is the deferred initial fetch
+                # (device-info, config, then data sources).
+                try:
+                    async with timeout(overall_timeout * 3):
+                        res = cast(
+                            dict[str, Any] | None, await self.my_api.get_initial_data()
+                        )
+                except BaseException:
+                    self._end_startup(False)
+                    raise
+                self._end_startup(res is not None)
+            else:
+                async with timeout(overall_timeout):
+                    res = cast(dict[str, Any] | None, await self.my_api.fetch_data())
             if res is None:
                 raise UpdateFailed(f"No data received from API: {self._title}")
+            self.changed_sources = self.my_api.pop_changed_sources()
+            self.last_poll = monotonic()
+            if initial:
+                self.stale = False
+                _LOGGER.info("%s: initial data loaded", self._title)
+            # Restrict the fan-out HA runs after this refresh to the listeners
+            # of changed sources, unless the previous one failed (entities
+            # must become available again).
+            elif self.last_update_success:
+                self._dispatch_scope = frozenset(self.changed_sources)
+            self._save_snapshot()
             return res
         except UpdateFailed:
             raise
+        except DeviceOfflineError as err:
+            _LOGGER.debug("Coordinator update skipped for %s: %s", self._title, err)
+            raise UpdateFailed(f"{self._title} ({self._ip}): {err}") from err
         except asyncio.TimeoutError as err:
             _LOGGER.debug(
                 "Coordinator update timed out for %s (%s): %s",
@@ -179,6 +355,53 @@ class ReefBeatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 f"{self._title} ({self._ip}) update failed: {err.__class__.__name__}: {err}"
             ) from err
 
+    @callback
+    def async_add_listener(
+        self, update_callback: Callable[[], None], context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, scoped when `context` is a set of sources.
+
+        The listener is registered with Home Assistant as usual (it drives the
+        polling interval) and in our own registry, which the scoped fan-out of
+        `async_update_listeners` iterates instead of the base class internals.
+        """
+        unsub = super().async_add_listener(update_callback, context)
+        self._last_scoped_id += 1
+        listener_id = self._last_scoped_id
+        scope = context if isinstance(context, frozenset) else None
+        self._scoped_listeners[listener_id] = (update_callback, scope)
+
+        @callback
+        def _remove() -> None:
+            self._scoped_listeners.pop(listener_id, None)
+            unsub()
+
+        return _remove
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners concerned by the last poll.
+
+        Outside of a poll fan-out (config fetch, pushed values...) every
+        listener is updated. After a poll, unscoped listeners are updated when
+        any source changed, and scoped ones only when one of their sources did.
+        """
+        scope = self._dispatch_scope
+        if scope is None:
+            super().async_update_listeners()
+            return
+        self._dispatch_scope = None
+        if not scope:
+            _LOGGER.debug("%s: no payload change, listeners not updated", self._title)
+            return
+        self.update_scope = scope
+        try:
+            for update_callback, sources in list(self._scoped_listeners.values()):
+                if sources is None or not scope.isdisjoint(sources):
+                    update_callback()
+        finally:
+            self.update_scope = None
+
     async def update(self) -> None:
         """Legacy helper; prefer `async_request_refresh()`."""
         await self.my_api.fetch_data()
@@ -193,7 +416,68 @@ class ReefBeatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         _LOGGER.debug("%s async_setup...", self._title)
         if self._boot:
             self._boot = False
-            await self.my_api.get_initial_data()
+            await self._async_load_initial_data()
+
+    async def _async_load_initial_data(self) -> None:
+        """Load the device state, from its snapshot when one was saved.
+
+        Without a snapshot, the initial fetch runs now (and fails if the device
+        is offline). With one, entities start from the restored state, marked
+        `stale`, and the initial fetch runs in the background as the first
+        refresh (retried by the following polls until it succeeds).
+
+        A firmware layout cached by a previous run is applied first, so the
+        device is not probed for it. While Home Assistant starts, the initial
+        fetch is ordered with those of the other devices (see startup.py).
+        """
+        self._setup_started = monotonic()
+        self._startup_gate = async_join_startup(self.hass, self._entry.entry_id)
+        if self._startup_gate is not None:
+            self.my_api.startup_gate = self._startup_gate
+        use_layout = getattr(self.my_api, "use_layout", None)
+        if self._layouts is not None and use_layout is not None:
+            layout = await self._layouts.async_load()
+            if layout is not None:
+                use_layout(layout)
+        snapshot = (
+            await self._snapshot.async_load() if self._snapshot is not None else None
+        )
+        if snapshot is None or not self.my_api.restore_snapshot(snapshot):
+            try:
+                await self.my_api.get_initial_data()
+            except BaseException:
+                self._end_startup(False)
+                raise
+            self._end_startup(True)
+            self.last_poll = monotonic()
+            self._save_snapshot()
+            return
+
+        _LOGGER.info("%s: started from snapshot, fetching device state", self._title)
+        self.stale = True
+        self._entry.async_create_background_task(
+            self.hass, self.async_refresh(), f"{DOMAIN} {self._title} initial data"
+        )
+
+    def _end_startup(self, loaded: bool) -> None:
+        """Record the setup time and leave the startup ordering (first call only)."""
+        if self._setup_started is None:
+            return
+        if loaded:
+            self.setup_time = round(monotonic() - self._setup_started, 2)
+        self._setup_started = None
+        gate, self._startup_gate = self._startup_gate, None
+        if gate is not None:
+            self.my_api.startup_gate = None
+            gate.close(self.setup_time)
+
+    def _save_snapshot(self) -> None:
+        """Schedule a save of the device state snapshot (and of its layout)."""
+        state_func = getattr(self.my_api, "snapshot", None)
+        if self._snapshot is not None and state_func is not None:
+            self._snapshot.async_schedule_save(state_func)
+        if self._layouts is not None:
+            self._layouts.async_save(getattr(self.my_api, "layout", None))
 
     async def async_request_refresh(
         self,
@@ -201,19 +485,65 @@ class ReefBeatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         config: bool = False,
         wait: int = REFRESH_DEVICE_DELAY,
     ) -> None:
-        """config to True to also fetch config data"""
-        # wait for device to refresh state
-        if wait > 0:
-            await asyncio.sleep(wait)
-        if source is not None:
-            self.my_api.quick_refresh = source
+        """Refresh after a write, once the device had time to apply it.
+
+        Set `config` to True to also fetch config data. Calls made while a
+        refresh is waiting join it: one refresh then covers every requested
+        source (or a full poll if any caller asked for one).
+        """
+        if source is None:
+            self._refresh_full = True
+        else:
+            self._refresh_sources.add(source)
+        self._refresh_config |= config
+
+        if self._refresh_pending is None:
+            # Owned by the entry: a cancelled caller does not drop the refresh
+            # the others joined.
+            self._refresh_pending = self._entry.async_create_background_task(
+                self.hass,
+                self._async_delayed_refresh(wait),
+                f"{DOMAIN} {self._title} requested refresh",
+                eager_start=False,
+            )
+        await asyncio.shield(self._refresh_pending)
+
+    async def _async_delayed_refresh(self, wait: int) -> None:
+        """Wait for the device to apply the writes, then run the refresh."""
+        try:
+            # wait for device to refresh state
+            if wait > 0:
+                await asyncio.sleep(wait)
+        finally:
+            self._refresh_pending = None
+        await self._run_requested_refresh()
+
+    async def _run_requested_refresh(self) -> None:
+        """Run the refresh gathered by `async_request_refresh()` callers."""
+        sources, self._refresh_sources = self._refresh_sources, set()
+        full, self._refresh_full = self._refresh_full, False
+        config, self._refresh_config = self._refresh_config, False
+        if not full and sources:
+            self.my_api.quick_refresh = sources.pop() if len(sources) == 1 else sources
         if config:
             await self.my_api.fetch_config()
-        return await super().async_request_refresh()
+        await super().async_request_refresh()
 
     async def async_setup(self) -> None:
-        """Public entry-point for one-time initialization."""
-        await self._async_setup()
+        """Public entry-point for one-time initialization.
+
+        The device connection pool is closed when Home Assistant closes, or
+        right away if the setup fails.
+        """
+        if isinstance(self._session, DeviceSession) and self._unsub_close is None:
+            self._unsub_close = self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_CLOSE, self._async_close_session
+            )
+        try:
+            await self._async_setup()
+        except BaseException:
+            await self._async_release_session()
+            raise
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -231,8 +561,14 @@ class ReefBeatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     async def push_values(
         self, source: str = "/configuration", method: str = "put"
     ) -> None:
-        """Push changed values to the device."""
-        await self.my_api.push_values(source, method)
+        """Push changed values to the device.
+
+        Pushes of the same source within `WRITE_DEBOUNCE_DELAY` are merged into
+        a single request carrying the latest cached values.
+        """
+        await self._writes.submit(
+            (source, method), lambda: self.my_api.push_values(source, method)
+        )
 
     def get_data(self, name: str, is_None_possible: bool = False) -> Any:
         """Read a value from the cached API payload (JSONPath supported by the API layer)."""
@@ -311,6 +647,11 @@ class ReefBeatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         sv = self.get_data("$.sources[?(@.name=='/firmware')].data.version", True)
         return str(sv) if sv is not None else "unknown"
 
+    @property
+    def offline(self) -> bool:
+        """Return True while the device is unreachable (its breaker is open)."""
+        return bool(getattr(self.my_api, "offline", False))
+
     @property
     def detected_id(self) -> str:
         """Debug-friendly identifier for this coordinator/device."""
@@ -344,7 +685,7 @@ class ReefBeatCloudLinkedCoordinator(ReefBeatCoordinator):
         _LOGGER.debug("%s async_setup...", self._title)
         if self._boot:
             self._boot = False
-            await self.my_api.get_initial_data()
+            await self._async_load_initial_data()
 
             if str(self._hass.state) == "RUNNING":
                 self._ask_for_link()
@@ -353,10 +694,6 @@ class ReefBeatCloudLinkedCoordinator(ReefBeatCoordinator):
                 "redsea_ask_for_cloud_link_ready", self._handle_ask_for_link_ready
             )
 
-    async def async_setup(self) -> None:
-        """Public entry-point for one-time initialization."""
-        await self._async_setup()
-
     @callback
     def _handle_ask_for_link(self, event: Any) -> None:
         """Ask for cloud link once HA is started."""
@@ -491,11 +828,38 @@ class ReefVirtualLedCoordinator(ReefLedCoordinator):
 
     The virtual LED can represent an aquarium with multiple ReefLED devices.
     Read operations are aggregated; write operations are broadcast to all linked LEDs.
+
+    The linked LEDs are already polled by their own coordinators: the virtual
+    LED listens to their updates and refreshes its entities from their data.
+    Its own periodic update only fetches the linked LEDs whose data is stale
+    (see `VIRTUAL_LED_STALE_POLLS`), concurrently.
+
+    Aggregated values are memoized: entity reads are dictionary lookups until
+    the data they aggregate changes. A linked LED update drops the values of
+    the sources it changed (all of them when unknown) and only wakes up the
+    virtual entities reading those sources; fetches and writes drop them all.
+
+    Commands are broadcast to the linked LEDs concurrently, waited for up to
+    `VIRTUAL_LED_MAX_WAITING_TIME` (slower LEDs finish in the background). The
+    outcome on each LED is kept in `last_broadcast`; failures are raised once
+    the others are done.
     """
 
+    # State is read from the linked LEDs, nothing to persist, and requests go
+    # through the linked LED coordinators.
+    _use_snapshot = False
+    _own_session = False
+
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the virtual LED and discover linked devices."""
         self._linked: list[Any] = []
+        self._unsub_linked: list[Callable[[], None]] = []
+        # Aggregated values by `get_data()` arguments, with the sources they
+        # read (None: not known, dropped on any update).
+        self._aggregate: dict[tuple[str, bool], tuple[Any, frozenset[str] | None]] = {}
+        self._sources_of: dict[str, frozenset[str] | None] = {}
+        # Outcome of the last command broadcast to the linked LEDs.
+        self.last_broadcast: dict[str, Any] | None = None
         self._only_g1: bool = True
         if LINKED_LED not in entry.data:
             _LOGGER.error(
@@ -528,11 +892,17 @@ class ReefVirtualLedCoordinator(ReefLedCoordinator):
             return
 
         _LOGGER.info("Linking leds to %s", self._title)
-        self._linked = []
+        self._unlink_leds()
         for led in self._entry.data[LINKED_LED]:
             name = str(led).split(" ")[1]
             entry_id = str(led).split("(")[1][:-1]
-            self._linked.append(self._hass.data[DOMAIN][entry_id])
+            linked = self._hass.data[DOMAIN][entry_id]
+            self._linked.append(linked)
+            add_listener = getattr(linked, "async_add_listener", None)
+            if add_listener is not None:
+                self._unsub_linked.append(
+                    add_listener(partial(self._async_linked_updated, linked))
+                )
             _LOGGER.info(" - %s", name)
 
         if len(self._linked) == 0:
@@ -548,31 +918,114 @@ class ReefVirtualLedCoordinator(ReefLedCoordinator):
                 ),
             )
 
+    def _unlink_leds(self) -> None:
+        """Stop listening to the linked LED coordinators."""
+        for unsub in self._unsub_linked:
+            unsub()
+        self._unsub_linked = []
+        self._linked = []
+        self._invalidate()
+
+    async def async_shutdown(self) -> None:
+        """Stop listening to the linked LEDs, then shut down."""
+        self._unlink_leds()
+        await super().async_shutdown()
+
+    @callback
+    def _async_linked_updated(self, led: Any = None) -> None:
+        """Refresh the virtual entities from the data a linked LED just polled."""
+        scope = getattr(led, "update_scope", None)
+        self._invalidate(scope)
+        if self.last_update_success:
+            # Entities must all be refreshed to become available again.
+            self._dispatch_scope = scope
+        self.async_set_updated_data(self._linked_data())
+
+    def _invalidate(self, sources: frozenset[str] | None = None) -> None:
+        """Drop the aggregated values reading `sources` (None: all of them)."""
+        if sources is None:
+            self._aggregate.clear()
+            return
+        for key, (_value, read) in list(self._aggregate.items()):
+            if read is None or not sources.isdisjoint(read):
+                del self._aggregate[key]
+
+    def _linked_data(self) -> dict[str, Any]:
+        """Return the last data polled by the linked LED coordinators, merged."""
+        data: dict[str, Any] = {}
+        for led in self._linked:
+            res = getattr(led, "data", None)
+            if isinstance(res, dict):
+                data.update(cast(dict[str, Any], res))
+        return data
+
+    def _is_stale(self, led: Any) -> bool:
+        """Return True if a linked LED missed `VIRTUAL_LED_STALE_POLLS` polls."""
+        last_poll = getattr(led, "last_poll", None)
+        if last_poll is None:
+            return True
+        interval = getattr(led, "update_interval", None)
+        seconds = (
+            interval.total_seconds()
+            if isinstance(interval, timedelta)
+            else VIRTUAL_LED_SCAN_INTERVAL
+        )
+        return monotonic() - last_poll > seconds * VIRTUAL_LED_STALE_POLLS
+
     def force_status_update(self, state: bool = False) -> None:
         """Virtual device does not force status on a single hardware light."""
         return
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Aggregate data updates from all linked LED coordinators."""
-        data: dict[str, Any] = {}
-        for led in self._linked:
-            try:
-                res = await led.my_api.fetch_data()
-                if isinstance(res, dict):
-                    data.update(cast(dict[str, Any], res))
-            except Exception:
-                _LOGGER.exception(
-                    "Error updating linked LED for virtual %s", self._title
+        """Aggregate the linked LEDs data, fetching the stale ones concurrently."""
+        data = self._linked_data()
+        stale = [led for led in self._linked if self._is_stale(led)]
+        if not stale:
+            return data
+        results = await asyncio.gather(
+            *(led.my_api.fetch_data() for led in stale), return_exceptions=True
+        )
+        self._invalidate()
+        for res in results:
+            if isinstance(res, dict):
+                data.update(cast(dict[str, Any], res))
+            elif isinstance(res, Exception):
+                _LOGGER.error(
+                    "Error updating linked LED for virtual %s: %s", self._title, res
                 )
+            elif isinstance(res, BaseException):
+                raise res
         return data
 
     def get_data(self, name: str, is_None_possible: bool = False) -> Any:
-        """Get aggregated value from linked LEDs.
+        """Get aggregated value from linked LEDs (memoized per generation).
 
         Behavior:
         - Kelvin/intensity paths may be provided as "g1_path g2_path"
         - For scalar types, values are averaged or AND'ed where appropriate
         """
+        key = (name, is_None_possible)
+        hit = self._aggregate.get(key)
+        if hit is not None:
+            return hit[0]
+        value = self._aggregate_value(name, is_None_possible)
+        if self._linked:
+            self._aggregate[key] = (value, self._read_sources(name))
+        return value
+
+    def _read_sources(self, name: str) -> frozenset[str] | None:
+        """Return the sources `get_data(name)` aggregates (None: not known)."""
+        try:
+            return self._sources_of[name]
+        except KeyError:
+            pass
+        sources = {source_name(path) for path in name.split(" ")}
+        read = None if None in sources else cast(frozenset[str], frozenset(sources))
+        self._sources_of[name] = read
+        return read
+
+    def _aggregate_value(self, name: str, is_None_possible: bool = False) -> Any:
+        """Compute the aggregated value of `name` over the linked LEDs."""
         if not self._linked:
             return None
 
@@ -662,6 +1115,7 @@ class ReefVirtualLedCoordinator(ReefLedCoordinator):
 
     def set_data(self, name: str, value: Any) -> None:
         """Broadcast set data to all linked LEDs (resolving G1/G2 path when provided)."""
+        self._invalidate()
         names = name.split(" ")
         for led in self._linked:
             _LOGGER.debug("Setting DATA for virtual led %s", names)
@@ -675,12 +1129,94 @@ class ReefVirtualLedCoordinator(ReefLedCoordinator):
                 name_to_set = name
             led.set_data(name_to_set, value)
 
+    async def _broadcast(
+        self, action: str, call: Callable[[Any], Coroutine[Any, Any, Any]]
+    ) -> dict[str, str]:
+        """Run `call` on every linked LED concurrently.
+
+        LEDs still busy after `VIRTUAL_LED_MAX_WAITING_TIME` are not waited
+        for, but not cancelled either (a write or refresh cut short would leave
+        them in an unknown state): they are reported "pending", and their
+        outcome replaces it in `last_broadcast` once known.
+
+        Args:
+            action: What is broadcast, for the report and logs.
+            call: Coroutine function run with each linked LED coordinator.
+
+        Returns:
+            The outcome per linked LED: "ok", "pending" or the error raised.
+
+        Raises:
+            HomeAssistantError: The command failed on some LEDs, after the
+                others completed or the deadline passed.
+        """
+        if not self._linked:
+            return {}
+        tasks: dict[asyncio.Task[Any], str] = {}
+        for i, led in enumerate(self._linked):
+            name = str(getattr(led, "title", None) or getattr(led, "_title", i))
+            tasks[
+                self._entry.async_create_background_task(
+                    self.hass, call(led), f"{DOMAIN} {self._title} {action} {name}"
+                )
+            ] = name
+        _done, pending = await asyncio.wait(tasks, timeout=VIRTUAL_LED_MAX_WAITING_TIME)
+
+        results = {
+            name: "pending" if task in pending else _task_outcome(task)
+            for task, name in tasks.items()
+        }
+        self.last_broadcast = {"action": action, "at": time(), "results": results}
+        for task in pending:
+            task.add_done_callback(
+                partial(self._broadcast_done, action, results, tasks[task])
+            )
+
+        failed = {
+            name: res for name, res in results.items() if res not in ("ok", "pending")
+        }
+        if pending:
+            _LOGGER.warning(
+                "%s: %s still running on %s after %ds",
+                self._title,
+                action,
+                ", ".join(tasks[task] for task in pending),
+                VIRTUAL_LED_MAX_WAITING_TIME,
+            )
+        if failed:
+            _LOGGER.error(
+                "%s: %s failed on %d of %d LEDs: %s",
+                self._title,
+                action,
+                len(failed),
+                len(results),
+                failed,
+            )
+            raise HomeAssistantError(
+                f"{self._title}: {action} failed on "
+                + ", ".join(f"{name} ({res})" for name, res in failed.items())
+            )
+        return results
+
+    def _broadcast_done(
+        self,
+        action: str,
+        results: dict[str, str],
+        name: str,
+        task: asyncio.Task[Any],
+    ) -> None:
+        """Record the outcome of a broadcast on an LED that was still pending."""
+        results[name] = outcome = _task_outcome(task)
+        if outcome != "ok":
+            _LOGGER.error("%s: %s failed on %s: %s", self._title, action, name, outcome)
+
     async def push_values(
         self, source: str = "/configuration", method: str = "post"
     ) -> None:
         """Broadcast push to all linked LEDs."""
-        for led in self._linked:
-            await led.push_values(source, method)
+        await self._broadcast(
+            f"push {source}", lambda led: led.push_values(source, method)
+        )
 
     def data_exist(self, name: str) -> bool:
         """Return True if any linked device has the named data."""
@@ -693,23 +1229,25 @@ class ReefVirtualLedCoordinator(ReefLedCoordinator):
 
     async def press(self, action: str) -> None:
         """Broadcast press to all linked LEDs."""
-        for led in self._linked:
-            await led.press(action)
+        await self._broadcast(f"press {action}", lambda led: led.press(action))
 
     async def delete(self, source: str) -> None:
         """Broadcast delete to all linked LEDs."""
-        for led in self._linked:
-            await led.delete(source)
+        await self._broadcast(f"delete {source}", lambda led: led.delete(source))
 
     async def fetch_config(self, config_path: str | None = None) -> None:
         """Fetch config from all linked LEDs."""
-        for led in self._linked:
-            await led.my_api.fetch_config(config_path)
+        try:
+            await self._broadcast(
+                f"fetch config {config_path or ''}".rstrip(),
+                lambda led: led.my_api.fetch_config(config_path),
+            )
+        finally:
+            self._invalidate()
 
     async def post_specific(self, source: str) -> None:
         """POST to LED-specific endpoint on all linked LEDs."""
-        for led in self._linked:
-            await led.post_specific(source)
+        await self._broadcast(f"post {source}", lambda led: led.post_specific(source))
 
     async def async_request_refresh(
         self,
@@ -717,8 +1255,10 @@ class ReefVirtualLedCoordinator(ReefLedCoordinator):
         config: bool = False,
         wait: int = REFRESH_DEVICE_DELAY,
     ) -> None:
-        for led in self._linked:
-            await led.async_request_refresh(source, config, wait)
+        """Request a refresh of all linked LEDs (their delays run concurrently)."""
+        await self._broadcast(
+            "refresh", lambda led: led.async_request_refresh(source, config, wait)
+        )
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -838,8 +1378,11 @@ class ReefDoseCoordinator(ReefBeatCloudLinkedCoordinator):
         method: str = "put",
         head: int | None = None,
     ) -> None:
-        """Push changed values to the device (optionally head-scoped)."""
-        await self.my_api.push_values(source, method, head)
+        """Push changed values to the device (optionally head-scoped, debounced)."""
+        await self._writes.submit(
+            (source, method, head),
+            lambda: self.my_api.push_values(source, method, head),
+        )
 
     @property
     def hw_version(self) -> None:  # type: ignore[override]
@@ -900,6 +1443,12 @@ class ReefRunCoordinator(ReefBeatCloudLinkedCoordinator):
         """Initialize the ReefRun coordinator and its API."""
         super().__init__(hass, entry)
         self.my_api = ReefRunAPI(self._ip, self._live_config_update, self._session)
+        self._schedules = ScheduleIndexes()
+
+    def set_data(self, name: str, value: Any) -> None:
+        """Write a value into the cached payload (schedules indexed again)."""
+        super().set_data(name, value)
+        self._schedules.clear()
 
     async def set_pump_intensity(self, pump: int, intensity: int) -> None:
         """Update the currently active schedule segment intensity for a pump."""
@@ -918,17 +1467,12 @@ class ReefRunCoordinator(ReefBeatCloudLinkedCoordinator):
             + ".schedule"
         )
         schedule = self.my_api.get_data(schedule_path)
-
-        now = datetime.now()
-        now_minutes = now.hour * 60 + now.minute
-
-        cur_prog = schedule[0]
-        for prog in schedule[1:]:
-            if int(prog["st"]) < now_minutes:
-                cur_prog = prog
-            else:
-                break
-
+        cur_prog = self._schedules.get(schedule_path, schedule).current(
+            minute_of_day(datetime.now())
+        )
+        if cur_prog is None:
+            _LOGGER.warning("%s: pump %d has no schedule", self._title, pump)
+            return
         cur_prog["ti"] = intensity
 
         # Persist back to coordinator data and push to device.
@@ -942,8 +1486,11 @@ class ReefRunCoordinator(ReefBeatCloudLinkedCoordinator):
         method: str = "put",
         pump: int | None = None,
     ) -> None:
-        """Push changed values to the device (optionally pump-scoped)."""
-        await self.my_api.push_values(source, method, pump)
+        """Push changed values to the device (optionally pump-scoped, debounced)."""
+        await self._writes.submit(
+            (source, method, pump),
+            lambda: self.my_api.push_values(source, method, pump),
+        )
 
     # -- EC calibration workflow ------------------------------------------------
 
@@ -1122,12 +1669,79 @@ class ReefRunCoordinator(ReefBeatCloudLinkedCoordinator):
 
 # REEFWAVE
 class ReefWaveCoordinator(ReefBeatCloudLinkedCoordinator):
-    """Coordinator for ReefWave devices."""
+    """Coordinator for ReefWave devices.
+
+    Schedule entities follow the wave in effect at the current time: they are
+    refreshed by a timer set to the next segment boundary of the schedule (see
+    `ScheduleIndex.next_transition()`), not on every poll.
+    """
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the ReefWave coordinator and its API."""
         super().__init__(hass, entry)
         self.my_api = ReefWaveAPI(self._ip, self._live_config_update, self._session)
+        self._schedules = ScheduleIndexes()
+        self._unsub_boundary: Callable[[], None] | None = None
+
+    def set_data(self, name: str, value: Any) -> None:
+        """Write a value into the cached payload (schedules indexed again)."""
+        super().set_data(name, value)
+        self._schedules.clear()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners, then set the timer of the next schedule boundary."""
+        super().async_update_listeners()
+        self._schedule_boundary()
+
+    @callback
+    def _schedule_boundary(self) -> None:
+        """(Re)arm the timer firing when the wave in effect changes."""
+        if self._unsub_boundary is not None:
+            self._unsub_boundary()
+            self._unsub_boundary = None
+        schedule = self.my_api.get_data(WAVE_SCHEDULE_PATH, True)
+        if not isinstance(schedule, list):
+            return
+        now = datetime.now()
+        minute = minute_of_day(now)
+        boundary = self._schedules.get(WAVE_SCHEDULE_PATH, schedule).next_transition(
+            minute
+        )
+        if boundary is None:
+            return
+        delay = (
+            (boundary - minute) * 60
+            - getattr(now, "second", 0)
+            - getattr(now, "microsecond", 0) / 1_000_000
+        )
+        self._unsub_boundary = async_call_later(
+            self.hass, max(delay, 0), self._async_boundary_reached
+        )
+
+    @callback
+    def _async_boundary_reached(self, _now: datetime) -> None:
+        """Refresh the schedule entities: another wave is now in effect."""
+        self._unsub_boundary = None
+        self._dispatch_scope = frozenset({"/auto"})
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the schedule boundary timer, then shut down."""
+        if self._unsub_boundary is not None:
+            self._unsub_boundary()
+            self._unsub_boundary = None
+        await super().async_shutdown()
+
+    def _current_segment(self, path: str) -> dict[str, Any] | None:
+        """Return the segment of the schedule at `path` in effect now."""
+        schedule = self.my_api.get_data(path)
+        # Guard: schedule may be None or empty when the device returns no data yet.
+        if not schedule:
+            return None
+        return self._schedules.get(path, schedule).current(
+            minute_of_day(datetime.now())
+        )
 
     async def set_wave(self) -> None:
         """Apply the current preview wave into the active schedule."""
@@ -1181,16 +1795,9 @@ class ReefWaveCoordinator(ReefBeatCloudLinkedCoordinator):
         """Return the active '/auto' schedule and the currently effective interval."""
         auto = self.get_data("$.sources[?(@.name=='/auto')].data")
         waves = auto["intervals"]
-
-        now = datetime.now()
-        now_minutes = now.hour * 60 + now.minute
-
-        cur_wave_idx = 0
-        for idx, wave in enumerate(waves):
-            if int(wave["st"]) < now_minutes:
-                cur_wave_idx = idx
-            else:
-                break
+        cur_wave_idx = self._schedules.get(WAVE_SCHEDULE_PATH, waves).index_at(
+            minute_of_day(datetime.now())
+        )
 
         return {
             "schedule": auto,
@@ -1348,12 +1955,17 @@ class ReefWaveCoordinator(ReefBeatCloudLinkedCoordinator):
            reject the corrupted schedule. We copy per slot and preserve each
            slot's own start time.
 
-        2. One interval at a time: the older ESP8266-based ReefWave firmware
-           has a small JSON parse buffer and rejects a single POST /auto
-           carrying 3+ intervals ("could not parse the received JSON"), even
-           though it stores and runs 5+ intervals fine. Pushing them
-           individually keeps each request tiny and the device appends them.
-           This also works on newer ESP32 firmware, so it's one code path.
+        2. Batched upload: the older ESP8266-based ReefWave firmware has a
+           small JSON parse buffer and rejects a single POST /auto carrying
+           3+ intervals ("could not parse the received JSON"), even though it
+           stores and runs 5+ intervals fine, while newer ESP32 firmware takes
+           the whole schedule at once. `ReefWaveAPI.upload_schedule()` sends
+           the largest batches the device accepts and remembers that size
+           (saved with the firmware layout).
+
+        Raises:
+            HomeAssistantError: The device did not take the schedule (it is
+                then not applied).
         """
         for pos, wave in enumerate(cur_schedule["schedule"]["intervals"]):
             if wave["wave_uid"] == new_wave["wave_uid"]:
@@ -1363,50 +1975,28 @@ class ReefWaveCoordinator(ReefBeatCloudLinkedCoordinator):
                     replacement["start"] = wave["st"]
                 cur_schedule["schedule"]["intervals"][pos] = replacement
 
-        payload = {"uid": str(uuid.uuid4())}
-        await self.my_api.http_send("/auto/init", payload)
-
         intervals = cur_schedule["schedule"].get("intervals", [])
-        for interval in intervals:
-            await self.my_api.http_send("/auto", {"intervals": [interval]})
-
-        await self.my_api.http_send("/auto/complete", payload)
-        await self.my_api.http_send("/auto/apply", payload)
+        ok = await self.my_api.upload_schedule(str(uuid.uuid4()), intervals)
+        if self._layouts is not None:
+            self._layouts.async_save(self.my_api.layout)
+        if not ok:
+            raise HomeAssistantError(f"{self._title}: schedule upload failed")
 
     def get_current_value(self, value_basename: str, value_name: str) -> Any:
         """Return the current schedule segment value for a named key.
 
         Returns None when the schedule is absent or empty (e.g. /auto data: {}).
         """
-        now = datetime.now()
-        now_minutes = now.hour * 60 + now.minute
-        schedule = self.my_api.get_data(value_basename)
-        # Guard: schedule may be None or empty when the device returns no data yet.
-        if not schedule:
-            return None
-        cur_prog = schedule[0]
-        for prog in schedule[1:]:
-            if int(prog["st"]) < now_minutes:
-                cur_prog = prog
-            else:
-                break
-        return cur_prog.get(value_name)
+        cur_prog = self._current_segment(value_basename)
+        return cur_prog.get(value_name) if cur_prog is not None else None
 
     def set_current_value(
         self, value_basename: str, value_name: str, value: Any
     ) -> None:
         """Set the current schedule segment value for a named key (in-memory only)."""
-        now = datetime.now()
-        now_minutes = now.hour * 60 + now.minute
-
-        schedule = self.my_api.get_data(value_basename)
-        cur_prog = schedule[0]
-        for prog in schedule[1:]:
-            if int(prog["st"]) < now_minutes:
-                cur_prog = prog
-            else:
-                break
-        cur_prog[value_name] = value
+        cur_prog = self._current_segment(value_basename)
+        if cur_prog is not None:
+            cur_prog[value_name] = value
 
 
 # REEFPOWER
@@ -1501,6 +2091,10 @@ class ReefBeatCloudCoordinator(ReefBeatCoordinator):
     - handles link requests from local coordinators via HA bus events
     """
 
+    # Account data needs an authenticated session anyway: fetched at setup.
+    _use_snapshot = False
+    _own_session = False
+
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the cloud coordinator and its API client."""
         super().__init__(hass, entry)
@@ -1525,10 +2119,6 @@ class ReefBeatCloudCoordinator(ReefBeatCoordinator):
             )
             self._hass.bus.fire("redsea_ask_for_cloud_link_ready", {})
 
-    async def async_setup(self) -> None:
-        """Public entry-point for one-time initialization."""
-        await self._async_setup()
-
     # Wave library helpers
     def get_no_wave(self, device: Any) -> dict[str, Any] | None:
         """Return the 'no wave' preset for the aquarium associated with `device`."""
@@ -1583,10 +2173,7 @@ class ReefBeatCloudCoordinator(ReefBeatCoordinator):
             return
 
         _LOGGER.debug("Listen for %s", url)
-        self.my_api.data["sources"].insert(
-            len(self.my_api.data["sources"]),
-            {"name": url, "type": "data", "data": ""},
-        )
+        self.my_api.add_source(url, "data", "")
         await self.my_api.fetch_data()
         self._hass.bus.fire("request_latest_firmware", {"device_name": device_name})
 
@@ -1650,3 +2237,17 @@ class ReefBeatCloudCoordinator(ReefBeatCoordinator):
             di_dict["via_device"] = via_device
 
         return cast(DeviceInfo, di_dict)
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def _task_outcome(task: asyncio.Task[Any]) -> str:
+    """Return "ok", "cancelled" or the error raised by a finished task."""
+    if task.cancelled():
+        return "cancelled"
+    if (err := task.exception()) is not None:
+        return f"{err.__class__.__name__}: {err}"
+    return "ok"
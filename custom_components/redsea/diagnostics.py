@@ -0,0 +1,69 @@
+"""Diagnostics support for the Red Sea ReefBeat integration.
+
+The diagnostics download of a config entry describes the device and the state
+of its HTTP layer: per-source request metrics (count, latency histogram,
+retries, timeouts, bytes, last error), connection pool, request limiter,
+circuit breaker, polling schedule, coalesced GETs and debounced writes. The
+time the device took to load its initial data is included, with the startup
+ordering state while Home Assistant starts, and for a virtual LED the outcome
+of the last command broadcast to its linked LEDs. Credentials are redacted.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONFIG_FLOW_CLOUD_PASSWORD,
+    CONFIG_FLOW_CLOUD_USERNAME,
+    CONFIG_FLOW_WIFI_PASSWORD,
+    DOMAIN,
+)
+from .reefbeat import parse_cache_info
+from .startup import DATA_STARTUP
+
+TO_REDACT = {
+    CONFIG_FLOW_CLOUD_PASSWORD,
+    CONFIG_FLOW_CLOUD_USERNAME,
+    CONFIG_FLOW_WIFI_PASSWORD,
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    device = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+        },
+        "jsonpath_cache": parse_cache_info(),
+    }
+    startup = hass.data.get(DATA_STARTUP)
+    if startup is not None:
+        diagnostics["startup"] = startup.stats()
+    if device is None:
+        return diagnostics
+
+    diagnostics["device"] = {
+        "model": getattr(device, "model", None),
+        "sw_version": getattr(device, "sw_version", None),
+        "offline": getattr(device, "offline", None),
+        "last_update_success": device.last_update_success,
+        "setup_time": getattr(device, "setup_time", None),
+        "layout": getattr(device.my_api, "layout", None),
+        "last_broadcast": getattr(device, "last_broadcast", None),
+        "last_schedule_upload": getattr(device.my_api, "last_schedule_upload", None),
+        "sources": [
+            {"name": s["name"], "type": s["type"]}
+            for s in device.my_api.data.get("sources", [])
+        ],
+    }
+    diagnostics["transport"] = device.transport_stats()
+    return diagnostics
@@ -5,6 +5,8 @@ This module standardizes entity structure across platforms:
 - Use Home Assistant's CoordinatorEntity everywhere (best practice).
 - Add an optional RestoreEntity helper so platforms can restore last state at startup
   without re-implementing boilerplate.
+- Flag entities showing state restored from a device snapshot with a `stale`
+  attribute, until the initial fetch of their coordinator completed.
 
 Strict typing note:
 CoordinatorEntity and Entity define `available` with different descriptor types in
@@ -15,15 +17,17 @@ runtime behavior is correct. To keep strict typing happy, we explicitly override
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Mapping
 from dataclasses import dataclass
 from functools import cached_property
 from typing import Any, Generic, TypeVar
 
+from homeassistant.core import callback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .coordinator import ReefBeatCoordinator
+from .reefbeat import source_name
 
 _T = TypeVar("_T")
 
@@ -67,13 +71,55 @@ class ReefRoleMixin:
         base = getattr(self, "_attr_extra_state_attributes", None) or {}
         tk = getattr(self, "translation_key", None)
         if tk:
-            return {**base, "reef_role": tk}
-        return dict(base) if base else None
+            return _with_stale({**base, "reef_role": tk}, self)
+        return _with_stale(dict(base) if base else None, self)
 
 
 # REEFBEAT
 class ReefBeatEntity(CoordinatorEntity[ReefBeatCoordinator]):
-    """CoordinatorEntity base for all entities."""
+    """CoordinatorEntity base for all entities.
+
+    Entities reading only a fixed set of device sources either get them from
+    their description (`sources`, for `value_fn` based descriptions) or list
+    the description fields holding their JSONPaths in `_scope_fields`. The
+    resulting `source_scope` is registered as listener context, so the
+    coordinator skips them after polls that did not change any of those sources.
+    """
+
+    # Description fields holding the JSONPaths the entity reads. Empty: the
+    # entity is updated after every poll.
+    _scope_fields: tuple[str, ...] = ()
+
+    @property
+    def source_scope(self) -> frozenset[str] | None:
+        """Return the sources the entity reads, or None when not scoped."""
+        if not self._scope_fields:
+            return None
+        desc = getattr(self, "entity_description", None)
+        declared = getattr(desc, "sources", None)
+        if declared is not None:
+            return frozenset(declared) or None
+        return scope_of_paths(
+            getattr(desc, field, None) for field in self._scope_fields
+        )
+
+    @cached_property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        # Cached like Entity's: setting `_attr_extra_state_attributes` clears it
+        # and `async_write_ha_state()` drops it once the `stale` flag is gone.
+        return _with_stale(getattr(self, "_attr_extra_state_attributes", None), self)
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        cached = vars(self).get("extra_state_attributes")
+        if cached and cached.get("stale") and not self.coordinator.stale:
+            vars(self).pop("extra_state_attributes")
+        super().async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        if self.coordinator_context is None:
+            self.coordinator_context = self.source_scope
+        await super().async_added_to_hass()
 
 
 # RESTORE
@@ -115,3 +161,37 @@ class ReefBeatRestoreEntity(ReefBeatEntity, RestoreEntity):
             return
 
         setattr(self, self._restore_spec.attr_name, restored)
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def scope_of_paths(paths: Iterable[str | None]) -> frozenset[str] | None:
+    """Return the sources read by a set of JSONPaths.
+
+    Empty paths are ignored. Returns None when no path is given or when one of
+    them does not address a single source (`$.local...`, plain field names...),
+    in which case the entity can not be scoped.
+    """
+    names: set[str] = set()
+    for path in paths:
+        if not path:
+            continue
+        name = source_name(path)
+        if name is None:
+            return None
+        names.add(name)
+    return frozenset(names) or None
+
+
+def _with_stale(attrs: dict[str, Any] | None, entity: Any) -> dict[str, Any] | None:
+    """Flag the attributes of an entity showing state restored from a snapshot.
+
+    The `stale` attribute is set until the coordinator completed its initial
+    fetch (see `ReefBeatCoordinator.stale`).
+    """
+    if getattr(getattr(entity, "coordinator", None), "stale", False) is not True:
+        return attrs
+    return {**(attrs or {}), "stale": True}
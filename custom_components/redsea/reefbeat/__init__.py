@@ -7,10 +7,11 @@ It re-exports the public API so external imports remain stable.
 from __future__ import annotations
 
 # Core helpers / base API
-from .api import ReefBeatAPI, parse
+from .api import ReefBeatAPI, parse, parse_cache_info, source_name
 
 # Device/cloud implementations (import and re-export)
 from .ato import ReefATOAPI
+from .breaker import DeviceOfflineError
 from .cloud import InvalidAuth, ReefBeatCloudAPI
 from .control import ReefControlAPI
 from .dose import ReefDoseAPI
@@ -21,6 +22,7 @@ from .run import ReefRunAPI
 from .wave import ReefWaveAPI
 
 __all__ = [
+    "DeviceOfflineError",
     "InvalidAuth",
     "ReefATOAPI",
     "ReefBeatAPI",
@@ -33,4 +35,6 @@ __all__ = [
     "ReefRunAPI",
     "ReefWaveAPI",
     "parse",
+    "parse_cache_info",
+    "source_name",
 ]
@@ -0,0 +1,352 @@
+"""Compiled accessors over the cached ReefBeat state dict.
+
+`ReefBeatAPI.get_data()` is called for every entity on every coordinator tick.
+Resolving a JSONPath expression with jsonpath-ng on each read is slow, so each
+expression is compiled once into an `Accessor`: a chain of steps walked directly
+on later reads.
+
+Steps are plain dict keys / list indexes, or filters such as
+`[?(@.name=='/manual')]` or `[?(@.uid=='...')]`. A filter remembers the position
+it matched last time, but re-checks the element found there on every read and
+rescans the array when it no longer matches. Reads therefore stay O(1) in the
+common case and never return another element after the array was rebuilt or
+reordered (`add_source`/`remove_source`, a probe unplugged, a new payload...).
+
+Expressions using syntax outside of that subset (slices, wildcards, recursive
+descent...) fall back to a full jsonpath-ng `find()` on each read.
+"""
+
+from __future__ import annotations
+
+import operator
+from collections.abc import Callable
+from typing import Any, cast
+
+# Errors raised when a compiled accessor does not resolve on the cached state.
+ACCESS_ERRORS: tuple[type[Exception], ...] = (KeyError, IndexError, TypeError)
+
+# Comparison operators supported in filters (same table as jsonpath-ng ext).
+_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_MISSING = object()
+
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class Predicate:
+    """One `@.field <op> value` test of a filter step."""
+
+    __slots__ = ("_cmp", "fields", "op", "value")
+
+    def __init__(self, fields: tuple[str, ...], op: str | None, value: Any) -> None:
+        """Create a predicate on the value found at `fields` below the item.
+
+        Args:
+            fields: Key chain below the filtered item (`@.a.b` -> ("a", "b")).
+            op: Comparison operator, or None to only test for existence.
+            value: Right-hand side of the comparison.
+        """
+        self.fields = fields
+        self.op = op
+        self.value = value
+        self._cmp = _OPERATORS[op] if op is not None else None
+
+    def __call__(self, item: Any) -> bool:
+        """Return True if `item` satisfies the predicate."""
+        node = item
+        for key in self.fields:
+            if not isinstance(node, dict):
+                return False
+            node = node.get(key, _MISSING)
+            if node is _MISSING:
+                return False
+        if self._cmp is None:
+            return True
+        # jsonpath-ng compares numeric filters against numeric strings too.
+        if type(self.value) is int and isinstance(node, str):
+            try:
+                node = int(node)
+            except ValueError:
+                return False
+        try:
+            return bool(self._cmp(node, self.value))
+        except TypeError:
+            return False
+
+    def __repr__(self) -> str:
+        target = "@." + ".".join(self.fields)
+        if self.op is None:
+            return target
+        return f"{target}{self.op}{self.value!r}"
+
+
+class FilterStep:
+    """A `[?(...)]` step selecting the first item matching all predicates.
+
+    The position of the last match is kept and re-validated on each read.
+    `unique` records whether the last full scan matched a single item.
+    """
+
+    __slots__ = ("position", "predicates", "unique")
+
+    def __init__(self, predicates: tuple[Predicate, ...]) -> None:
+        """Create a filter step from its (AND-ed) predicates."""
+        self.predicates = predicates
+        self.position: Any = None
+        self.unique = False
+
+    def matches(self, item: Any) -> bool:
+        """Return True if `item` satisfies every predicate."""
+        for predicate in self.predicates:
+            if not predicate(item):
+                return False
+        return True
+
+    def candidates(self, node: Any) -> list[tuple[Any, Any]]:
+        """Return every `(position, item)` of `node` matched by the filter.
+
+        Raises:
+            TypeError: If `node` is neither a list nor a dict.
+        """
+        if isinstance(node, list):
+            return [(i, item) for i, item in enumerate(node) if self.matches(item)]
+        if isinstance(node, dict):
+            return [(k, item) for k, item in node.items() if self.matches(item)]
+        raise TypeError(f"Can not filter {type(node).__name__}")
+
+    def select(self, node: Any) -> Any:
+        """Return the item of `node` (list or dict values) matched by the filter.
+
+        The remembered position is tried first, then `node` is rescanned.
+
+        Raises:
+            KeyError: If no item matches.
+            TypeError: If `node` is neither a list nor a dict.
+        """
+        position = self.position
+        if isinstance(node, list):
+            if (
+                type(position) is int
+                and position < len(node)
+                and self.matches(node[position])
+            ):
+                return node[position]
+        elif isinstance(node, dict):
+            if position in node and self.matches(node[position]):
+                return node[position]
+        found = self.candidates(node)
+        if not found:
+            raise KeyError(repr(self))
+        self.position, item = found[0]
+        self.unique = len(found) == 1
+        return item
+
+    def __repr__(self) -> str:
+        return "[?(" + " & ".join(repr(p) for p in self.predicates) + ")]"
+
+
+class Accessor:
+    """Pre-compiled getter for one JSONPath expression.
+
+    `steps` holds dict keys (str), list indexes (int) and `FilterStep`s, walked
+    in order from the root of the cached state.
+    """
+
+    __slots__ = ("expr", "steps")
+
+    def __init__(self, expr: str, steps: tuple[str | int | FilterStep, ...]) -> None:
+        """Create an accessor for `expr` compiled to `steps`."""
+        self.expr = expr
+        self.steps = steps
+
+    def get(self, data: Any) -> Any:
+        """Return the value addressed by the expression.
+
+        Raises:
+            KeyError, IndexError, TypeError: If the expression does not resolve on
+                the current cached structure.
+        """
+        node = data
+        try:
+            for step in self.steps:
+                if type(step) is FilterStep:
+                    node = step.select(node)
+                else:
+                    node = node[step]
+        except ACCESS_ERRORS:
+            # Like jsonpath-ng, a filter matching several items yields the first
+            # one for which the rest of the path resolves.
+            return self._search(data, 0)
+        return node
+
+    def locate(self, data: Any) -> tuple[Any, str | int]:
+        """Return the `(container, key)` holding the addressed value.
+
+        Used by `set_data()` to write in place. Only single-location paths are
+        located: every filter must have matched exactly one item and the last
+        step must be a key/index already present in its container (jsonpath-ng
+        updates never create keys).
+
+        Raises:
+            KeyError, IndexError, TypeError: If the path can not be located that
+                way; callers fall back to a full JSONPath update.
+        """
+        steps = self.steps
+        if not steps or type(steps[-1]) is FilterStep:
+            raise TypeError("Last step is not a key/index")
+        node = data
+        for step in steps[:-1]:
+            if type(step) is FilterStep:
+                node = step.select(node)
+                if not step.unique:
+                    raise KeyError(f"{step!r} is not unique")
+            else:
+                node = node[step]
+        key = cast(str | int, steps[-1])
+        if type(node) is dict:
+            if key not in node:
+                raise KeyError(key)
+        elif type(node) is list and type(key) is int:
+            if not -len(node) <= key < len(node):
+                raise IndexError(key)
+        else:
+            raise TypeError(f"Can not write into {type(node).__name__}")
+        return node, key
+
+    def _search(self, node: Any, start: int) -> Any:
+        """Resolve `steps[start:]` trying every item matched by each filter."""
+        for i in range(start, len(self.steps)):
+            step = self.steps[i]
+            if type(step) is not FilterStep:
+                node = node[step]
+                continue
+            found = step.candidates(node)
+            for position, item in found:
+                try:
+                    value = self._search(item, i + 1)
+                except ACCESS_ERRORS:
+                    continue
+                step.position = position
+                step.unique = len(found) == 1
+                return value
+            raise KeyError(repr(step))
+        return node
+
+    def __repr__(self) -> str:
+        return f"Accessor({self.expr!r}, {self.steps!r})"
+
+
+class FindAccessor(Accessor):
+    """Fallback accessor running a full jsonpath-ng `find()` on every read."""
+
+    __slots__ = ("_query",)
+
+    def __init__(self, expr: str, query: Any) -> None:
+        """Create a fallback accessor for an already parsed expression."""
+        super().__init__(expr, ())
+        self._query = query
+
+    def get(self, data: Any) -> Any:
+        """Return the first match of the expression.
+
+        Raises:
+            KeyError: If the expression has no match.
+        """
+        res = self._query.find(data)
+        if not res:
+            raise KeyError(self.expr)
+        return res[0].value
+
+    def locate(self, data: Any) -> tuple[Any, str | int]:
+        """Not supported: writes always go through a JSONPath update."""
+        raise TypeError("Fallback accessors can not be located")
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def _single_field(node: Any) -> str:
+    """Return the name of a single-field `Fields` node."""
+    fields = node.fields
+    if len(fields) != 1 or fields[0] == "*":
+        raise ValueError(f"Unsupported field step: {node}")
+    return str(fields[0])
+
+
+def _target_fields(node: Any) -> tuple[str, ...]:
+    """Return the key chain of a filter target such as `@.a.b`."""
+    kind = type(node).__name__
+    if kind == "This":
+        return ()
+    if kind == "Fields":
+        return (_single_field(node),)
+    if kind == "Child":
+        return _target_fields(node.left) + _target_fields(node.right)
+    raise ValueError(f"Unsupported filter target: {node}")
+
+
+def _compile_node(node: Any, out: list[str | int | FilterStep]) -> None:
+    """Append the steps of a parsed jsonpath-ng node to `out`."""
+    kind = type(node).__name__
+    if kind == "Root":
+        return
+    if kind == "Child":
+        _compile_node(node.left, out)
+        _compile_node(node.right, out)
+    elif kind == "Fields":
+        out.append(_single_field(node))
+    elif kind == "Index":
+        # jsonpath-ng >= 1.6 exposes `indices`, older releases `index`.
+        indices = getattr(node, "indices", None) or (node.index,)
+        if len(indices) != 1:
+            raise ValueError(f"Unsupported index step: {node}")
+        out.append(int(indices[0]))
+    elif kind == "Filter":
+        predicates: list[Predicate] = []
+        for expression in node.expressions:
+            if expression.op is not None and expression.op not in _OPERATORS:
+                raise ValueError(f"Unsupported filter operator: {expression.op}")
+            predicates.append(
+                Predicate(
+                    _target_fields(expression.target),
+                    expression.op,
+                    expression.value,
+                )
+            )
+        if not predicates:
+            raise ValueError("Empty filter")
+        out.append(FilterStep(tuple(predicates)))
+    else:
+        raise ValueError(f"Unsupported path step: {node}")
+
+
+def compile_accessor(expr: str, query: Any) -> Accessor:
+    """Compile a parsed JSONPath expression into an `Accessor`.
+
+    Args:
+        expr: The JSONPath source string (kept for logging/repr).
+        query: The jsonpath-ng tree returned by `parse(expr)`.
+
+    Returns:
+        A step-based `Accessor`, or a `FindAccessor` when the expression uses
+        syntax that can not be compiled.
+    """
+    steps: list[str | int | FilterStep] = []
+    try:
+        _compile_node(query, steps)
+    except (ValueError, AttributeError):
+        return FindAccessor(expr, query)
+    return Accessor(expr, tuple(steps))
@@ -8,21 +8,41 @@ offers JSONPath-based getters/setters as well as async-safe HTTP helpers.
 from __future__ import annotations
 
 import asyncio
-import json
+import hashlib
 import logging
+import re
 import time
 from asyncio import timeout
-from collections.abc import Awaitable
-from contextlib import suppress
+from collections.abc import Awaitable, Mapping
+from contextlib import AbstractAsyncContextManager, nullcontext
+from functools import lru_cache
 from typing import Any, Protocol, TypedDict, cast
 
 import aiohttp
 from jsonpath_ng.ext import parse as _parse  # type: ignore
 
-from ..const import DEFAULT_TIMEOUT, HTTP_DELAY_BETWEEN_RETRY, HTTP_MAX_RETRY
+from ..const import (
+    DEFAULT_TIMEOUT,
+    HTTP_DELAY_BETWEEN_RETRY,
+    HTTP_MAX_RETRY,
+    JSONPATH_CACHE_SIZE,
+    REQUEST_CONCURRENCY,
+    SOURCE_POLL_PERIODS,
+    SourcePollPeriods,
+)
+from .accessor import ACCESS_ERRORS, Accessor, compile_accessor
+from .breaker import CircuitBreaker, DeviceOfflineError, backoff_delay
+from .limiter import POLL, USER, RequestLimiter
+from .metrics import RequestMetrics
+from .payload import NOT_JSON, decode_body, decode_text, loads
+from .scheduler import SourceScheduler
+from .session import HttpSession
 
 _LOGGER = logging.getLogger(__name__)
 
+# Source name of a `$.sources[?(@.name=='...')]...` JSONPath.
+_SOURCE_NAME_RE = re.compile(r"""\$\.sources\[\?\(@\.name==?(['"])(.*?)\1\)\]""")
+
 
 # -----------------------------------------------------------------------------
 # Typed jsonpath-ng helpers
@@ -49,11 +69,44 @@ class JSONPathExpr(Protocol):
     def update(self, data: Any, value: Any) -> Any: ...
 
 
+class PhaseGate(Protocol):
+    """Gate run around each phase of `get_initial_data()` (startup ordering)."""
+
+    def phase(self, name: str) -> AbstractAsyncContextManager[None]: ...
+
+
+@lru_cache(maxsize=JSONPATH_CACHE_SIZE)
 def parse(expr: str) -> JSONPathExpr:
-    """Typed wrapper around jsonpath_ng.ext.parse."""
+    """Typed, cached wrapper around jsonpath_ng.ext.parse.
+
+    Parsing goes through jsonpath-ng's PLY lexer/parser and is slow compared to
+    evaluating the resulting tree, while the integration only ever uses a
+    bounded set of expressions. Parsed trees are immutable, so they are shared
+    by every API instance through a process-wide LRU cache.
+    """
     return cast(JSONPathExpr, _parse(expr))
 
 
+def parse_cache_info() -> dict[str, int]:
+    """Return hit/miss counters of the `parse()` cache (for diagnostics)."""
+    info = parse.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize or 0,
+    }
+
+
+def source_name(path: str) -> str | None:
+    """Return the source a `$.sources[?(@.name=='...')]...` JSONPath reads from.
+
+    Returns None for any other expression (`$.local...`, `$.sources[*]`...).
+    """
+    match = _SOURCE_NAME_RE.match(path)
+    return match.group(2) if match is not None else None
+
+
 # -----------------------------------------------------------------------------
 # Data typing helpers
 # -----------------------------------------------------------------------------
@@ -67,18 +120,132 @@ class SourceEntry(TypedDict):
     data: Any
 
 
-class HttpResult(TypedDict, total=False):
-    """Structured HTTP call result (debug-friendly)."""
+class HttpResult(dict[str, Any]):
+    """Structured HTTP call result (debug-friendly).
+
+    Keys: `ok`, `method`, `url`, `status`, `reason`, `elapsed_ms`, and `json`
+    when the body parsed as JSON. `headers` and `text` are only built from the
+    response on first access (the `redsea.request` service, error and debug
+    logs), as most results are only checked for their status and JSON.
+    """
+
+    __slots__ = ("_raw", "_raw_headers")
+
+    _LAZY = ("headers", "text")
 
-    ok: bool
-    method: str
-    url: str
-    status: int
-    reason: str
-    headers: dict[str, str]
-    text: str
-    json: Any
-    elapsed_ms: int
+    def __init__(
+        self, fields: dict[str, Any], raw: bytes, headers: Mapping[str, str]
+    ) -> None:
+        super().__init__(fields)
+        self._raw = raw
+        self._raw_headers = headers
+
+    def __missing__(self, key: str) -> Any:
+        if key == "text":
+            value: Any = decode_text(self._raw)
+        elif key == "headers":
+            value = dict(self._raw_headers.items())
+        else:
+            raise KeyError(key)
+        self[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return super().__contains__(key) or key in self._LAZY
+
+    def get(self, key: str, default: Any = None) -> Any:  # type: ignore[override]
+        """Return `key`, building lazy keys on demand."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class SourceMatch:
+    """Match-like handle on a source entry (`value` is the entry dict itself)."""
+
+    __slots__ = ("value",)
+
+    context: Any = None
+    path: Any = None
+
+    def __init__(self, value: SourceEntry) -> None:
+        """Wrap a source entry so it can be passed where a `Match` is expected."""
+        self.value = value
+
+
+class SourceRegistry:
+    """Name and type index over the `self.data["sources"]` list.
+
+    The list itself stays the source of truth (entities, diagnostics and tests
+    read it directly). The index is rebuilt lazily whenever the list object is
+    replaced or its length changes, so lookups stay O(1) without re-running a
+    JSONPath filter over every source.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty registry (bound on first `sync()`)."""
+        self._sources: list[SourceEntry] | None = None
+        self._size = -1
+        self._by_name: dict[str, list[SourceEntry]] = {}
+        self._by_type: dict[str, list[SourceEntry]] = {}
+
+    def sync(self, sources: Any) -> SourceRegistry:
+        """Bind the registry to `sources`, reindexing if the list changed."""
+        if not isinstance(sources, list):
+            sources = []
+        if sources is self._sources and len(sources) == self._size:
+            return self
+        by_name: dict[str, list[SourceEntry]] = {}
+        by_type: dict[str, list[SourceEntry]] = {}
+        for entry in cast(list[SourceEntry], sources):
+            if not isinstance(entry, dict):
+                continue
+            by_name.setdefault(entry.get("name"), []).append(entry)
+            by_type.setdefault(entry.get("type"), []).append(entry)
+        self._sources = cast(list[SourceEntry], sources)
+        self._size = len(sources)
+        self._by_name = by_name
+        self._by_type = by_type
+        return self
+
+    def add(self, entry: SourceEntry) -> None:
+        """Index an entry just appended to the bound list."""
+        self._by_name.setdefault(entry["name"], []).append(entry)
+        self._by_type.setdefault(entry["type"], []).append(entry)
+        self._size += 1
+
+    def get(self, name: str) -> SourceEntry | None:
+        """Return the first source registered under `name`, if any."""
+        entries = self._by_name.get(name)
+        return entries[0] if entries else None
+
+    def named(self, name: str) -> list[SourceEntry]:
+        """Return every source registered under `name`."""
+        return list(self._by_name.get(name, ()))
+
+    def of_type(self, *types: str) -> list[SourceEntry]:
+        """Return the sources of the given types, in registration order."""
+        if len(types) == 1:
+            return list(self._by_type.get(types[0], ()))
+        wanted = set(types)
+        return [s for s in self._sources or () if s.get("type") in wanted]
+
+    def not_of_type(self, *types: str) -> list[SourceEntry]:
+        """Return the typed sources not of the given types, in registration order."""
+        return [
+            s
+            for s in self._sources or ()
+            if isinstance(s, dict)
+            and s.get("type") is not None
+            and s.get("type") not in types
+        ]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._by_name
+
+    def __len__(self) -> int:
+        return max(self._size, 0)
 
 
 class ReefBeatAPI:
@@ -90,18 +257,35 @@ class ReefBeatAPI:
             - `local`: integration-maintained derived state
             - `message`: last response message/alert decoded from push calls
         - Provide JSONPath-based getters/setters (`get_data`, `set_data`)
+        - Index registered sources by name and type (`sources`)
         - Provide async HTTP fetch/push with retry/backoff (`fetch_*`, `_http_send`)
+        - Give each source its own polling cadence (`scheduler`, `_poll_periods`)
+        - Share identical in-flight GETs between concurrent callers (`get_stats`)
+        - Fail fast while the device is unreachable (`breaker`, `offline`)
+        - Cap concurrent requests to the device, user requests first (`limiter`)
+        - Record per-source latency, errors and bytes of every fetch (`metrics`)
+        - Save and restore the cached state across restarts (`snapshot`,
+          `restore_snapshot`) and the detected firmware variant (`layout`,
+          `use_layout`)
 
     Notes:
         - Subclasses may override `connect()` for authentication (cloud and secure devices).
-        - `get_data()` uses an internal cache of eval()-able paths for speed.
+        - Subclasses set `_poll_periods` to their family table from const.py.
+        - `_probe_source` is the cheap source fetched to probe an offline device.
+        - Subclasses lower `_request_concurrency` for devices that cannot serve
+          as many connections.
+        - `get_data()` uses an internal cache of compiled accessors for speed.
     """
 
+    _poll_periods: SourcePollPeriods = SOURCE_POLL_PERIODS
+    _probe_source = "/device-info"
+    _request_concurrency: int = REQUEST_CONCURRENCY
+
     def __init__(
         self,
         ip: str,
         live_config_update: bool,
-        session: aiohttp.ClientSession,
+        session: HttpSession,
         secure: bool = False,
     ) -> None:
         """Initialize the base API client.
@@ -137,11 +321,36 @@ class ReefBeatAPI:
         self.data["local"] = {"use_cloud_api": None}
         self.data["message"] = {}
 
-        # Cache mapping JSONPath expression -> "self.data[...]..." eval string
-        self._data_db: dict[str, str] = {}
+        # Cache mapping JSONPath expression -> compiled key/index accessor
+        self._data_db: dict[str, Accessor] = {}
+        # Name/type index over self.data["sources"] (see `sources`).
+        self._registry = SourceRegistry()
+
+        # Change detection: fingerprint of the last raw payload per source, the
+        # sources whose last GET returned that same payload, and the sources
+        # whose payload changed since `pop_changed_sources()` was last called.
+        self._fingerprints: dict[str, bytes] = {}
+        self._unchanged: set[str] = set()
+        self._changed_sources: set[str] = set()
+        # Per-source polling cadence of `fetch_data()`.
+        self.scheduler = SourceScheduler(self._poll_periods)
+
+        # Single-flight GETs: in-flight fetch per URL, tagged with the number of
+        # requests sent to the device when it started (see `_call_url`).
+        self._inflight: dict[str, tuple[int, asyncio.Future[None]]] = {}
+        self._send_generation = 0
+        self.get_stats: dict[str, int] = {"calls": 0, "coalesced": 0}
+        # Reachability of the device: requests fail fast while it is offline.
+        self.breaker = CircuitBreaker()
+        # Requests in flight to the device: polls yield to user requests.
+        self.limiter = RequestLimiter(self._request_concurrency)
+        # Per-source latency, error and volume counters of the fetch path.
+        self.metrics = RequestMetrics()
 
         self.last_update_success: bool | None = None
-        self.quick_refresh: str | None = None
+        self.quick_refresh: str | set[str] | None = None
+        # Set by the integration while Home Assistant starts (see startup.py).
+        self.startup_gate: PhaseGate | None = None
         self._live_config_update = bool(live_config_update)
         self._header: dict[str, str] | None = None
 
@@ -152,26 +361,27 @@ class ReefBeatAPI:
         url: str,
         status: int,
         reason: str,
-        headers: dict[str, str],
-        text: str,
-        json_body: Any | None,
+        headers: Mapping[str, str],
+        raw: bytes,
         started: float,
     ) -> HttpResult:
-        """Build a structured result object for debugging and service responses."""
+        """Build a structured result object for debugging and service responses.
+
+        The body is parsed once here; headers and text are left to `HttpResult`.
+        """
         elapsed_ms = int((time.time() - started) * 1000)
-        result: HttpResult = {
+        fields: dict[str, Any] = {
             "ok": 200 <= status < 300,
             "method": method,
             "url": url,
             "status": int(status),
             "reason": reason or "",
-            "headers": headers,
-            "text": text or "",
             "elapsed_ms": elapsed_ms,
         }
-        if json_body is not None:
-            result["json"] = json_body
-        return result
+        json_body = loads(raw)
+        if json_body is not NOT_JSON and json_body is not None:
+            fields["json"] = json_body
+        return HttpResult(fields, raw, headers)
 
     def clean_message(self, type_msg):
         if type_msg == "last_message" or type_msg == "All":
@@ -196,33 +406,32 @@ class ReefBeatAPI:
         started = time.time()
         _LOGGER.debug("http_get %s", url)
         try:
-            async with timeout(DEFAULT_TIMEOUT):
-                async with self._session.get(
-                    url, headers=self._header, ssl=False
-                ) as resp:
-                    text = await resp.text()
-                    json_body: Any | None = None
-                    with suppress(Exception):
-                        json_body = await resp.json(content_type=None)
-
-                    return self._build_result(
-                        method="get",
-                        url=url,
-                        status=resp.status,
-                        reason=resp.reason or "",
-                        headers={k: v for k, v in resp.headers.items()},
-                        text=text,
-                        json_body=json_body,
-                        started=started,
-                    )
+            async with (
+                self.limiter.slot(USER),
+                timeout(DEFAULT_TIMEOUT),
+                self._session.get(url, headers=self._header, ssl=False) as resp,
+            ):
+                return self._build_result(
+                    method="get",
+                    url=url,
+                    status=resp.status,
+                    reason=resp.reason or "",
+                    headers=resp.headers,
+                    raw=await resp.read(),
+                    started=started,
+                )
         except Exception as err:
             _LOGGER.debug("http_get failed: %s", err)
             return None
 
-    async def _http_get(self, session: aiohttp.ClientSession, source: Match) -> bool:
+    async def _http_get(self, session: HttpSession, source: Match) -> bool:
         """HTTP GET one endpoint and store its response into self.data.
 
         Returns True if request succeeded and response was parsed/accepted.
+
+        Raises:
+            aiohttp.ClientError: The device could not be reached.
+            asyncio.TimeoutError: The device did not answer in time.
         """
         endpoint = source.value.get("name")
         if not endpoint:
@@ -231,10 +440,12 @@ class ReefBeatAPI:
         url = f"{self._base_url}{endpoint}"
         _LOGGER.debug("_http_get %s", url)
 
+        started = time.monotonic()
         try:
             req_timeout = getattr(self, "_timeout", 10)
             async with timeout(req_timeout):
                 async with session.get(url, headers=self._header, ssl=False) as resp:
+                    self.breaker.record_success()
                     if resp.status == 401 and self._secure:
                         # token expired — renew once
                         await self.connect()
@@ -253,18 +464,28 @@ class ReefBeatAPI:
                             resp.reason,
                             source,
                         )
+                        if resp.status == 404:
+                            self._source_not_found(endpoint)
+                        self.metrics.record(
+                            endpoint,
+                            elapsed=time.monotonic() - started,
+                            error=f"HTTP {resp.status} {resp.reason or ''}".strip(),
+                        )
                         return False
 
-                    # Prefer JSON, but tolerate text
-                    content_type = (resp.headers.get("Content-Type") or "").lower()
-                    if "application/json" in content_type:
-                        payload: Any = await resp.json(content_type=None)
+                    # Read the raw body once: fingerprint it, then parse it.
+                    raw = await resp.read()
+                    self.metrics.record(
+                        endpoint, elapsed=time.monotonic() - started, size=len(raw)
+                    )
+                    fingerprint = hashlib.blake2b(raw, digest_size=16).digest()
+                    if self._fingerprints.get(endpoint) == fingerprint:
+                        self._unchanged.add(endpoint)
                     else:
-                        text = await resp.text()
-                        try:
-                            payload = json.loads(text)
-                        except Exception:
-                            payload = text
+                        self._fingerprints[endpoint] = fingerprint
+
+                    # Prefer JSON, but tolerate text
+                    payload = decode_body(raw)
 
                     # Preserve your existing "sources" contract:
                     # store under the source name key (or whatever your integration expects)
@@ -274,37 +495,91 @@ class ReefBeatAPI:
 
         except (aiohttp.ClientError, asyncio.TimeoutError) as err:
             _LOGGER.debug("GET %s error: %s", url, err)
-            return False
+            timed_out = isinstance(err, asyncio.TimeoutError)
+            self.metrics.record(
+                endpoint,
+                elapsed=time.monotonic() - started,
+                error="timeout" if timed_out else f"{type(err).__name__}: {err}",
+                timed_out=timed_out,
+            )
+            raise
 
-    async def _call_url(self, session: aiohttp.ClientSession, source: Match) -> None:
-        """Fetch one source with retries.
+    async def _call_url(self, session: HttpSession, source: Match) -> None:
+        """Fetch one source with retries, sharing identical in-flight GETs.
 
-        Marks the instance in error (`self._in_error=True`) if all retries fail.
+        Concurrent callers asking for the same source (scheduled poll, config
+        fetch, virtual LED...) await a single fetch instead of each sending its
+        own request. A fetch started before the last request sent to the device
+        is not joined, as it may return the state from before that request.
+
+        Marks the instance in error (`self._in_error=True`) if all retries fail
+        or the device is offline.
+        """
+        url = self._base_url + str(source.value.get("name"))
+        self.get_stats["calls"] += 1
+        inflight = self._inflight.get(url)
+        if inflight is not None and inflight[0] == self._send_generation:
+            self.get_stats["coalesced"] += 1
+            await asyncio.shield(inflight[1])
+            return
+
+        task = asyncio.ensure_future(self._fetch_source(session, source))
+        entry = (self._send_generation, task)
+        self._inflight[url] = entry
+
+        def _done(_task: asyncio.Future[None]) -> None:
+            if self._inflight.get(url) is entry:
+                del self._inflight[url]
+
+        task.add_done_callback(_done)
+        await asyncio.shield(task)
+
+    async def _fetch_source(self, session: HttpSession, source: Match) -> None:
+        """Fetch one source with retries (see `_call_url`).
+
+        Retries back off exponentially with jitter, and stop as soon as the
+        circuit breaker considers the device offline. The breaker is told
+        about a failure once, when the retries did not reach the device.
         """
         status_ok = False
-        error_count = 0
-        while status_ok is False and error_count < HTTP_MAX_RETRY:
+        unreached = False
+        attempt = 0
+        name = source.value.get("name")
+        while self.breaker.acquire():
+            attempt += 1
+            unreached = False
             try:
-                status_ok = bool(await self._http_get(session, source))
+                async with self.limiter.slot(POLL):
+                    status_ok = bool(await self._http_get(session, source))
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                unreached = True
             except Exception as e:
-                error_count += 1
-                _LOGGER.debug(
-                    "Can not get data: %s, retry nb %d/%d",
-                    source.value.get("name"),
-                    error_count,
-                    HTTP_MAX_RETRY,
-                )
                 _LOGGER.debug("Exception: %s", e, exc_info=True)
 
-            if not status_ok:
-                await asyncio.sleep(HTTP_DELAY_BETWEEN_RETRY)
-
-        if not status_ok:
+            if status_ok or attempt >= HTTP_MAX_RETRY:
+                break
+            _LOGGER.debug(
+                "Can not get data: %s, retry nb %d/%d", name, attempt, HTTP_MAX_RETRY
+            )
+            self.metrics.record_retry(name)
+            await asyncio.sleep(backoff_delay(attempt, HTTP_DELAY_BETWEEN_RETRY))
+
+        if unreached:
+            self.breaker.record_failure()
+        if status_ok:
+            # Anything not confirmed identical by `_http_get` counts as changed.
+            changed = name not in self._unchanged
+            if changed:
+                self._changed_sources.add(name)
+            else:
+                self._unchanged.discard(name)
+            self.scheduler.record(name, changed)
+        elif attempt == 0:
+            _LOGGER.debug("Skipping %s%s: device offline", self.ip, name)
+            self._in_error = True
+        else:
             _LOGGER.error(
-                "Can not get data from %s%s after %s try",
-                self.ip,
-                source.value.get("name"),
-                HTTP_MAX_RETRY,
+                "Can not get data from %s%s after %s try", self.ip, name, attempt
             )
             self._in_error = True
 
@@ -316,27 +591,38 @@ class ReefBeatAPI:
             2) config sources (unless live config update is enabled)
             3) data sources
 
+        Each step runs within the matching phase of `startup_gate`, if set.
+
         Returns:
             The internal `self.data` dict.
         """
         _LOGGER.debug("Reefbeat.get_initial_data")
-        query = parse("$.sources[?(@.type=='device-info')]")
-        sources: list[Match] = query.find(self.data)
+        # Retried after a failed startup: judge this attempt on its own.
+        self.reset_error_state()
+        sources = self.sources.of_type("device-info")
 
         tasks: list[Awaitable[None]] = [
-            self._call_url(self._session, s) for s in sources
+            self._call_url(self._session, SourceMatch(s)) for s in sources
         ]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        async with self._startup_phase("device-info"):
+            await asyncio.gather(*tasks, return_exceptions=True)
 
         if self._in_error:
             raise Exception("Initialization failed, is your device on?")
 
         if not self._live_config_update:
-            await self.fetch_config()
-        await self.fetch_data()
+            async with self._startup_phase("config"):
+                await self.fetch_config()
+        async with self._startup_phase("data"):
+            await self.fetch_data()
         _LOGGER.debug("Initial data loaded for %s", self.ip)
         return self.data
 
+    def _startup_phase(self, name: str) -> AbstractAsyncContextManager[None]:
+        """Return the startup gate of phase `name` (no-op outside startup)."""
+        gate = self.startup_gate
+        return gate.phase(name) if gate is not None else nullcontext()
+
     async def fetch_config(self, config_path: str | None = None) -> None:
         """Fetch cached configuration sources.
 
@@ -346,13 +632,12 @@ class ReefBeatAPI:
         """
         _LOGGER.debug("reefbeat.fetch_config")
         if config_path is None:
-            query = parse("$.sources[?(@.type=='config')]")
+            sources = self.sources.of_type("config")
         else:
-            query = parse("$.sources[?(@.name=='" + config_path + "')]")
-        sources: list[Match] = query.find(self.data)
+            sources = self.sources.named(config_path)
 
         tasks: list[Awaitable[None]] = [
-            self._call_url(self._session, s) for s in sources
+            self._call_url(self._session, SourceMatch(s)) for s in sources
         ]
         await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -360,28 +645,99 @@ class ReefBeatAPI:
         """Fetch cached data sources.
 
         Behavior:
-            - If `quick_refresh` is set, fetch only that source once.
+            - If `quick_refresh` is set, fetch only that source (or set of
+              sources) once.
             - If live config update is enabled, fetch most non-device-info sources.
             - Otherwise fetch only sources where `type == "data"`.
+
+        Sources of type "lazy" are only fetched on demand (quick refresh or
+        subclass logic).
+
+        Outside of quick refreshes, only the sources due for this poll according
+        to `scheduler` are fetched.
+
+        Raises:
+            DeviceOfflineError: The device is offline and did not answer the
+                probe (or the breaker is not due for one yet).
         """
         if self.quick_refresh is not None:
-            query = parse("$.sources[?(@.name=='" + self.quick_refresh + "')]")
-            sources: list[Match] = query.find(self.data)
+            names = self.quick_refresh
+            if isinstance(names, str):
+                names = {names}
+            sources = [s for name in sorted(names) for s in self.sources.named(name)]
             self.quick_refresh = None
+        elif self._live_config_update:
+            sources = self.scheduler.select(
+                self.sources.not_of_type("device-info", "preview", "lazy")
+            )
         else:
-            if self._live_config_update:
-                query = parse("$.sources[?(@.type!='device-info' & @.type!='preview')]")
-            else:
-                query = parse("$.sources[?(@.type=='data')]")
-            sources = query.find(self.data)
+            sources = self.scheduler.select(self.sources.of_type("data"))
+
+        if self.breaker.offline:
+            sources = await self._probe(sources)
 
         tasks: list[Awaitable[None]] = [
-            self._call_url(self._session, s) for s in sources
+            self._call_url(self._session, SourceMatch(s)) for s in sources
         ]
         await asyncio.gather(*tasks, return_exceptions=True)
 
         return self.data
 
+    async def _probe(self, sources: list[SourceEntry]) -> list[SourceEntry]:
+        """Probe an offline device with one cheap request.
+
+        Returns:
+            The sources still to fetch once the device answered.
+
+        Raises:
+            DeviceOfflineError: The device is still offline.
+        """
+        probe = self.sources.named(self._probe_source)[:1] or sources[:1]
+        for entry in probe:
+            await self._call_url(self._session, SourceMatch(entry))
+        if self.breaker.offline:
+            retry_in = self.breaker.stats()["retry_in"]
+            raise DeviceOfflineError(
+                "device offline"
+                + (f", next probe in {retry_in}s" if retry_in is not None else "")
+            )
+        _LOGGER.info("%s is back online", self.ip)
+        return [s for s in sources if not any(s is p for p in probe)]
+
+    @property
+    def offline(self) -> bool:
+        """Return True while the device is considered unreachable."""
+        return self.breaker.offline
+
+    @property
+    def firmware_version(self) -> str | None:
+        """Return the firmware version reported by `/firmware`, if fetched."""
+        version = self.get_data(
+            "$.sources[?(@.name=='/firmware')].data.version", is_None_possible=True
+        )
+        return str(version) if version is not None else None
+
+    @property
+    def layout(self) -> dict[str, Any] | None:
+        """Return the firmware variant detected at runtime, to be cached.
+
+        APIs probing the device to choose their sources (see `ReefLedAPI`)
+        return the probe results and the firmware version they hold for. None
+        when there is nothing to cache.
+        """
+        return None
+
+    def use_layout(self, layout: Mapping[str, Any]) -> bool:
+        """Use a `layout` cached by a previous run instead of probing the device.
+
+        Returns:
+            True if the layout was applied.
+        """
+        return False
+
+    def _source_not_found(self, name: str) -> None:
+        """Handle a source the device answered 404 for (layout hook)."""
+
     async def press(self, action: str, head: int | None = None) -> None:
         """Trigger a button-like action.
 
@@ -399,47 +755,14 @@ class ReefBeatAPI:
         """DELETE a resource by source path (e.g. '/something')."""
         await self._http_send(self._base_url + source, method="delete")
 
-    # def get_path(self, obj: Any) -> str:
-    #     """Return a Python-access path for a JSONPath match context.
-
-    #     This builds a string such as `["sources"][0]["data"]` which is later used
-    #     to build a cached `eval()` expression for fast `get_data()` access.
-    #     """
-    #     res = ""
-    #     if hasattr(obj, "context") and obj.context is not None:
-    #         res += self.get_path(obj.context)
-    #     if hasattr(obj, "path"):
-    #         if str(obj.path) != "$":
-    #             res += (
-    #                 '["' + str(obj.path) + '"]'
-    #                 if str(obj.path)[0] != "["
-    #                 else str(obj.path)
-    #             )
-    #     return res
-
-    def get_path(self, obj: Any) -> str:
-        res = ""
-        if hasattr(obj, "context") and obj.context is not None:
-            res += self.get_path(obj.context)
-        if hasattr(obj, "path"):
-            path_str = str(obj.path)
-            if path_str != "$":
-                # Strip spurious quotes that jsonpath-ng adds for string keys
-                clean = path_str.strip("'\"")
-                if path_str[0] != "[":
-                    res += '["' + clean + '"]'
-                else:
-                    res += path_str
-        return res
+    def get_accessor(self, data_name: str) -> Accessor:
+        """Compile a JSONPath expression into a direct accessor into `self.data`.
 
-    def get_data_link(self, data_name: str) -> str | None:
-        """Compute an eval()-able expression path into `self.data` for a JSONPath expression."""
-        query = parse(data_name)
-        res = query.find(self.data)
-        if not res:
-            return None
-        path = self.get_path(res[0])
-        return "data" + path
+        Filters (e.g. `$.sources[?(@.name=='/manual')]`) are kept as filters, so
+        the accessor keeps addressing the right element when an array is rebuilt
+        or reordered.
+        """
+        return compile_accessor(data_name, parse(data_name))
 
     def get_data(self, name: str, is_None_possible: bool = False) -> Any:
         """Read a cached value via JSONPath.
@@ -449,23 +772,26 @@ class ReefBeatAPI:
             is_None_possible: If True, missing paths return None without logging.
 
         Notes:
-            For performance, successful JSONPath resolutions are cached as eval()-able
-            strings in `self._data_db`. Structure changes can invalidate cached paths;
-            `set_data()` will clear the cache entry on update failures.
+            For performance, expressions that resolved once are cached as compiled
+            accessors in `self._data_db`. A cached expression that no longer
+            resolves returns None when `is_None_possible`, and raises otherwise.
         """
-        if name not in self._data_db:
-            r = self.get_data_link(name)
-            if r is not None:
-                self._data_db[name] = "self." + r
-            else:
+        accessor = self._data_db.get(name)
+        if accessor is None:
+            accessor = self.get_accessor(name)
+            try:
+                value = accessor.get(self.data)
+            except ACCESS_ERRORS:
                 if not is_None_possible:
                     _LOGGER.error("reefbeat.get_data('%s') %s", name, self._base_url)
                     _LOGGER.error("%s", self.data)
                 return None
+            self._data_db[name] = accessor
+            return value
 
         try:
-            return eval(self._data_db[name])
-        except Exception:
+            return accessor.get(self.data)
+        except ACCESS_ERRORS:
             if is_None_possible:
                 return None
             raise
@@ -482,11 +808,30 @@ class ReefBeatAPI:
         return res[0].value
 
     def set_data(self, data_name: str, value: Any) -> None:
-        """Set a value via JSONPath update.
+        """Set a value via JSONPath.
 
-        Clears the cached eval-path for this JSONPath if the update fails because the
+        Fast path: the compiled accessor (shared with `get_data()`) locates the
+        container and key holding the value, which is then written in place.
+        When the location is ambiguous (filter with several matches, missing
+        key, unsupported syntax) or no longer resolves, falls back to a full
+        JSONPath update.
+
+        Clears the cached accessor for this JSONPath if the update fails because the
         underlying structure changed.
         """
+        self.invalidate_fingerprint(data_name)
+        accessor = self._data_db.get(data_name)
+        if accessor is None:
+            accessor = self.get_accessor(data_name)
+        try:
+            container, key = accessor.locate(self.data)
+        except ACCESS_ERRORS:
+            pass
+        else:
+            container[key] = value
+            self._data_db.setdefault(data_name, accessor)
+            return
+
         query = parse(data_name)
         try:
             query.update(self.data, value)
@@ -510,6 +855,64 @@ class ReefBeatAPI:
         """
         return await self._http_send(self._base_url + action, payload, method)
 
+    async def http_send_once(
+        self, action: str, payload: Any = None, method: str = "post"
+    ) -> HttpResult | None:
+        """Send a single HTTP request to an action path, without any retry.
+
+        Unlike `http_send()`, a failure is left to the caller: it is not
+        logged as an error and does not set the device alert message.
+
+        Args:
+            action: Endpoint path beginning with '/', appended to `self._base_url`.
+            payload: JSON payload to send (or None).
+            method: HTTP method ('post', 'put', 'delete').
+
+        Returns:
+            The result of the request, or None if the device was not reached.
+        """
+        url = self._base_url + action
+        method_l = method.lower()
+        if method_l not in ("post", "put", "delete"):
+            raise ValueError(f"Unsupported method: {method}")
+        _LOGGER.debug("%s data (single try): %s to %s", method_l, payload, url)
+        self._expect_change()
+
+        if not self.breaker.acquire():
+            _LOGGER.debug("Can not %s data to %s: device offline", method_l, url)
+            return None
+        body = {} if method_l == "delete" else {"json": payload}
+        try:
+            async with self.limiter.slot(USER), timeout(DEFAULT_TIMEOUT):
+                started = time.time()
+                req = getattr(self._session, method_l)
+                async with req(url, headers=self._header, ssl=False, **body) as resp:
+                    result = self._build_result(
+                        method=method_l,
+                        url=url,
+                        status=resp.status,
+                        reason=resp.reason or "",
+                        headers=resp.headers,
+                        raw=await resp.read(),
+                        started=started,
+                    )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Can not %s data to %s: %s", method_l, url, err)
+            self.breaker.record_failure()
+            return None
+        self.breaker.record_success()
+        _LOGGER.debug("%d: %s", result["status"], result.get("text"))
+        return result
+
+    def _expect_change(self) -> None:
+        """Prepare for a request sent to the device."""
+        # The device state is expected to change: report the next payloads of
+        # every source as changed, even if identical to the last ones, and poll
+        # the periodic sources on the next tick.
+        self._fingerprints.clear()
+        self.scheduler.wake()
+        self._send_generation += 1
+
     async def _http_send(
         self, url: str, payload: Any = None, method: str = "post"
     ) -> HttpResult | None:
@@ -523,12 +926,24 @@ class ReefBeatAPI:
         error_count = 0
         _LOGGER.debug("%s data: %s to %s", method_l, payload, url)
 
+        self._expect_change()
+
         last_result: HttpResult | None = None
+        # The breaker is told about a failure once, when the retries did not
+        # reach the device.
+        unreached = False
 
         while status_ok is False and error_count < HTTP_MAX_RETRY:
-            started = time.time()
+            if not self.breaker.acquire():
+                if unreached:
+                    self.breaker.record_failure()
+                _LOGGER.error("Can not %s data to %s: device offline", method_l, url)
+                return last_result
+            unreached = False
             try:
-                async with timeout(DEFAULT_TIMEOUT):
+                # The per-request timeout starts once a slot is granted.
+                async with self.limiter.slot(USER), timeout(DEFAULT_TIMEOUT):
+                    started = time.time()
                     if method_l in ("post", "put"):
                         req = getattr(self._session, method_l)
                         async with req(
@@ -537,43 +952,32 @@ class ReefBeatAPI:
                             headers=self._header,
                             ssl=False,
                         ) as resp:
-                            text = await resp.text()
-                            json_body: Any | None = None
-                            with suppress(Exception):
-                                json_body = await resp.json(content_type=None)
-
                             last_result = self._build_result(
                                 method=method_l,
                                 url=url,
                                 status=resp.status,
                                 reason=resp.reason or "",
-                                headers={k: v for k, v in resp.headers.items()},
-                                text=text,
-                                json_body=json_body,
+                                headers=resp.headers,
+                                raw=await resp.read(),
                                 started=started,
                             )
                     elif method_l == "delete":
                         async with self._session.delete(
                             url, headers=self._header, ssl=False
                         ) as resp:
-                            text = await resp.text()
-                            json_body = None
-                            with suppress(Exception):
-                                json_body = await resp.json(content_type=None)
-
                             last_result = self._build_result(
                                 method=method_l,
                                 url=url,
                                 status=resp.status,
                                 reason=resp.reason or "",
-                                headers={k: v for k, v in resp.headers.items()},
-                                text=text,
-                                json_body=json_body,
+                                headers=resp.headers,
+                                raw=await resp.read(),
                                 started=started,
                             )
                     else:
                         raise ValueError(f"Unsupported method: {method}")
 
+                self.breaker.record_success()
                 status = int(last_result.get("status", 0)) if last_result else 0
                 status_ok = status in (200, 201, 202, 503)
 
@@ -588,7 +992,8 @@ class ReefBeatAPI:
                         "message": (last_result or {}).get("text", "")
                     }
                 else:
-                    _LOGGER.debug("%d: %s", status, (last_result or {}).get("text", ""))
+                    if _LOGGER.isEnabledFor(logging.DEBUG):
+                        _LOGGER.debug("%d: %s", status, (last_result or {}).get("text"))
                     msg = (last_result or {}).get("json")
                     if isinstance(msg, dict):
                         if "alert" not in msg:
@@ -609,24 +1014,33 @@ class ReefBeatAPI:
                     HTTP_MAX_RETRY,
                 )
                 _LOGGER.debug(e)
+                unreached = isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError))
 
-            if status_ok is False:
-                await asyncio.sleep(HTTP_DELAY_BETWEEN_RETRY)
+            if status_ok is False and error_count < HTTP_MAX_RETRY:
+                await asyncio.sleep(
+                    backoff_delay(error_count, HTTP_DELAY_BETWEEN_RETRY)
+                )
 
+        if unreached:
+            self.breaker.record_failure()
         if status_ok is False:
             _LOGGER.error("Can not push data to %s", url)
         return last_result
 
     async def push_values(self, source: str, method: str = "post") -> None:
         """Push the currently cached payload for `source` to the device."""
-        payload = self.get_data(
-            "$.sources[?(@.name=='" + source + "')].data", is_None_possible=True
-        )
+        entry = self.sources.get(source)
+        payload = entry.get("data") if entry is not None else None
         if payload is None:
             _LOGGER.error("push_values: no payload found for source=%s", source)
             return
         await self._http_send(self._base_url + source, payload, method)
 
+    @property
+    def sources(self) -> SourceRegistry:
+        """Name/type index over the registered sources in `self.data["sources"]`."""
+        return self._registry.sync(self.data.get("sources"))
+
     @property
     def live_config_update(self) -> bool:
         """Whether live configuration update is enabled."""
@@ -645,25 +1059,98 @@ class ReefBeatAPI:
 
         Args:
             name: Endpoint path (e.g. '/dashboard').
-            source_type: One of 'device-info', 'config', 'data', 'preview', etc.
+            source_type: One of 'device-info', 'config', 'data', 'preview',
+                'lazy' (fetched by the subclass), etc.
             data: Initial cached value.
         """
         if "sources" not in self.data or not isinstance(self.data["sources"], list):
             self.data["sources"] = cast(list[SourceEntry], [])
 
         sources = cast(list[SourceEntry], self.data["sources"])
-        sources.insert(
-            len(sources),
-            {"name": name, "type": source_type, "data": data},
-        )
+        registry = self.sources
+        entry: SourceEntry = {"name": name, "type": source_type, "data": data}
+        sources.append(entry)
+        registry.add(entry)
+
+    def ensure_source(self, name: str, source_type: str) -> None:
+        """Register a source unless one with that name already exists."""
+        if name not in self.sources:
+            self.add_source(name, source_type, "")
 
     def remove_source(self, name: str) -> None:
         """Remove a source entry by name (no error if not present)."""
         sources = cast(list[SourceEntry], self.data.get("sources", []))
         self.data["sources"] = [s for s in sources if s.get("name") != name]
 
+    def snapshot(self) -> dict[str, Any]:
+        """Return the cached device state, to be restored on the next startup.
+
+        Only sources fetched at least once are included.
+        """
+        return {
+            "sources": [
+                {"name": s["name"], "type": s["type"], "data": s["data"]}
+                for s in cast(list[SourceEntry], self.data.get("sources", []))
+                if s.get("data") not in ("", None)
+            ]
+        }
+
+    def restore_snapshot(self, snapshot: Mapping[str, Any]) -> bool:
+        """Fill the cached sources from a `snapshot()` of a previous run.
+
+        Sources registered at runtime by the previous run (firmware variants,
+        per-day endpoints...) are registered again.
+
+        Returns:
+            True if at least one source was restored.
+        """
+        restored = False
+        for saved in snapshot.get("sources") or ():
+            if not isinstance(saved, dict) or not saved.get("name"):
+                continue
+            name, data = str(saved["name"]), saved.get("data")
+            entries = self.sources.named(name)
+            if not entries:
+                self.add_source(name, str(saved.get("type", "data")), data)
+            for entry in entries:
+                entry["data"] = data
+            restored = True
+        return restored
+
+    def pop_changed_sources(self) -> set[str]:
+        """Return the sources whose payload changed since the last call, and reset.
+
+        A source counts as changed when a successful GET returned a payload whose
+        raw bytes differ from the previous one (or could not be compared).
+        """
+        changed = self._changed_sources
+        self._changed_sources = set()
+        return changed
+
+    def invalidate_fingerprint(self, data_name: str | None = None) -> None:
+        """Forget payload fingerprints so the next fetch reports a change.
+
+        The matching sources are also made due on the next poll.
+
+        Args:
+            data_name: A source name, or a `$.sources[?(@.name=='...')]...`
+                JSONPath. Other JSONPaths (`$.local...`) are ignored. When None,
+                every fingerprint is dropped.
+        """
+        if data_name is None or data_name.startswith("/"):
+            name = data_name
+        elif data_name.startswith("$.sources"):
+            name = source_name(data_name)
+        else:
+            return
+        if name is None:
+            self._fingerprints.clear()
+        else:
+            self._fingerprints.pop(name, None)
+        self.scheduler.reset(name)
+
     def clear_cache(self) -> None:
-        """Clear the internal JSONPath eval cache used by `get_data()`."""
+        """Clear the internal JSONPath accessor cache used by `get_data()`."""
         self._data_db.clear()
 
     def reset_error_state(self) -> None:
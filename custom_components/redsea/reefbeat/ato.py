@@ -11,12 +11,11 @@ Endpoints:
 from __future__ import annotations
 
 import logging
-from typing import Any, cast
+from typing import Any
 
-import aiohttp
-
-from ..const import ATO_AUTO_FILL_INTERNAL_NAME
-from .api import ReefBeatAPI, SourceEntry
+from ..const import ATO_AUTO_FILL_INTERNAL_NAME, ATO_SOURCE_POLL_PERIODS
+from .api import ReefBeatAPI
+from .session import HttpSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,11 +34,13 @@ class ReefATOAPI(ReefBeatAPI):
     - /configuration: push auto_fill setting
     """
 
+    _poll_periods = ATO_SOURCE_POLL_PERIODS
+
     def __init__(
         self,
         ip: str,
         live_config_update: bool,
-        session: aiohttp.ClientSession,
+        session: HttpSession,
     ) -> None:
         """Create a ReefATOAPI instance.
 
@@ -54,12 +55,7 @@ class ReefATOAPI(ReefBeatAPI):
         super().__init__(ip, live_config_update, session)
 
         # Ensure /configuration exists as a config source.
-        sources = cast(list[SourceEntry], self.data.get("sources", []))
-        sources.insert(
-            len(sources),
-            {"name": "/configuration", "type": "config", "data": ""},
-        )
-        self.data["sources"] = sources
+        self.add_source("/configuration", "config", "")
 
     async def resume(self) -> None:
         """Resume ATO operation.
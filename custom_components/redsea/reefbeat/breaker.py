@@ -0,0 +1,186 @@
+"""Per-device circuit breaker and retry backoff for the HTTP layer.
+
+A powered-off or unreachable device used to cost every source of every poll
+`HTTP_MAX_RETRY` requests, each waiting for its timeout, with a fixed delay in
+between. `CircuitBreaker` tracks the reachability of one device:
+
+- closed: requests go through. `failure_threshold` failed requests in a row
+  open it. A request fails once all its retries hit a transport error
+  (connection error or timeout; any HTTP response counts as a success), so the
+  concurrent requests of one poll hitting a short glitch do not open it.
+- open: the device is offline and requests fail fast, without any network
+  access, for a reset timeout that doubles (with jitter) each time the breaker
+  re-opens, up to `reset_timeout_max`.
+- half-open: once the reset timeout elapsed, a single request is let through as
+  a probe. Its success closes the breaker, its failure re-opens it.
+
+`backoff_delay()` gives the delay between the retries of one request:
+exponential, capped and jittered so the sources of a device (and devices
+polled on the same tick) do not retry in lockstep.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from ..const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    BREAKER_RESET_TIMEOUT_MAX,
+    DEFAULT_TIMEOUT,
+    HTTP_RETRY_DELAY_MAX,
+    HTTP_RETRY_JITTER,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class DeviceOfflineError(Exception):
+    """Raised when a device is skipped because its circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Track the reachability of one device and gate its requests."""
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        reset_timeout_max: float = BREAKER_RESET_TIMEOUT_MAX,
+        probe_timeout: float = DEFAULT_TIMEOUT,
+        jitter: float = HTTP_RETRY_JITTER,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a closed breaker.
+
+        Args:
+            failure_threshold: Failed requests in a row that open the breaker.
+            reset_timeout: Seconds before the first probe of an open breaker.
+            reset_timeout_max: Upper bound of the (doubling) reset timeout.
+            probe_timeout: Seconds after which a probe that never reported is
+                considered lost and another one is let through.
+            jitter: Relative jitter applied to the reset timeout.
+            clock: Monotonic time source (tests).
+        """
+        self._threshold = max(1, failure_threshold)
+        self._reset_timeout = reset_timeout
+        self._reset_timeout_max = max(reset_timeout, reset_timeout_max)
+        self._probe_timeout = probe_timeout
+        self._jitter = jitter
+        self._clock = clock
+
+        self._state = CLOSED
+        self._failures = 0
+        self._opened = 0
+        self._retry_at = 0.0
+        self._probe_until: float | None = None
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Return `closed`, `open` or `half_open`."""
+        if self._state == OPEN and self._clock() >= self._retry_at:
+            self._state = HALF_OPEN
+        return self._state
+
+    @property
+    def offline(self) -> bool:
+        """Return True while the device is considered unreachable."""
+        return self.state != CLOSED
+
+    def acquire(self) -> bool:
+        """Return True if a request may be sent now.
+
+        In the half-open state only the first caller (the probe) gets True.
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN:
+            now = self._clock()
+            if self._probe_until is None or now >= self._probe_until:
+                self._probe_until = now + self._probe_timeout
+                return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record a request that reached the device."""
+        self._state = CLOSED
+        self._failures = 0
+        self._opened = 0
+        self._probe_until = None
+
+    def record_failure(self) -> None:
+        """Record a request whose retries all failed to reach the device."""
+        self._failures += 1
+        if self._state == HALF_OPEN or (
+            self._state == CLOSED and self._failures >= self._threshold
+        ):
+            self._open()
+
+    def stats(self) -> dict[str, Any]:
+        """Return breaker state for diagnostics."""
+        state = self.state
+        return {
+            "state": state,
+            "failures": self._failures,
+            "opened": self._opened,
+            "rejected": self.rejected,
+            "retry_in": (
+                round(max(0.0, self._retry_at - self._clock()), 1)
+                if state == OPEN
+                else None
+            ),
+        }
+
+    def _open(self) -> None:
+        """Open (or re-open) the breaker with a longer reset timeout."""
+        self._opened += 1
+        delay = min(
+            self._reset_timeout * 2 ** (self._opened - 1), self._reset_timeout_max
+        )
+        self._state = OPEN
+        self._probe_until = None
+        self._retry_at = self._clock() + _jittered(delay, self._jitter)
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def backoff_delay(
+    attempt: int,
+    base: float,
+    cap: float = HTTP_RETRY_DELAY_MAX,
+    jitter: float = HTTP_RETRY_JITTER,
+) -> float:
+    """Return the delay before retry number `attempt` (1-based)."""
+    return _jittered(min(base * 2 ** (attempt - 1), cap), jitter)
+
+
+def retry_budget(per_try_timeout: float, retries: int, base: float) -> float:
+    """Return the longest time one request with its retries can take."""
+    delays = sum(
+        backoff_delay(attempt, base, jitter=0.0) for attempt in range(1, retries)
+    )
+    return per_try_timeout * retries + delays * (1 + HTTP_RETRY_JITTER)
+
+
+def _jittered(delay: float, jitter: float) -> float:
+    """Return `delay` randomly scaled by up to +/- `jitter`."""
+    if jitter <= 0 or delay <= 0:
+        return delay
+    return delay * random.uniform(1 - jitter, 1 + jitter)
@@ -16,11 +16,11 @@ import time
 from contextlib import suppress
 from typing import Any, cast
 
-import aiohttp
 from homeassistant.exceptions import HomeAssistantError
 
 from ..const import LIGHTS_LIBRARY, SUPPLEMENTS_LIBRARY, WAVES_LIBRARY
 from .api import HttpResult, ReefBeatAPI, SourceEntry, parse
+from .session import HttpSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,7 +46,7 @@ class ReefBeatCloudAPI(ReefBeatAPI):
         password: str,
         live_config_update: bool,
         ip: str,
-        session: aiohttp.ClientSession,
+        session: HttpSession,
         disable_supplement: bool,
     ) -> None:
         """Create a ReefBeatCloudAPI instance.
@@ -34,11 +34,10 @@ Evidence:
 from __future__ import annotations
 
 import logging
-from typing import Any, cast
+from typing import Any
 
-import aiohttp
-
-from .api import ReefBeatAPI, SourceEntry
+from .api import ReefBeatAPI
+from .session import HttpSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,7 +54,7 @@ class ReefControlAPI(ReefBeatAPI):
         self,
         ip: str,
         live_config_update: bool,
-        session: aiohttp.ClientSession,
+        session: HttpSession,
     ) -> None:
         """Initialize the ReefControl API wrapper.
 
@@ -65,12 +64,7 @@ class ReefControlAPI(ReefBeatAPI):
         super().__init__(ip, live_config_update, session)
 
         # Register the /configuration source so it is polled with config refreshes.
-        sources = cast(list[SourceEntry], self.data.get("sources", []))
-        sources.insert(
-            len(sources),
-            {"name": "/configuration", "type": "config", "data": ""},
-        )
-        self.data["sources"] = sources
+        self.add_source("/configuration", "config", "")
 
     # ------------------------------------------------------------------
     # Per-port ATO helpers
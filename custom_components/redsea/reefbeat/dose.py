@@ -12,9 +12,9 @@ import copy
 import logging
 from typing import Any, cast
 
-import aiohttp
-
+from ..const import DOSE_SOURCE_POLL_PERIODS
 from .api import ReefBeatAPI
+from .session import HttpSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,11 +27,13 @@ _LOGGER = logging.getLogger(__name__)
 class ReefDoseAPI(ReefBeatAPI):
     """ReefDose API wrapper (heads, calibration, bundle support)."""
 
+    _poll_periods = DOSE_SOURCE_POLL_PERIODS
+
     def __init__(
         self,
         ip: str,
         live_config_update: bool,
-        session: aiohttp.ClientSession,
+        session: HttpSession,
         heads_nb: int,
     ) -> None:
         """Create a ReefDoseAPI instance.
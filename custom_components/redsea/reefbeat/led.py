@@ -1,26 +1,40 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
+import time
+from collections.abc import Iterable, Mapping
 from typing import Any, cast
 
 import aiohttp
 
 from ..const import (
+    DEFAULT_TIMEOUT,
     HW_G1_LED_IDS,
     LED_BLUE_INTERNAL_NAME,
+    LED_DAY_SOURCES_PER_POLL,
     LED_INTENSITY_INTERNAL_NAME,
     LED_KELVIN_INTERNAL_NAME,
     LED_MANUAL_DURATION_INTERNAL_NAME,
     LED_MOON_INTERNAL_NAME,
+    LED_SOURCE_POLL_PERIODS,
     LED_WHITE_INTERNAL_NAME,
     LEDS_CONV,
     LEDS_INTENSITY_COMPENSATION,
+    LEGACY_REQUEST_CONCURRENCY,
     VIRTUAL_LED,
 )
-from .api import ReefBeatAPI
+from .api import ReefBeatAPI, SourceMatch
+from .session import HttpSession
 
 _LOGGER = logging.getLogger(__name__)
 
+# Reads of a per-day program source (`/auto/N`, `/clouds/N`, `/preset_name/N`).
+_DAY_SOURCE_READ = re.compile(
+    r"\$\.sources\[\?\(@\.name=='(/(?:auto|clouds|preset_name)/[1-7])'\)\]\.data"
+)
+
 
 def _interp(x: float, xs: list[float], ys: list[float]) -> float:
     """Piecewise-linear interpolation with clamping.
@@ -60,6 +74,11 @@ def _make_interpolator(xs_in: list[float], ys_in: list[float]):
     return _f
 
 
+def _weekday() -> int:
+    """Return today's day number in LED programs (1 = Monday ... 7 = Sunday)."""
+    return time.localtime().tm_wday + 1
+
+
 # =============================================================================
 # Classes
 # =============================================================================
@@ -68,11 +87,13 @@ def _make_interpolator(xs_in: list[float], ys_in: list[float]):
 class ReefLedAPI(ReefBeatAPI):
     """ReefLED API wrapper (G1/G2, RSLED90 patch, kelvin/intensity conversion)."""
 
+    _poll_periods = LED_SOURCE_POLL_PERIODS
+
     def __init__(
         self,
         ip: str,
         live_config_update: bool,
-        session: aiohttp.ClientSession,
+        session: HttpSession,
         hw: Any,
         intensity_compensation: bool = False,
     ) -> None:
@@ -94,6 +115,19 @@ class ReefLedAPI(ReefBeatAPI):
         self._rsled90_patch = False
         # /preset_name source behavior is determined at runtime
         self._preset_name_is_single = False
+        # Detected (or cached) firmware variant, see `layout`.
+        self._layout: dict[str, Any] | None = None
+        # The layout comes from the cache: a 404 on one of its sources means the
+        # firmware changed and the device must be probed again.
+        self._layout_cached = False
+        self._reprobe = False
+        # Per-day program sources (type "lazy") are not fetched with the
+        # config: today's ones are loaded first, the others a few per poll
+        # (see `_due_day_sources()`). Stale ones are loaded again that way.
+        self._lazy_stale: set[str] = set()
+        # Set once the initial data is loaded: later full config fetches are
+        # config refreshes.
+        self._started = False
 
         self.data["local"] = {
             "use_cloud_api": None,
@@ -132,13 +166,14 @@ class ReefLedAPI(ReefBeatAPI):
         Returns 0 on any exception (network error, timeout, etc.).
         No asyncio.timeout wrapper here: it causes coroutines to return None
         with mock sessions on Python 3.14 (the try/except body is skipped).
-        The aiohttp session's own connector timeout bounds the call in production.
+        The call is bounded by an aiohttp per-request timeout instead.
         """
         try:
             async with self._session.get(
                 self._base_url + path,
                 ssl=False,
                 allow_redirects=True,
+                timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
             ) as resp:
                 return int(resp.status)
         except Exception:
@@ -153,29 +188,191 @@ class ReefLedAPI(ReefBeatAPI):
         """
         # RSLED90 patch: /dashboard not available -> use "/" as device-info
         dash_status = await self._probe_path("/dashboard")
-        if dash_status != 200:
+        # preset_name can be single endpoint or per-day endpoints
+        preset_status = await self._probe_path("/preset_name")
+        self._apply_layout(dash_status != 200, preset_status == 200)
+        self._layout = {
+            "rsled90": self._rsled90_patch,
+            "preset_name_is_single": self._preset_name_is_single,
+            "firmware": None,
+        }
+        self._layout_cached = False
+        self._reprobe = False
+
+    def _apply_layout(self, rsled90: bool, preset_name_is_single: bool) -> None:
+        """Register the sources of a firmware variant (idempotent).
+
+        Sources of the other variant are removed, so a layout detected after a
+        firmware update replaces the cached one.
+
+        Args:
+            rsled90: The device has no `/dashboard` (RSLED90 firmware).
+            preset_name_is_single: `/preset_name` is a single endpoint.
+        """
+        if rsled90 and not self._rsled90_patch:
             self._rsled90_patch = True
+            self.limiter.limit = LEGACY_REQUEST_CONCURRENCY
             _LOGGER.info("USE patch version for RSLED90")
             self.remove_source("/dashboard")
-            self.add_source("/", "device-info", "")
-
-        # preset_name can be single endpoint or per-day endpoints
-        preset_status = await self._probe_path("/preset_name")
-        if preset_status == 200:
-            self._preset_name_is_single = True
-            self.add_source("/preset_name", "config", "")
-        else:
-            self._preset_name_is_single = False
+            self.ensure_source("/", "device-info")
+        elif not rsled90 and self._rsled90_patch:
+            self._rsled90_patch = False
+            self.limiter.limit = self._request_concurrency
+            _LOGGER.info("RSLED90 patch no longer needed")
+            self.remove_source("/")
+            self.ensure_source("/dashboard", "data")
+
+        self._preset_name_is_single = preset_name_is_single
+        if preset_name_is_single:
             for day in range(1, 8):
-                self.add_source(f"/preset_name/{day}", "config", "")
+                self.remove_source(f"/preset_name/{day}")
+            self.ensure_source("/preset_name", "config")
+        else:
+            self.remove_source("/preset_name")
 
         # Additional required sources
-        self.add_source("/manual", "data", "")
-        self.add_source("/acclimation", "config", "")
-        self.add_source("/moonphase", "config", "")
+        self.ensure_source("/manual", "data")
+        self.ensure_source("/acclimation", "config")
+        self.ensure_source("/moonphase", "config")
         for day in range(1, 8):
-            self.add_source(f"/auto/{day}", "config", "")
-            self.add_source(f"/clouds/{day}", "config", "")
+            for name in self._day_sources(day):
+                self._ensure_lazy(name)
+
+    def _day_sources(self, day: int) -> list[str]:
+        """Return the per-day program sources of `day` (1 = Monday)."""
+        names = [f"/auto/{day}", f"/clouds/{day}"]
+        if not self._preset_name_is_single:
+            names.append(f"/preset_name/{day}")
+        return names
+
+    def _ensure_lazy(self, name: str) -> None:
+        """Register `name` as an on-demand source (fixing restored types)."""
+        entries = self.sources.named(name)
+        if not entries:
+            self.add_source(name, "lazy")
+        elif entries[0]["type"] != "lazy":
+            data = entries[0]["data"]
+            self.remove_source(name)
+            self.add_source(name, "lazy", data)
+
+    def _is_loaded(self, name: str) -> bool:
+        """Return False if a registered per-day source must be fetched."""
+        entries = self.sources.named(name)
+        return not entries or (
+            entries[0]["data"] not in ("", None) and name not in self._lazy_stale
+        )
+
+    def _due_day_sources(self) -> list[str]:
+        """Return the per-day sources the next poll fetches.
+
+        Today's sources while not loaded, then, in day order from tomorrow,
+        up to `LED_DAY_SOURCES_PER_POLL` sources of other days not loaded or,
+        with live config update, due according to `scheduler`.
+        """
+        today = _weekday()
+        due = [n for n in self._day_sources(today) if not self._is_loaded(n)]
+        others: list[str] = []
+        for offset in range(1, 7):
+            for name in self._day_sources((today + offset - 1) % 7 + 1):
+                if len(others) >= LED_DAY_SOURCES_PER_POLL:
+                    return due + others
+                if not self._is_loaded(name) or (
+                    self._live_config_update and self.scheduler.due(name)
+                ):
+                    others.append(name)
+        return due + others
+
+    async def _fetch_lazy(self, names: Iterable[str]) -> None:
+        """Fetch per-day sources now."""
+        names = set(names)
+        self._lazy_stale -= names
+        await asyncio.gather(
+            *(
+                self._call_url(self._session, SourceMatch(s))
+                for name in sorted(names)
+                for s in self.sources.named(name)
+            ),
+            return_exceptions=True,
+        )
+
+    async def _prefetch_today(self) -> None:
+        """Fetch the per-day sources of today unless they are loaded."""
+        await self._fetch_lazy(
+            n for n in self._day_sources(_weekday()) if not self._is_loaded(n)
+        )
+
+    @property
+    def layout(self) -> dict[str, Any] | None:
+        """Return the detected firmware variant and the firmware it was seen on.
+
+        Keys: `rsled90`, `preset_name_is_single` and `firmware` (version from
+        `/firmware`, None until fetched). None until the device was probed or a
+        cached layout was applied.
+        """
+        return dict(self._layout) if self._layout is not None else None
+
+    def use_layout(self, layout: Mapping[str, Any]) -> bool:
+        """Apply a layout cached by a previous run, skipping the startup probes.
+
+        The layout is checked against the firmware version fetched by
+        `get_initial_data()`, and against 404s on its sources: on a mismatch the
+        device is probed again.
+        """
+        if not isinstance(layout.get("rsled90"), bool) or not isinstance(
+            layout.get("preset_name_is_single"), bool
+        ):
+            return False
+        self._apply_layout(layout["rsled90"], layout["preset_name_is_single"])
+        firmware = layout.get("firmware")
+        self._layout = {
+            "rsled90": self._rsled90_patch,
+            "preset_name_is_single": self._preset_name_is_single,
+            "firmware": str(firmware) if firmware is not None else None,
+        }
+        self._layout_cached = True
+        _LOGGER.debug("Using cached layout %s", self._layout)
+        return True
+
+    def _source_not_found(self, name: str) -> None:
+        """Re-probe the device when a source of a cached layout is gone."""
+        if self._layout_cached and (
+            name in ("/", "/dashboard") or name.startswith("/preset_name")
+        ):
+            _LOGGER.info(
+                "%s%s not found, probing firmware variant again", self.ip, name
+            )
+            self._reprobe = True
+
+    async def _reprobe_layout(self) -> None:
+        """Probe the firmware variant again, then fetch sources it added."""
+        await self._apply_runtime_source_patches()
+        cast(dict[str, Any], self._layout)["firmware"] = self.firmware_version
+        sources = [
+            s
+            for s in self.data["sources"]
+            if s.get("data") in ("", None) and s.get("type") != "lazy"
+        ]
+        await asyncio.gather(
+            *(self._call_url(self._session, SourceMatch(s)) for s in sources),
+            return_exceptions=True,
+        )
+
+    def restore_snapshot(self, snapshot: Mapping[str, Any]) -> bool:
+        """Restore a snapshot, with the firmware variant it was taken from.
+
+        A layout applied with `use_layout()` takes precedence over the sources
+        found in the snapshot.
+        """
+        if not super().restore_snapshot(snapshot):
+            return False
+        if self._layout is not None:
+            self._apply_layout(
+                self._layout["rsled90"], self._layout["preset_name_is_single"]
+            )
+        else:
+            self._apply_layout("/" in self.sources, "/preset_name" in self.sources)
+        self._init_conversions()
+        return True
 
     def update_acclimation(self) -> None:
         """Copy acclimation configuration into local state (best effort)."""
@@ -195,9 +392,42 @@ class ReefLedAPI(ReefBeatAPI):
         - kelvin -> white/blue ratio (wb)
         - wb -> kelvin
         And optionally an intensity compensation function, if enabled.
+
+        The firmware variant is probed unless a layout was cached
+        (`use_layout()`); a cached layout seen on another firmware version is
+        probed again.
         """
-        await self._apply_runtime_source_patches()
+        if self._layout is None or self._reprobe:
+            await self._apply_runtime_source_patches()
         data = await super().get_initial_data()
+        await self._check_layout()
+        self._init_conversions()
+        self._started = True
+        return data
+
+    async def _check_layout(self) -> None:
+        """Record the firmware version of the layout, re-probing if it changed."""
+        layout = self._layout
+        if layout is None:
+            return
+        firmware = self.firmware_version
+        cached = layout["firmware"]
+        changed = self._layout_cached and None not in (firmware, cached)
+        changed = changed and firmware != cached
+        if changed:
+            _LOGGER.info(
+                "%s firmware changed (%s -> %s), probing firmware variant again",
+                self.ip,
+                cached,
+                firmware,
+            )
+        if changed or self._reprobe:
+            await self._reprobe_layout()
+        elif firmware is not None:
+            layout["firmware"] = firmware
+
+    def _init_conversions(self) -> None:
+        """Build the kelvin and intensity compensation conversion functions."""
 
         def _as_str_any_dict(obj: Any) -> dict[str, Any] | None:
             if isinstance(obj, dict):
@@ -280,8 +510,6 @@ class ReefLedAPI(ReefBeatAPI):
             except Exception as e:
                 _LOGGER.debug("LED intensity compensation init failed: %s", e)
 
-        return data
-
     def _wb(self, value: float) -> tuple[float, float]:
         """Convert a wb value (0..200) to (white, blue) percentages.
 
@@ -470,6 +698,10 @@ class ReefLedAPI(ReefBeatAPI):
             return self.data["local"]["manual_trick"]["kelvin"]
         if self._g1 and name == LED_INTENSITY_INTERNAL_NAME:
             return self.data["local"]["manual_trick"]["intensity"]
+        day_source = _DAY_SOURCE_READ.match(name)
+        if day_source is not None and not self._is_loaded(day_source.group(1)):
+            # Not loaded yet (see `_due_day_sources()`): no value, no error.
+            is_None_possible = True
         return super().get_data(name, is_None_possible)
 
     def update_light_ki(self) -> None:
@@ -502,8 +734,27 @@ class ReefLedAPI(ReefBeatAPI):
         if "moon" in new_data and "moon" in manual:
             manual["moon"] = new_data["moon"]
 
+    async def fetch_config(self, config_path: str | None = None) -> None:
+        """Fetch config sources, with the per-day sources of today.
+
+        A config refresh (full fetch after the initial data) also marks the
+        other loaded per-day sources stale: the next polls fetch them again,
+        a few at a time.
+        """
+        if config_path is not None:
+            await super().fetch_config(config_path)
+            self._lazy_stale.discard(config_path)
+            return
+        if self._started:
+            self._lazy_stale = {s["name"] for s in self.sources.of_type("lazy")}
+        await asyncio.gather(super().fetch_config(), self._prefetch_today())
+
     async def fetch_data(self) -> dict[str, Any]:
         """Fetch device sources, then update derived state (acclimation/status and wb/ki)."""
+        if self._reprobe:
+            await self._reprobe_layout()
+        if self.quick_refresh is None:
+            await self._fetch_lazy(self._due_day_sources())
         data = await super().fetch_data()
         if self._g1:
             self.update_light_wb()
@@ -0,0 +1,143 @@
+"""Per-device request concurrency limiter with priority lanes.
+
+The devices run a small HTTP server (ESP8266/ESP32): a poll fetching 20+
+sources at once opens as many connections, and older firmwares drop some of
+them. User commands sent meanwhile wait behind the whole poll.
+
+`RequestLimiter` caps the number of requests in flight to one device. Callers
+waiting for a slot are served by lane, then by `order` (lowest first), then in
+arrival order:
+
+- `USER`: writes and actions (`_http_send`, `press()`, one-off requests),
+- `POLL`: background fetches, which yield to any waiting user request.
+
+Queue depth and wait times are tracked per lane for diagnostics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+USER = 0
+POLL = 1
+
+_LANE_NAMES = {USER: "user", POLL: "poll"}
+
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class _LaneStats:
+    """Wait-time counters of one lane."""
+
+    __slots__ = ("queued", "requests", "wait_max", "wait_total")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited: float | None) -> None:
+        """Record a granted slot and how long it was waited for (None: not queued)."""
+        self.requests += 1
+        if waited is None:
+            return
+        self.queued += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters, wait times in milliseconds."""
+        return {
+            "requests": self.requests,
+            "queued": self.queued,
+            "wait_avg_ms": (
+                round(self.wait_total / self.queued * 1000, 1) if self.queued else 0.0
+            ),
+            "wait_max_ms": round(self.wait_max * 1000, 1),
+        }
+
+
+class RequestLimiter:
+    """Limit the requests in flight to one device, serving user requests first."""
+
+    def __init__(self, limit: int) -> None:
+        """Create a limiter allowing `limit` concurrent requests."""
+        self.limit = max(1, limit)
+        self._active = 0
+        self._waiters: list[tuple[int, float, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self._max_queued = 0
+        self._lanes = {lane: _LaneStats() for lane in _LANE_NAMES}
+
+    @property
+    def active(self) -> int:
+        """Return the number of requests in flight."""
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return sum(1 for *_key, waiter in self._waiters if not waiter.done())
+
+    @asynccontextmanager
+    async def slot(self, lane: int = POLL, order: float = 0.0) -> AsyncIterator[None]:
+        """Hold one request slot for the duration of the block.
+
+        Args:
+            lane: `USER` or `POLL`.
+            order: Rank within the lane, lowest served first.
+        """
+        await self._acquire(lane, order)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> dict[str, Any]:
+        """Return limiter state and per-lane wait metrics for diagnostics."""
+        return {
+            "limit": self.limit,
+            "active": self._active,
+            "queued": self.queued,
+            "max_queued": self._max_queued,
+            **{name: self._lanes[lane].as_dict() for lane, name in _LANE_NAMES.items()},
+        }
+
+    async def _acquire(self, lane: int, order: float = 0.0) -> None:
+        """Wait for a free slot; it is handed over directly by `_release()`."""
+        if self._active < self.limit and not self.queued:
+            self._active += 1
+            self._lanes[lane].record(None)
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (lane, order, next(self._seq), waiter))
+        self._max_queued = max(self._max_queued, self.queued)
+        started = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over right before the cancellation.
+                self._release()
+            raise
+        self._lanes[lane].record(time.monotonic() - started)
+
+    def _release(self) -> None:
+        """Hand the slot to the next waiter, or free it."""
+        while self._waiters:
+            *_key, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
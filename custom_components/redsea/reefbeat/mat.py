@@ -9,15 +9,15 @@ from __future__ import annotations
 import logging
 from typing import Any, cast
 
-import aiohttp
-
 from ..const import (
     MAT_MAX_ROLL_DIAMETERS,
     MAT_MIN_ROLL_DIAMETER,
     MAT_ROLL_THICKNESS,
+    MAT_SOURCE_POLL_PERIODS,
     MAT_STARTED_ROLL_DIAMETER_INTERNAL_NAME,
 )
 from .api import ReefBeatAPI
+from .session import HttpSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,11 +30,13 @@ _LOGGER = logging.getLogger(__name__)
 class ReefMatAPI(ReefBeatAPI):
     """Access to ReefMat information and commands."""
 
+    _poll_periods = MAT_SOURCE_POLL_PERIODS
+
     def __init__(
         self,
         ip: str,
         live_config_update: bool,
-        session: aiohttp.ClientSession,
+        session: HttpSession,
     ) -> None:
         """Initialize the ReefMat API wrapper.
 
@@ -44,10 +46,7 @@ class ReefMatAPI(ReefBeatAPI):
         super().__init__(ip, live_config_update, session)
 
         # Ensure configuration source exists
-        self.data["sources"].insert(
-            len(self.data["sources"]),
-            {"name": "/configuration", "type": "config", "data": ""},
-        )
+        self.add_source("/configuration", "config", "")
 
         # Preserve any existing keys in local, but ensure started_roll_diameter exists
         local_any = self.data.get("local")
@@ -0,0 +1,181 @@
+"""Per-source request metrics of one device.
+
+Beyond debug logs there was no way to tell which endpoint of which device is
+slow or failing. `RequestMetrics` records every GET sent by the fetch path
+(`ReefBeatAPI._http_get`), per source:
+
+- requests, failures (transport error or HTTP error status), timeouts,
+- retries scheduled by `_fetch_source`,
+- bytes received,
+- a latency histogram (fixed buckets, in ms) and the average latency,
+- the last error and when it happened.
+
+Device-wide p50/p95 latency and failure rate are computed over a sliding
+window of the most recent requests, so they follow the current state of the
+device rather than its whole uptime. Everything is exposed through `stats()`
+(diagnostics download) and the diagnostic sensors.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Sequence
+from typing import Any
+
+from ..const import METRICS_LATENCY_BUCKETS, METRICS_WINDOW
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class SourceMetrics:
+    """Counters and latency histogram of one source."""
+
+    __slots__ = (
+        "bytes",
+        "failures",
+        "histogram",
+        "last_error",
+        "last_error_at",
+        "latency_total",
+        "requests",
+        "responses",
+        "retries",
+        "timeouts",
+    )
+
+    def __init__(self, buckets: int) -> None:
+        """Create empty counters with `buckets` bounded histogram buckets."""
+        self.requests = 0
+        self.responses = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.bytes = 0
+        self.latency_total = 0.0
+        # One slot per bucket, plus one for latencies above the last bound.
+        self.histogram = [0] * (buckets + 1)
+        self.last_error: str | None = None
+        self.last_error_at: float | None = None
+
+    def as_dict(self, bounds: Sequence[int]) -> dict[str, Any]:
+        """Return the counters, latencies in milliseconds."""
+        labels = [f"<={b}" for b in bounds] + [f">{bounds[-1]}"]
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "latency_avg_ms": (
+                round(self.latency_total / self.responses, 1)
+                if self.responses
+                else None
+            ),
+            "latency_ms": dict(zip(labels, self.histogram, strict=True)),
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at,
+        }
+
+
+class RequestMetrics:
+    """Record the requests sent to one device, per source."""
+
+    def __init__(
+        self,
+        *,
+        buckets: Sequence[int] = METRICS_LATENCY_BUCKETS,
+        window: int = METRICS_WINDOW,
+    ) -> None:
+        """Create empty metrics.
+
+        Args:
+            buckets: Ascending upper bounds of the latency histogram (ms).
+            window: Number of recent requests behind percentiles and failure rate.
+        """
+        self._bounds = tuple(buckets)
+        self._sources: dict[str, SourceMetrics] = {}
+        # Latency (ms) of each recent request, None for failed ones.
+        self._recent: deque[float | None] = deque(maxlen=max(1, window))
+
+    def record(
+        self,
+        source: str,
+        *,
+        elapsed: float,
+        size: int = 0,
+        error: str | None = None,
+        timed_out: bool = False,
+    ) -> None:
+        """Record one request.
+
+        Args:
+            source: Source name (`/dashboard`...).
+            elapsed: Seconds from sending the request to its outcome.
+            size: Bytes received.
+            error: Why the request failed, None if it succeeded.
+            timed_out: The request failed because it timed out.
+        """
+        metrics = self._source(source)
+        metrics.requests += 1
+        metrics.bytes += size
+        latency = elapsed * 1000
+        if error is None:
+            self._recent.append(latency)
+        else:
+            metrics.failures += 1
+            metrics.timeouts += timed_out
+            metrics.last_error = error
+            metrics.last_error_at = time.time()
+            self._recent.append(None)
+        if timed_out:
+            # No response: the elapsed time is the timeout, not a latency.
+            return
+        metrics.responses += 1
+        metrics.latency_total += latency
+        # First bucket whose upper bound is >= latency (last one: above all).
+        metrics.histogram[bisect_left(self._bounds, latency)] += 1
+
+    def record_retry(self, source: str) -> None:
+        """Record a retry scheduled after a failed request of `source`."""
+        self._source(source).retries += 1
+
+    def percentile(self, q: float) -> float | None:
+        """Return the q-th percentile (0-100) of recent successful latencies (ms)."""
+        latencies = sorted(v for v in self._recent if v is not None)
+        if not latencies:
+            return None
+        # Nearest-rank method.
+        rank = min(len(latencies), max(1, math.ceil(q / 100 * len(latencies))))
+        return round(latencies[rank - 1], 1)
+
+    @property
+    def failure_rate(self) -> float | None:
+        """Return the share of recent requests that failed (%)."""
+        if not self._recent:
+            return None
+        failed = sum(1 for v in self._recent if v is None)
+        return round(failed / len(self._recent) * 100, 1)
+
+    def stats(self) -> dict[str, Any]:
+        """Return device-wide and per-source metrics for diagnostics."""
+        return {
+            "window": len(self._recent),
+            "latency_p50_ms": self.percentile(50),
+            "latency_p95_ms": self.percentile(95),
+            "failure_rate": self.failure_rate,
+            "sources": {
+                name: metrics.as_dict(self._bounds)
+                for name, metrics in sorted(self._sources.items())
+            },
+        }
+
+    def _source(self, source: str) -> SourceMetrics:
+        metrics = self._sources.get(source)
+        if metrics is None:
+            metrics = self._sources[source] = SourceMetrics(len(self._bounds))
+        return metrics
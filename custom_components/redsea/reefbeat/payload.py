@@ -0,0 +1,47 @@
+"""Response body decoding for the HTTP layer.
+
+Each response body is read once as raw bytes (also used for change-detection
+fingerprints) and parsed at most once. orjson is used when installed (it ships
+with Home Assistant), the stdlib `json` module otherwise; both accept bytes.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+# Returned by `loads()` for bodies that are not valid JSON.
+NOT_JSON: Any = object()
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def loads(raw: bytes) -> Any:
+    """Parse a JSON body, or return `NOT_JSON`."""
+    if not raw:
+        return NOT_JSON
+    try:
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw)
+    except ValueError:
+        return NOT_JSON
+
+
+def decode_text(raw: bytes) -> str:
+    """Return a body as text (undecodable bytes replaced)."""
+    return raw.decode("utf-8", errors="replace")
+
+
+def decode_body(raw: bytes) -> Any:
+    """Return a body parsed as JSON, falling back to its text."""
+    value = loads(raw)
+    return decode_text(raw) if value is NOT_JSON else value
@@ -26,11 +26,10 @@ the remaining sockets.
 from __future__ import annotations
 
 import logging
-from typing import Any, cast
+from typing import Any
 
-import aiohttp
-
-from .api import HttpResult, ReefBeatAPI, SourceEntry
+from .api import HttpResult, ReefBeatAPI
+from .session import HttpSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,7 +46,7 @@ class ReefPowerAPI(ReefBeatAPI):
         self,
         ip: str,
         live_config_update: bool,
-        session: aiohttp.ClientSession,
+        session: HttpSession,
     ) -> None:
         """Initialize the ReefPower API wrapper.
 
@@ -58,13 +57,8 @@ class ReefPowerAPI(ReefBeatAPI):
         super().__init__(ip, live_config_update, session)
 
         # Register extra config sources (polled on config refreshes).
-        sources = cast(list[SourceEntry], self.data.get("sources", []))
         for name in ("/configuration", "/sockets/config"):
-            sources.insert(
-                len(sources),
-                {"name": name, "type": "config", "data": ""},
-            )
-        self.data["sources"] = sources
+            self.add_source(name, "config", "")
 
     async def set_socket_mode(
         self, number: int, mode: str, name: str | None = None
@@ -14,9 +14,9 @@ from __future__ import annotations
 import logging
 from typing import Any, cast
 
-import aiohttp
-
+from ..const import RUN_SOURCE_POLL_PERIODS
 from .api import ReefBeatAPI
+from .session import HttpSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,11 +29,13 @@ _LOGGER = logging.getLogger(__name__)
 class ReefRunAPI(ReefBeatAPI):
     """ReefRun API wrapper (pump settings and preview payload shaping)."""
 
+    _poll_periods = RUN_SOURCE_POLL_PERIODS
+
     def __init__(
         self,
         ip: str,
         live_config_update: bool,
-        session: aiohttp.ClientSession,
+        session: HttpSession,
     ) -> None:
         """Create a ReefRunAPI instance.
 
@@ -48,33 +50,21 @@ class ReefRunAPI(ReefBeatAPI):
         """
         super().__init__(ip, live_config_update, session)
 
-        self.data["sources"].insert(
-            len(self.data["sources"]),
-            {"name": "/pump/settings", "type": "data", "data": ""},
-        )
-        self.data["sources"].insert(
-            len(self.data["sources"]),
+        self.add_source("/pump/settings", "data", "")
+        self.add_source(
+            "/preview",
+            "preview",
             {
-                "name": "/preview",
-                "type": "preview",
-                "data": {
-                    "pump_1": {"pd": 0, "ti": 100},
-                    "pump_2": {"pd": 0, "ti": 100},
-                },
+                "pump_1": {"pd": 0, "ti": 100},
+                "pump_2": {"pd": 0, "ti": 100},
             },
         )
 
         # Calibration data source (last calibration dates)
-        self.data["sources"].insert(
-            len(self.data["sources"]),
-            {"name": "/calibration", "type": "data", "data": ""},
-        )
+        self.add_source("/calibration", "data", "")
 
         # Per-pump shortcuts (feeding, maintenance, emergency, etc.)
-        self.data["sources"].insert(
-            len(self.data["sources"]),
-            {"name": "/pump/shortcuts", "type": "config", "data": ""},
-        )
+        self.add_source("/pump/shortcuts", "config", "")
 
     async def calibration_start(self, point: int = 2) -> None:
         """Start EC sensor calibration.
@@ -0,0 +1,153 @@
+"""Per-source polling cadence for `ReefBeatAPI.fetch_data()`.
+
+Devices are small ESP boards: polling every source on every coordinator tick
+(20+ requests for a ReefLED with live config update) is mostly wasted, since
+`/wifi`, `/firmware` or per-day LED programs rarely change.
+
+`SourceScheduler` counts polls and decides which sources are due:
+
+- Each source has a period in polls, looked up by name then by fnmatch pattern
+  in a per-family table (`*_SOURCE_POLL_PERIODS` in const.py). Unlisted sources
+  are fetched on every poll; a period of 0 means on demand only.
+- A source never fetched successfully is always due, so the first poll fetches
+  everything.
+- Sources returning the same payload back off: past `backoff_after` unchanged
+  fetches in a row, their period doubles on each further unchanged fetch, up
+  to `backoff_max` times the configured one. A changed payload resets it.
+  Sources polled on every poll (`/dashboard`, `/mode`...) never back off: they
+  are the ones reporting changes made outside Home Assistant.
+- `reset()` makes a source due again (used after local writes), `wake()`
+  every periodic one (used after requests sent to the device).
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from fnmatch import fnmatchcase
+from typing import Any
+
+from ..const import SOURCE_POLL_BACKOFF_AFTER, SOURCE_POLL_BACKOFF_MAX
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class SourceScheduler:
+    """Decide which sources a regular poll fetches."""
+
+    def __init__(
+        self,
+        periods: Mapping[str, int],
+        *,
+        backoff_after: int = SOURCE_POLL_BACKOFF_AFTER,
+        backoff_max: int = SOURCE_POLL_BACKOFF_MAX,
+    ) -> None:
+        """Create a scheduler.
+
+        Args:
+            periods: Polling period per source name or fnmatch pattern.
+            backoff_after: Unchanged fetches in a row before backing off.
+            backoff_max: Upper bound of the backoff factor.
+        """
+        self._exact = {k: v for k, v in periods.items() if not _is_pattern(k)}
+        self._patterns = [(k, v) for k, v in periods.items() if _is_pattern(k)]
+        self._backoff_after = max(1, backoff_after)
+        self._backoff_max = max(1, backoff_max)
+
+        self._resolved: dict[str, int] = {}
+        self._poll = 0
+        # Poll number from which each fetched source is due again.
+        self._next: dict[str, float] = {}
+        # Unchanged fetches in a row per source.
+        self._streak: dict[str, int] = {}
+        self.skipped = 0
+
+    @property
+    def poll(self) -> int:
+        """Return the number of polls started so far."""
+        return self._poll
+
+    def period(self, name: str) -> int:
+        """Return the configured polling period of a source (in polls)."""
+        period = self._resolved.get(name)
+        if period is None:
+            period = self._exact.get(name)
+            if period is None:
+                period = next((v for k, v in self._patterns if fnmatchcase(name, k)), 1)
+            self._resolved[name] = period = max(0, int(period))
+        return period
+
+    def tick(self) -> int:
+        """Start a new poll and return its number."""
+        self._poll += 1
+        return self._poll
+
+    def due(self, name: str) -> bool:
+        """Return True if the current poll must fetch `name`."""
+        due = self._poll >= self._next.get(name, 0)
+        if not due:
+            self.skipped += 1
+        return due
+
+    def select(self, sources: list[Any]) -> list[Any]:
+        """Start a new poll and return the due entries of `sources`."""
+        self.tick()
+        return [s for s in sources if self.due(s["name"])]
+
+    def record(self, name: str, changed: bool) -> None:
+        """Schedule the next fetch of `name` after a successful one."""
+        period = self.period(name)
+        if period == 0:
+            self._next[name] = math.inf
+            return
+        if period == 1:
+            self._next[name] = self._poll + 1
+            return
+        streak = 0 if changed else self._streak.get(name, 0) + 1
+        self._streak[name] = streak
+        factor = 1
+        if streak >= self._backoff_after:
+            factor = min(2 ** (streak - self._backoff_after + 1), self._backoff_max)
+        self._next[name] = self._poll + period * factor
+
+    def reset(self, name: str | None = None) -> None:
+        """Make `name` (or every source) due on the next poll."""
+        if name is None:
+            self._next.clear()
+            self._streak.clear()
+        else:
+            self._next.pop(name, None)
+            self._streak.pop(name, None)
+
+    def wake(self) -> None:
+        """Make every periodically polled source due on the next poll.
+
+        Unlike `reset()`, on-demand sources stay idle.
+        """
+        self._streak.clear()
+        for name in [n for n, due in self._next.items() if not math.isinf(due)]:
+            del self._next[name]
+
+    def stats(self) -> dict[str, Any]:
+        """Return scheduling state for diagnostics."""
+        return {
+            "poll": self._poll,
+            "skipped": self.skipped,
+            "next": {
+                name: (None if math.isinf(due) else int(due))
+                for name, due in self._next.items()
+            },
+            "backoff": {name: n for name, n in self._streak.items() if n},
+        }
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def _is_pattern(key: str) -> bool:
+    """Return True if a period table key is an fnmatch pattern."""
+    return any(c in key for c in "*?[")
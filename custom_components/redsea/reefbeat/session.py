@@ -0,0 +1,215 @@
+"""Dedicated keep-alive HTTP session for one local device.
+
+Home Assistant's shared client session pools connections with its own limits
+and keep-alive, while the ESP HTTP servers of the devices close idle
+connections after a few seconds: a pooled connection is often dead when a poll
+picks it up, and that failure used to go through the whole retry loop.
+
+`DeviceSession` gives each device its own connector:
+
+- at most `limit` connections to the device (what its firmware tolerates),
+- a keep-alive shorter than the device's idle timeout, so connections are
+  reused within a poll but not kept until the server drops them,
+- a request that fails on a reused connection (server already closed it) is
+  sent again right away on another one, outside of the caller's retry budget.
+  Only idempotent methods are resent: a POST may have been processed.
+
+It exposes the subset of `aiohttp.ClientSession` used by the API layer
+(`get`/`post`/`put`/`delete` as async context managers, see `HttpSession`) and
+counts new vs reused connections for diagnostics. The underlying session is created on first
+use, inside the event loop.
+"""
+
+from __future__ import annotations
+
+from contextlib import AbstractAsyncContextManager
+from types import SimpleNamespace, TracebackType
+from typing import Any, Protocol
+
+import aiohttp
+
+from ..const import DEFAULT_TIMEOUT
+
+# Methods safe to send again after a stale-connection failure.
+_IDEMPOTENT = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+# Errors raised when a pooled connection was closed by the device.
+_STALE_ERRORS = (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError)
+
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class HttpSession(Protocol):
+    """HTTP client used by the API classes.
+
+    Satisfied by `aiohttp.ClientSession` (Home Assistant's shared session) and
+    by `DeviceSession`.
+    """
+
+    def get(
+        self, url: str, **kwargs: Any
+    ) -> AbstractAsyncContextManager[aiohttp.ClientResponse]:
+        """Send a GET request (use as `async with`)."""
+        ...
+
+    def post(
+        self, url: str, **kwargs: Any
+    ) -> AbstractAsyncContextManager[aiohttp.ClientResponse]:
+        """Send a POST request (use as `async with`)."""
+        ...
+
+    def put(
+        self, url: str, **kwargs: Any
+    ) -> AbstractAsyncContextManager[aiohttp.ClientResponse]:
+        """Send a PUT request (use as `async with`)."""
+        ...
+
+    def delete(
+        self, url: str, **kwargs: Any
+    ) -> AbstractAsyncContextManager[aiohttp.ClientResponse]:
+        """Send a DELETE request (use as `async with`)."""
+        ...
+
+
+class DeviceSession:
+    """Per-device `aiohttp.ClientSession` stand-in with a tuned connector."""
+
+    def __init__(self, *, limit: int, keepalive_timeout: float) -> None:
+        """Create the session (the connector is created on first request).
+
+        Args:
+            limit: Maximum number of connections to the device.
+            keepalive_timeout: Seconds an idle connection stays in the pool.
+        """
+        self._limit = max(1, limit)
+        self._keepalive_timeout = keepalive_timeout
+        self._session: aiohttp.ClientSession | None = None
+        self.stats: dict[str, int] = {
+            "requests": 0,
+            "connections": 0,
+            "reused": 0,
+            "stale_retries": 0,
+        }
+
+    @property
+    def reuse_rate(self) -> float | None:
+        """Return the share of requests sent on a reused connection (%)."""
+        used = self.stats["connections"] + self.stats["reused"]
+        if not used:
+            return None
+        return round(self.stats["reused"] / used * 100, 1)
+
+    @property
+    def closed(self) -> bool:
+        """Return True if no underlying session is open."""
+        return self._session is None or self._session.closed
+
+    def get(self, url: str, **kwargs: Any) -> _RequestContext:
+        """Send a GET request (use as `async with`)."""
+        return _RequestContext(self, "GET", url, kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> _RequestContext:
+        """Send a POST request (use as `async with`)."""
+        return _RequestContext(self, "POST", url, kwargs)
+
+    def put(self, url: str, **kwargs: Any) -> _RequestContext:
+        """Send a PUT request (use as `async with`)."""
+        return _RequestContext(self, "PUT", url, kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> _RequestContext:
+        """Send a DELETE request (use as `async with`)."""
+        return _RequestContext(self, "DELETE", url, kwargs)
+
+    async def close(self) -> None:
+        """Close the underlying session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> aiohttp.ClientResponse:
+        """Send a request, resending it if a stale pooled connection failed."""
+        session = self._client()
+        # Every pooled connection may be stale: try each of them, then a new one.
+        retries = self._limit if method in _IDEMPOTENT else 0
+        while True:
+            ctx = {"reused": False}
+            try:
+                return await session.request(
+                    method, url, trace_request_ctx=ctx, **kwargs
+                )
+            except _STALE_ERRORS:
+                if not ctx["reused"] or retries <= 0:
+                    raise
+                retries -= 1
+                self.stats["stale_retries"] += 1
+
+    def _client(self) -> aiohttp.ClientSession:
+        """Return the underlying session, creating it if needed."""
+        if self._session is None or self._session.closed:
+            trace = aiohttp.TraceConfig()
+            trace.on_request_start.append(self._on_request_start)
+            trace.on_connection_create_end.append(self._on_connection_create)
+            trace.on_connection_reuseconn.append(self._on_connection_reuse)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._limit,
+                    limit_per_host=self._limit,
+                    keepalive_timeout=self._keepalive_timeout,
+                ),
+                # Overall timeouts are applied per request by the API layer;
+                # these bound a device accepting connections but not answering.
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    sock_connect=DEFAULT_TIMEOUT,
+                    sock_read=DEFAULT_TIMEOUT,
+                ),
+                trace_configs=[trace],
+            )
+        return self._session
+
+    async def _on_request_start(self, *_args: Any) -> None:
+        self.stats["requests"] += 1
+
+    async def _on_connection_create(self, *_args: Any) -> None:
+        self.stats["connections"] += 1
+
+    async def _on_connection_reuse(
+        self, _session: aiohttp.ClientSession, context: SimpleNamespace, _params: Any
+    ) -> None:
+        self.stats["reused"] += 1
+        if isinstance(context.trace_request_ctx, dict):
+            context.trace_request_ctx["reused"] = True
+
+
+class _RequestContext:
+    """`async with` wrapper releasing the response, like aiohttp's own."""
+
+    __slots__ = ("_args", "_method", "_response", "_session", "_url")
+
+    def __init__(
+        self, session: DeviceSession, method: str, url: str, args: dict[str, Any]
+    ) -> None:
+        self._session = session
+        self._method = method
+        self._url = url
+        self._args = args
+        self._response: aiohttp.ClientResponse | None = None
+
+    async def __aenter__(self) -> aiohttp.ClientResponse:
+        self._response = await self._session.request(
+            self._method, self._url, **self._args
+        )
+        return self._response
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._response is not None:
+            self._response.release()
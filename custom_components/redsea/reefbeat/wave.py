@@ -6,15 +6,24 @@ the UI for effect simulation.
 Notes:
     ReefWave firmware differs from other ReefBeat devices:
       - device-info may be served at `/` rather than `/dashboard`
+      - schedules are uploaded in several requests (`upload_schedule()`), the
+        older firmware only parsing small bodies
 """
 
 from __future__ import annotations
 
 import logging
-
-import aiohttp
-
-from .api import ReefBeatAPI
+import time
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from ..const import (
+    LEGACY_REQUEST_CONCURRENCY,
+    WAVE_UPLOAD_BATCH_MAX,
+    WAVE_UPLOAD_REPROBE,
+)
+from .api import HttpResult, ReefBeatAPI
+from .session import HttpSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,11 +36,13 @@ _LOGGER = logging.getLogger(__name__)
 class ReefWaveAPI(ReefBeatAPI):
     """ReefWave API wrapper (sources and preview defaults)."""
 
+    _request_concurrency = LEGACY_REQUEST_CONCURRENCY
+
     def __init__(
         self,
         ip: str,
         live_config_update: bool,
-        session: aiohttp.ClientSession,
+        session: HttpSession,
     ) -> None:
         """Create a ReefWaveAPI instance.
 
@@ -75,3 +86,134 @@ class ReefWaveAPI(ReefBeatAPI):
         )
 
         self.data["local"] = {"use_cloud_api": None}
+
+        # Largest intervals per POST /auto accepted by the device, the firmware
+        # it was learned on (None: not learned yet, see `upload_schedule()`),
+        # and the successful uploads left before a larger size is tried.
+        self._upload_batch: int | None = None
+        self._upload_firmware: str | None = None
+        self._upload_probe = WAVE_UPLOAD_REPROBE
+        self.last_schedule_upload: dict[str, Any] | None = None
+
+    @property
+    def layout(self) -> dict[str, Any] | None:
+        """Return the schedule upload batch size learned, to be cached.
+
+        Keys: `upload_batch` and `firmware` (version it was learned on). None
+        until a schedule was uploaded or a cached value applied.
+        """
+        if self._upload_batch is None:
+            return None
+        return {"upload_batch": self._upload_batch, "firmware": self._upload_firmware}
+
+    def use_layout(self, layout: Mapping[str, Any]) -> bool:
+        """Use the upload batch size learned by a previous run.
+
+        It is learned again by the next upload if the firmware changed.
+        """
+        batch = layout.get("upload_batch")
+        if not isinstance(batch, int) or isinstance(batch, bool) or batch < 1:
+            return False
+        firmware = layout.get("firmware")
+        self._upload_batch = min(batch, WAVE_UPLOAD_BATCH_MAX)
+        self._upload_firmware = str(firmware) if firmware is not None else None
+        return True
+
+    async def upload_schedule(
+        self, uid: str, intervals: Sequence[dict[str, Any]]
+    ) -> bool:
+        """Replace the schedule of the device by `intervals`, then apply it.
+
+        The intervals are sent between `/auto/init` and `/auto/complete` in
+        batches as large as the device accepts: starting from the size learned
+        for the current firmware (`WAVE_UPLOAD_BATCH_MAX` if unknown), a batch
+        the device rejects (4xx answer to its single try) is halved and sent
+        again, the batches already accepted are kept.
+
+        The largest batch accepted is remembered (see `layout`). Every
+        `WAVE_UPLOAD_REPROBE` successful uploads, twice that size is tried
+        first, so a one-off rejection or a small schedule does not cap it.
+
+        Args:
+            uid: Upload session identifier.
+            intervals: Schedule intervals, in order.
+
+        Returns:
+            True if the schedule was applied. False when a single interval or
+            a handshake step failed: the schedule is then not applied.
+        """
+        started = time.monotonic()
+        firmware = self.firmware_version
+        learned = self._upload_batch
+        if learned is None or firmware != self._upload_firmware:
+            learned = None
+            batch = WAVE_UPLOAD_BATCH_MAX
+        elif learned < WAVE_UPLOAD_BATCH_MAX and self._upload_probe <= 0:
+            batch = min(learned * 2, WAVE_UPLOAD_BATCH_MAX)
+            self._upload_probe = WAVE_UPLOAD_REPROBE
+        else:
+            batch = learned
+        payload = {"uid": uid}
+        requests = 0
+        accepted = 0
+        rejected = False
+
+        async def _send(
+            action: str, body: dict[str, Any], once: bool = False
+        ) -> HttpResult | None:
+            nonlocal requests
+            requests += 1
+            if once:
+                return await self.http_send_once(action, body)
+            return await self.http_send(action, body)
+
+        def _ok(result: HttpResult | None) -> bool:
+            return bool(result and result.get("ok"))
+
+        def _rejected(result: HttpResult | None) -> bool:
+            return result is not None and 400 <= int(result.get("status", 0)) < 500
+
+        ok = _ok(await _send("/auto/init", payload))
+        pos = 0
+        while ok and pos < len(intervals):
+            chunk = list(intervals[pos : pos + batch])
+            # A batch too large for the device is expected: tried once, quietly.
+            result = await _send("/auto", {"intervals": chunk}, once=True)
+            if not _ok(result) and not _rejected(result):
+                # Not a size problem (device busy, not reached): retried as usual.
+                result = await _send("/auto", {"intervals": chunk})
+            if _ok(result):
+                pos += len(chunk)
+                accepted = max(accepted, len(chunk))
+            elif len(chunk) > 1 and _rejected(result):
+                batch = len(chunk) // 2
+                if learned is not None and learned < len(chunk):
+                    # A rejected probe: back to the size known to be accepted.
+                    batch = max(batch, learned)
+                rejected = True
+                _LOGGER.info(
+                    "%s rejected %d schedule intervals at once, sending %d",
+                    self.ip,
+                    len(chunk),
+                    batch,
+                )
+            else:
+                ok = False
+        ok = ok and _ok(await _send("/auto/complete", payload))
+        ok = ok and _ok(await _send("/auto/apply", payload))
+
+        if ok and accepted:
+            # Without a rejection, the size learned before still holds.
+            if not rejected and learned is not None:
+                accepted = max(accepted, learned)
+            self._upload_batch, self._upload_firmware = accepted, firmware
+            self._upload_probe -= 1
+        self.last_schedule_upload = {
+            "ok": ok,
+            "intervals": len(intervals),
+            "batch": batch,
+            "requests": requests,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+        }
+        _LOGGER.debug("Schedule upload to %s: %s", self.ip, self.last_schedule_upload)
+        return ok
@@ -0,0 +1,87 @@
+"""Debounced, per-source write queue for pushes to a device.
+
+Entities write into the cached state with `set_data()` and then push the whole
+source payload (`push_values`). Dragging a slider or toggling several switches
+in a row therefore sends one full PUT/POST per change to a small device HTTP
+server.
+
+`WriteQueue.submit()` delays each push by a short window. Pushes for the same
+key (source, method and any head/pump argument) submitted during that window
+supersede the pending one: a single request is sent, built from the cached
+state at send time, so it carries every change made in the meantime. Every
+caller awaits that request and sees its outcome.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+SendFn = Callable[[], Awaitable[None]]
+
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class _PendingWrite:
+    """A push waiting for the end of its debounce window."""
+
+    __slots__ = ("send", "task")
+
+    def __init__(self, send: SendFn) -> None:
+        self.send = send
+        self.task: asyncio.Task[None]
+
+
+class WriteQueue:
+    """Merge pushes for the same key submitted within `delay` seconds."""
+
+    def __init__(self, delay: float) -> None:
+        """Create a queue debouncing pushes by `delay` seconds."""
+        self._delay = delay
+        self._pending: dict[Hashable, _PendingWrite] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.stats: dict[str, int] = {"requested": 0, "sent": 0, "superseded": 0}
+
+    def pending(self, key: Hashable) -> bool:
+        """Return True if a push for `key` is waiting to be sent."""
+        return key in self._pending
+
+    async def submit(self, key: Hashable, send: SendFn) -> None:
+        """Queue `send` for `key` and wait until the merged push is done.
+
+        The push runs in a task owned by the queue: a cancelled caller stops
+        waiting for it, but the push (and the changes merged into it) still
+        goes out for the other callers.
+
+        Raises:
+            Exception: Whatever the merged push raised.
+        """
+        self.stats["requested"] += 1
+        pending = self._pending.get(key)
+        if pending is not None:
+            # Superseded: the pending push is sent with the latest callable.
+            pending.send = send
+            self.stats["superseded"] += 1
+            await asyncio.shield(pending.task)
+            return
+
+        pending = self._pending[key] = _PendingWrite(send)
+        task = pending.task = asyncio.get_running_loop().create_task(
+            self._flush(key, pending)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        await asyncio.shield(task)
+
+    async def _flush(self, key: Hashable, pending: _PendingWrite) -> None:
+        """Send `pending` once its debounce window is over."""
+        try:
+            if self._delay > 0:
+                await asyncio.sleep(self._delay)
+        finally:
+            del self._pending[key]
+        await pending.send()
+        self.stats["sent"] += 1
@@ -0,0 +1,109 @@
+"""Time index of the day schedules of the devices (wave programs, pump intensity).
+
+A schedule is a list of segments, each starting `st` minutes after midnight.
+A segment is in effect once the clock is past its start (`st < now`), the first
+one also covering the time before the second one starts. The segment in effect
+used to be found by scanning the list on every read, and every wave sensor and
+number reads it on every update.
+
+`ScheduleIndex` is built once per schedule payload (`ScheduleIndexes` rebuilds
+it when the device sends a new one): start minutes looked up by bisect, and the
+minute at which the segment in effect changes next, so the wave entities can be
+refreshed right at segment boundaries instead of on every poll.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Sequence
+from datetime import datetime
+from itertools import pairwise
+from typing import Any
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def minute_of_day(now: datetime) -> int:
+    """Return the minutes elapsed since midnight at `now`."""
+    return now.hour * 60 + now.minute
+
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class ScheduleIndex:
+    """Segment lookups by minute of the day over one schedule payload."""
+
+    __slots__ = ("_sorted", "_starts", "segments")
+
+    def __init__(self, segments: Sequence[dict[str, Any]]) -> None:
+        """Index `segments` (kept by reference, not copied)."""
+        self.segments = segments
+        self._starts = [int(segment["st"]) for segment in segments]
+        self._sorted = all(a <= b for a, b in pairwise(self._starts))
+
+    def index_at(self, minute: int) -> int:
+        """Return the index of the segment in effect at `minute` (0 if empty)."""
+        starts = self._starts
+        if self._sorted:
+            return max(0, bisect_left(starts, minute, 1) - 1)
+        # Out of order (never sent by the devices): the scan stops at the first
+        # segment not started yet, as the devices do.
+        idx = 0
+        for i in range(1, len(starts)):
+            if starts[i] >= minute:
+                break
+            idx = i
+        return idx
+
+    def current(self, minute: int) -> dict[str, Any] | None:
+        """Return the segment in effect at `minute`, None for an empty schedule."""
+        if not self.segments:
+            return None
+        return self.segments[self.index_at(minute)]
+
+    def next_transition(self, minute: int) -> int | None:
+        """Return the minute of the day the segment in effect changes next.
+
+        The value is above `minute` and at most `MINUTES_PER_DAY` (midnight,
+        when the last segment hands over to the first one). None when the same
+        segment is in effect all day.
+        """
+        if len(self._starts) < 2:
+            return None
+        current = self.index_at(minute)
+        if self._sorted:
+            nxt = bisect_left(self._starts, minute, 1)
+            if nxt < len(self._starts):
+                # Segment `nxt` is in effect once the clock is past its start.
+                return self._starts[nxt] + 1
+        else:
+            for later in range(minute + 1, MINUTES_PER_DAY):
+                if self.index_at(later) != current:
+                    return later
+        return MINUTES_PER_DAY if current != self.index_at(0) else None
+
+
+class ScheduleIndexes:
+    """`ScheduleIndex` of each schedule of a device, rebuilt on new payloads."""
+
+    def __init__(self) -> None:
+        """Create an empty cache."""
+        self._by_path: dict[str, ScheduleIndex] = {}
+
+    def get(self, path: str, segments: Sequence[dict[str, Any]]) -> ScheduleIndex:
+        """Return the index of the schedule read at `path`.
+
+        A fetch stores a new payload object, so the index is rebuilt when
+        `segments` is not the object it was built from.
+        """
+        index = self._by_path.get(path)
+        if index is None or index.segments is not segments:
+            index = self._by_path[path] = ScheduleIndex(segments)
+        return index
+
+    def clear(self) -> None:
+        """Drop every index (schedule written in place)."""
+        self._by_path.clear()
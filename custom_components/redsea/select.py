@@ -329,6 +329,7 @@ class ReefBeatSelectEntity(ReefRoleMixin, ReefBeatRestoreEntity, SelectEntity):
     """
 
     _attr_has_entity_name = True
+    _scope_fields = ("value_name",)
 
     @staticmethod
     def _restore_value(state: str) -> str:
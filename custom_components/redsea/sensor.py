@@ -150,10 +150,14 @@ class ReefBeatSensorEntityDescription(SensorEntityDescription):
     `value_fn` receives the coordinator instance and must return a Home Assistant
     StateType (e.g. str/int/float/None). This is the most strongly typed and
     avoids `value_name` JSONPath strings where possible.
+
+    `sources` lists the device sources `value_fn` reads, so the entity is only
+    updated when one of them changed. None: updated after every poll.
     """
 
     exists_fn: Callable[[ReefBeatCoordinator], bool] = lambda _: True
     value_fn: Callable[[ReefBeatCoordinator], StateType]
+    sources: tuple[str, ...] | None = None
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -318,6 +322,7 @@ COMMON_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
     ReefBeatSensorEntityDescription(
         key="mode",
         translation_key="mode",
+        sources=("/mode",),
         value_fn=lambda device: device.get_data(
             "$.sources[?(@.name=='/mode')].data.mode"
         ),
@@ -375,6 +380,7 @@ COMMON_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
     ReefBeatSensorEntityDescription(
         key="ip",
         translation_key="ip",
+        sources=("/wifi",),
         value_fn=lambda device: device.get_data(
             "$.sources[?(@.name=='/wifi')].data.ip"
         ),
@@ -384,6 +390,7 @@ COMMON_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
     ReefBeatSensorEntityDescription(
         key="wifi_ssid",
         translation_key="wifi_ssid",
+        sources=("/wifi",),
         value_fn=lambda device: device.get_data(
             "$.sources[?(@.name=='/wifi')].data.ssid"
         ),
@@ -393,6 +400,7 @@ COMMON_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
     ReefBeatSensorEntityDescription(
         key="wifi_signal",
         translation_key="wifi_signal",
+        sources=("/wifi",),
         value_fn=lambda device: device.get_data(
             "$.sources[?(@.name=='/wifi')].data.signal_dBm"
         ),
@@ -405,6 +413,7 @@ COMMON_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
     ReefBeatSensorEntityDescription(
         key="wifi_quality",
         translation_key="wifi_quality",
+        sources=("/wifi",),
         value_fn=lambda device: device.get_data(
             "$.sources[?(@.name=='/wifi')].data.signal_dBm"
         ),
@@ -419,6 +428,58 @@ COMMON_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
         ],
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
+    ReefBeatSensorEntityDescription(
+        key="connection_reuse",
+        translation_key="connection_reuse",
+        exists_fn=lambda device: getattr(device, "connection_stats", None) is not None,
+        value_fn=lambda device: (device.connection_stats or {}).get("reuse_rate"),
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:connection",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    ReefBeatSensorEntityDescription(
+        key="request_latency_p50",
+        translation_key="request_latency_p50",
+        exists_fn=lambda device: getattr(device, "request_metrics", None) is not None,
+        value_fn=lambda device: (
+            m.percentile(50) if (m := device.request_metrics) is not None else None
+        ),
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    ReefBeatSensorEntityDescription(
+        key="request_latency_p95",
+        translation_key="request_latency_p95",
+        exists_fn=lambda device: getattr(device, "request_metrics", None) is not None,
+        value_fn=lambda device: (
+            m.percentile(95) if (m := device.request_metrics) is not None else None
+        ),
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer-alert-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    ReefBeatSensorEntityDescription(
+        key="request_failure_rate",
+        translation_key="request_failure_rate",
+        exists_fn=lambda device: getattr(device, "request_metrics", None) is not None,
+        value_fn=lambda device: (
+            m.failure_rate if (m := device.request_metrics) is not None else None
+        ),
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:lan-disconnect",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
 )
 
 LED_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
@@ -428,6 +489,7 @@ LED_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.POWER_FACTOR,
         state_class=SensorStateClass.MEASUREMENT,
+        sources=("/manual",),
         value_fn=lambda device: device.get_data(
             "$.sources[?(@.name=='/manual')].data.fan"
         ),
@@ -441,6 +503,7 @@ LED_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
+        sources=("/manual",),
         value_fn=lambda device: device.get_data(
             "$.sources[?(@.name=='/manual')].data.temperature"
         ),
@@ -454,6 +517,7 @@ LED_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
         translation_key="moon_intensity",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
+        sources=("/moonphase",),
         value_fn=lambda device: device.get_data(
             "$.sources[?(@.name=='/moonphase')].data.intensity"
         ),
@@ -463,6 +527,7 @@ LED_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
     ReefBeatSensorEntityDescription(
         key="todays_moon_day",
         translation_key="todays_moon_day",
+        sources=("/moonphase",),
         value_fn=lambda device: device.get_data(
             "$.sources[?(@.name=='/moonphase')].data.todays_moon_day"
         ),
@@ -473,6 +538,7 @@ LED_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
         key="next_full_moon",
         translation_key="next_full_moon",
         native_unit_of_measurement=UnitOfTime.DAYS,
+        sources=("/moonphase",),
         value_fn=lambda device: device.get_data(
             "$.sources[?(@.name=='/moonphase')].data.next_full_moon"
         ),
@@ -482,6 +548,7 @@ LED_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
         key="next_new_moon",
         translation_key="next_new_moon",
         native_unit_of_measurement=UnitOfTime.DAYS,
+        sources=("/moonphase",),
         value_fn=lambda device: device.get_data(
             "$.sources[?(@.name=='/moonphase')].data.next_new_moon"
         ),
@@ -491,6 +558,7 @@ LED_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
         key="acclimation_duration",
         translation_key="acclimation_duration",
         native_unit_of_measurement=UnitOfTime.DAYS,
+        sources=("/acclimation",),
         value_fn=lambda device: device.get_data(
             "$.sources[?(@.name=='/acclimation')].data.duration"
         ),
@@ -500,6 +568,7 @@ LED_SENSORS: tuple[ReefBeatSensorEntityDescription, ...] = (
         key="acclimation_start_intensity_factor",
         translation_key="acclimation_start_intensity_factor",
         native_unit_of_measurement=PERCENTAGE,
+        sources=("/acclimation",),
         value_fn=lambda device: device.get_data(
             "$.sources[?(@.name=='/acclimation')].data.start_intensity_factor"
         ),
@@ -613,11 +682,11 @@ for auto_id in range(1, 8):
                 value_name="$.sources[?(@.name=='/preset_name/"
                 + str(auto_id)
                 + "')].data.name",
+                # Per-day sources are loaded a few per poll: check the source
+                # is registered, not that it was loaded.
                 exists_fn=lambda device, _aid=auto_id: (
                     device.get_data(
-                        "$.sources[?(@.name=='/preset_name/"
-                        + str(_aid)
-                        + "')].data.name",
+                        "$.sources[?(@.name=='/preset_name/" + str(_aid) + "')].name",
                         True,
                     )
                     is not None
@@ -2028,7 +2097,9 @@ class ReefBeatSensorEntity(ReefRoleMixin, ReefBeatRestoreEntity, SensorEntity):
     """Base sensor entity backed by a ReefBeat device/coordinator.
 
     Responsibilities:
-    - Subscribe to coordinator changes via `async_add_listener`.
+    - Subscribe to coordinator changes via `async_add_listener`, scoped to the
+      description `sources` or to the ones read by `value_name`/`with_attr_value`
+      when possible.
     - Compute native value + extra attributes using the entity description.
     - Provide base `device_info` that points to the coordinator’s device.
 
@@ -2036,6 +2107,7 @@ class ReefBeatSensorEntity(ReefRoleMixin, ReefBeatRestoreEntity, SensorEntity):
     """
 
     _attr_has_entity_name = True
+    _scope_fields = ("value_name", "with_attr_value")
 
     @staticmethod
     def _restore_native_value(state: str) -> StateType:
@@ -2165,6 +2237,17 @@ class ReefLedScheduleSensorEntity(ReefBeatSensorEntity):
 
     _attr_has_entity_name = True
 
+    @property
+    def source_scope(self) -> frozenset[str] | None:
+        """Return the program sources on top of the `value_name` one."""
+        scope = super().source_scope
+        if scope is None:
+            return None
+        id_name = cast(
+            ReefLedScheduleSensorEntityDescription, self._description
+        ).id_name
+        return scope | {f"/auto/{id_name}", f"/clouds/{id_name}"}
+
     def _update_val(self) -> None:
         self._attr_available = True
         desc = cast(ReefLedScheduleSensorEntityDescription, self._description)
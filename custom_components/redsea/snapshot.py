@@ -0,0 +1,194 @@
+"""Persisted device state snapshots for instant startup.
+
+Setting up a local device used to wait for its whole initial fetch (device-info,
+every config source, then the data sources), and failed when the device was
+offline. With a dozen devices, Home Assistant startup waited on dozens of slow
+ESP requests.
+
+The API state (`ReefBeatAPI.snapshot()`) of each device is saved to
+``.storage/redsea_snapshot_<entry_id>`` after successful polls, at most once
+every `SNAPSHOT_SAVE_DELAY` seconds (and on shutdown). On the next startup the
+coordinator restores it, so entities get their last known values right away
+(marked stale), and runs the initial fetch as its first refresh, in the
+background.
+
+The firmware variant detected by probing the device (`ReefBeatAPI.layout`) is
+saved apart, to ``.storage/redsea_layout_<entry_id>``: it is still used when the
+snapshot is missing, so the probes are skipped unless the firmware changed.
+
+Both are written when the coordinator shuts down, if a save is pending. Each
+file has a single `Store` per Home Assistant instance, shared by the coordinator
+and `async_remove_entry()`, so removing an entry also cancels its pending saves
+instead of having them write the file again.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from time import time
+from typing import Any, Final
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import SNAPSHOT_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+# Storage format: bump when the JSON shape changes incompatibly.
+STORAGE_VERSION: Final[int] = 1
+STORAGE_KEY_TPL: Final[str] = "redsea_snapshot_{entry_id}"
+LAYOUT_STORAGE_KEY_TPL: Final[str] = "redsea_layout_{entry_id}"
+# hass.data key of the `Store` of each storage key.
+DATA_STORES: Final[str] = "redsea_stores"
+
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class SnapshotStore:
+    """Persisted API state of one config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, hw_model: str) -> None:
+        """Create the store of an entry.
+
+        Args:
+            hass: Home Assistant instance.
+            entry_id: Config entry the snapshot belongs to.
+            hw_model: Hardware model of the device. A snapshot saved for another
+                model is ignored.
+        """
+        self._hass = hass
+        self._store = _entry_store(hass, STORAGE_KEY_TPL.format(entry_id=entry_id))
+        self._hw_model = hw_model
+        self._save_scheduled = False
+        self._pending: Callable[[], dict[str, Any]] | None = None
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the saved API state, or None if there is no usable snapshot."""
+        raw = await self._store.async_load()
+        if not isinstance(raw, dict) or raw.get("hw_model") != self._hw_model:
+            return None
+        state = raw.get("state")
+        if not isinstance(state, dict):
+            return None
+        _LOGGER.debug(
+            "Snapshot of %s loaded (%ds old)",
+            self._hw_model,
+            time() - float(raw.get("saved_at", 0)),
+        )
+        return state
+
+    @callback
+    def async_schedule_save(self, state_func: Callable[[], dict[str, Any]]) -> None:
+        """Save the state returned by `state_func` within `SNAPSHOT_SAVE_DELAY`.
+
+        Calls made while a save is pending join it: the state is taken when the
+        snapshot is written, so it is the latest one.
+        """
+        if self._save_scheduled:
+            return
+        self._save_scheduled = True
+
+        def _data() -> dict[str, Any]:
+            self._save_scheduled = False
+            return {
+                "hw_model": self._hw_model,
+                "saved_at": time(),
+                "state": state_func(),
+            }
+
+        self._pending = _data
+        self._store.async_delay_save(_data, SNAPSHOT_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Write the pending snapshot now, if any (coordinator shut down)."""
+        if self._save_scheduled and self._pending is not None:
+            await self._store.async_save(self._pending())
+        self._pending = None
+
+    async def async_remove(self) -> None:
+        """Delete the snapshot and cancel its pending save (entry removed)."""
+        self._save_scheduled = False
+        self._pending = None
+        await _remove_entry_store(self._hass, self._store)
+
+
+class LayoutStore:
+    """Persisted firmware variant (source layout) of one config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, hw_model: str) -> None:
+        """Create the store of an entry.
+
+        Args:
+            hass: Home Assistant instance.
+            entry_id: Config entry the layout belongs to.
+            hw_model: Hardware model of the device. A layout saved for another
+                model is ignored.
+        """
+        self._hass = hass
+        self._store = _entry_store(
+            hass, LAYOUT_STORAGE_KEY_TPL.format(entry_id=entry_id)
+        )
+        self._hw_model = hw_model
+        self._layout: dict[str, Any] | None = None
+        self._pending = False
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the saved layout, or None if there is no usable one."""
+        raw = await self._store.async_load()
+        if not isinstance(raw, dict) or raw.get("hw_model") != self._hw_model:
+            return None
+        layout = raw.get("layout")
+        if not isinstance(layout, dict):
+            return None
+        self._layout = layout
+        return layout
+
+    @callback
+    def async_save(self, layout: dict[str, Any] | None) -> None:
+        """Save `layout` if it differs from the saved one."""
+        if layout is None or layout == self._layout:
+            return
+        self._layout = layout
+        _LOGGER.debug("Saving layout of %s: %s", self._hw_model, layout)
+        self._pending = True
+        self._store.async_delay_save(self._data, 0)
+
+    async def async_flush(self) -> None:
+        """Write the pending layout now, if any (coordinator shut down)."""
+        if self._pending:
+            await self._store.async_save(self._data())
+
+    async def async_remove(self) -> None:
+        """Delete the layout and cancel its pending save (entry removed)."""
+        self._pending = False
+        await _remove_entry_store(self._hass, self._store)
+
+    def _data(self) -> dict[str, Any]:
+        self._pending = False
+        return {"hw_model": self._hw_model, "layout": self._layout}
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def _entry_store(hass: HomeAssistant, key: str) -> Store[dict[str, Any]]:
+    """Return the `Store` of a storage key, created on first use."""
+    stores: dict[str, Store[dict[str, Any]]] = hass.data.setdefault(DATA_STORES, {})
+    store = stores.get(key)
+    if store is None:
+        store = stores[key] = Store(hass, STORAGE_VERSION, key)
+    return store
+
+
+async def _remove_entry_store(hass: HomeAssistant, store: Store[Any]) -> None:
+    """Delete the file of `store`, its pending saves included, and forget it."""
+    # `Store.async_remove()` also cancels the delayed and final writes.
+    await store.async_remove()
+    hass.data.get(DATA_STORES, {}).pop(store.key, None)
@@ -0,0 +1,245 @@
+"""Startup orchestration of the initial fetches of local devices.
+
+While Home Assistant starts, every config entry is set up at once: with a
+dozen devices, a dozen initial fetches (device-info, every config source, then
+the data sources) hit the network together, and fast devices wait behind slow
+ones.
+
+`async_setup()` creates a `StartupOrchestrator` for the local devices to set up
+during boot. Each of them runs its initial fetch through a `StartupGate`,
+installed as `ReefBeatAPI.startup_gate`:
+
+- a phase starts once every other device finished the previous one (or after
+  `STARTUP_PHASE_WAIT` seconds): device-info is fetched from all devices
+  first, then config, then data;
+- at most `STARTUP_CONCURRENCY` devices run a phase at a time, the ones that
+  set up the fastest on the previous boot first.
+
+Once every device is set up, the setup time of each entry is logged and saved
+to ``.storage/redsea_startup`` (it ranks the devices on the next boot).
+Entries set up after that (reloads, new devices) fetch directly.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from asyncio import Event, timeout
+from collections.abc import AsyncIterator, Iterable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, suppress
+from typing import Any, Final
+
+from homeassistant.core import Event as HassEvent
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import STARTUP_CONCURRENCY, STARTUP_PHASE_WAIT
+from .reefbeat.limiter import POLL, RequestLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+# Storage format: bump when the JSON shape changes incompatibly.
+STORAGE_VERSION: Final[int] = 1
+STORAGE_KEY: Final[str] = "redsea_startup"
+# hass.data key of the running orchestrator.
+DATA_STARTUP: Final[str] = "redsea_startup"
+
+PHASES: Final[tuple[str, ...]] = ("device-info", "config", "data")
+
+
+# =============================================================================
+# Classes
+# =============================================================================
+
+
+class StartupOrchestrator:
+    """Order the initial fetches of the devices set up during boot."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_ids: Iterable[str],
+        *,
+        concurrency: int = STARTUP_CONCURRENCY,
+        phase_wait: float = STARTUP_PHASE_WAIT,
+    ) -> None:
+        """Create the orchestrator.
+
+        Args:
+            hass: Home Assistant instance.
+            entry_ids: Config entries of the local devices expected to set up.
+            concurrency: Devices running a phase at the same time.
+            phase_wait: Longest wait (s) for the previous phase of the others.
+        """
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._expected = set(entry_ids)
+        self._joined: set[str] = set()
+        # Entries that did not finish each phase yet, and the phases all
+        # entries finished.
+        self._pending = [set(self._expected) for _ in PHASES]
+        self._passed = [Event() for _ in PHASES]
+        self._phase_wait = phase_wait
+        self.budget = RequestLimiter(concurrency)
+        self._started = time.monotonic()
+        self._previous: dict[str, float] = {}
+        self.setup_times: dict[str, float] = {}
+        for index in range(len(PHASES)):
+            self._check(index)
+
+    async def async_load(self) -> None:
+        """Load the setup times of the previous boot."""
+        raw = await self._store.async_load()
+        times = raw.get("setup_times") if isinstance(raw, dict) else None
+        if isinstance(times, dict):
+            self._previous = {
+                str(k): float(v)
+                for k, v in times.items()
+                if isinstance(v, (int, float))
+            }
+
+    def join(self, entry_id: str) -> StartupGate | None:
+        """Return the gate of an entry, or None if it is not part of the startup."""
+        if entry_id not in self._expected:
+            return None
+        self._joined.add(entry_id)
+        return StartupGate(self, entry_id)
+
+    def leave(self, entry_id: str, setup_time: float | None = None) -> None:
+        """Stop waiting for an entry (initial fetch done, failed or skipped).
+
+        Args:
+            entry_id: The config entry.
+            setup_time: Seconds the entry took to load its initial data, if it
+                did.
+        """
+        if entry_id not in self._expected:
+            return
+        self._expected.discard(entry_id)
+        if setup_time is not None:
+            self.setup_times[entry_id] = round(setup_time, 2)
+        for index, pending in enumerate(self._pending):
+            pending.discard(entry_id)
+            self._check(index)
+        if not self._expected:
+            self._finish()
+
+    def forget(self, entry_id: str) -> None:
+        """Drop a removed entry, including its setup time of the last boot."""
+        self._previous.pop(entry_id, None)
+        self.setup_times.pop(entry_id, None)
+        self.leave(entry_id)
+
+    @callback
+    def async_started(self, _event: HassEvent | None = None) -> None:
+        """Stop waiting for entries that were not set up during boot."""
+        for entry_id in self._expected - self._joined:
+            self.leave(entry_id)
+
+    @asynccontextmanager
+    async def phase(self, entry_id: str, name: str) -> AsyncIterator[None]:
+        """Run phase `name` of an entry after the previous one of all entries."""
+        index = PHASES.index(name)
+        # Phases skipped by this entry (config with live config update).
+        for skipped in range(index):
+            self._pending[skipped].discard(entry_id)
+            self._check(skipped)
+        if index:
+            with suppress(TimeoutError):
+                async with timeout(self._phase_wait):
+                    await self._passed[index - 1].wait()
+        try:
+            order = self._previous.get(entry_id, math.inf)
+            async with self.budget.slot(POLL, order):
+                yield
+        finally:
+            self._pending[index].discard(entry_id)
+            self._check(index)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the startup state for diagnostics."""
+        return {
+            "waiting_for": len(self._expected),
+            "phases": {
+                name: len(pending) for name, pending in zip(PHASES, self._pending)
+            },
+            "budget": self.budget.stats(),
+            "setup_times": dict(self.setup_times),
+        }
+
+    def _check(self, index: int) -> None:
+        """Open phase `index + 1` once every entry finished phase `index`."""
+        if not self._pending[index]:
+            self._passed[index].set()
+
+    def _finish(self) -> None:
+        """Report the setup times and stop orchestrating."""
+        if self._hass.data.get(DATA_STARTUP) is self:
+            del self._hass.data[DATA_STARTUP]
+        if not self.setup_times:
+            return
+        titles = {
+            entry.entry_id: entry.title
+            for entry in self._hass.config_entries.async_entries()
+            if entry.entry_id in self.setup_times
+        }
+        _LOGGER.info(
+            "Red Sea devices set up in %.1fs: %s",
+            time.monotonic() - self._started,
+            ", ".join(
+                f"{titles.get(entry_id, entry_id)} {elapsed:.1f}s"
+                for entry_id, elapsed in sorted(
+                    self.setup_times.items(), key=lambda item: item[1]
+                )
+            ),
+        )
+        times = {**self._previous, **self.setup_times}
+        self._store.async_delay_save(lambda: {"setup_times": times}, 0)
+
+
+class StartupGate:
+    """Startup phases of one entry (see `ReefBeatAPI.startup_gate`)."""
+
+    def __init__(self, orchestrator: StartupOrchestrator, entry_id: str) -> None:
+        """Create the gate of `entry_id`."""
+        self._orchestrator = orchestrator
+        self._entry_id = entry_id
+
+    def phase(self, name: str) -> AbstractAsyncContextManager[None]:
+        """Return the context manager of phase `name`."""
+        return self._orchestrator.phase(self._entry_id, name)
+
+    def close(self, setup_time: float | None = None) -> None:
+        """Leave the startup (see `StartupOrchestrator.leave`)."""
+        self._orchestrator.leave(self._entry_id, setup_time)
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def async_join_startup(hass: HomeAssistant, entry_id: str) -> StartupGate | None:
+    """Return the startup gate of an entry while Home Assistant starts."""
+    orchestrator: StartupOrchestrator | None = hass.data.get(DATA_STARTUP)
+    return orchestrator.join(entry_id) if orchestrator is not None else None
+
+
+def async_leave_startup(hass: HomeAssistant, entry_id: str) -> None:
+    """Stop waiting for an entry that will not fetch its initial data."""
+    orchestrator: StartupOrchestrator | None = hass.data.get(DATA_STARTUP)
+    if orchestrator is not None:
+        orchestrator.leave(entry_id)
+
+
+async def async_remove_setup_time(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the saved setup time of a removed entry."""
+    orchestrator: StartupOrchestrator | None = hass.data.get(DATA_STARTUP)
+    if orchestrator is not None:
+        orchestrator.forget(entry_id)
+    store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+    raw = await store.async_load()
+    times = raw.get("setup_times") if isinstance(raw, dict) else None
+    if isinstance(times, dict) and times.pop(entry_id, None) is not None:
+        await store.async_save({"setup_times": times})
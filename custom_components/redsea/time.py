@@ -99,6 +99,7 @@ class ReefMatTimeEntity(ReefBeatRestoreEntity, TimeEntity):  # type: ignore[repo
     """ReefMat time entity backed by the coordinator cache."""
 
     _attr_has_entity_name = True
+    _scope_fields = ("value_name",)
 
     @staticmethod
     def _restore_value(state: str) -> time:
@@ -0,0 +1,100 @@
+"""Shared helpers for the ReefBeat micro-benchmarks.
+
+The benchmarks run against the captured device payloads in
+`tests/fixtures/devices/<PROFILE>` so numbers are comparable between runs and do
+not need a real device on the network.
+
+Run any benchmark from the repository root, e.g.:
+
+    python scripts/benchmarks/get_data.py
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+repo_root = os.path.dirname(os.path.dirname(script_dir))
+devices_dir = os.path.join(repo_root, "tests", "fixtures", "devices")
+
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+
+def read_endpoint(profile: str, endpoint: str) -> Any:
+    """Return the captured payload for `endpoint` of a fixture profile (or {})."""
+    rel = endpoint.lstrip("/")
+    path = os.path.join(devices_dir, profile, rel, "data")
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        raw = f.read()
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def load_api(api: Any, profile: str) -> Any:
+    """Fill every registered source of `api` from the fixture profile."""
+    for source in api.data["sources"]:
+        source["data"] = read_endpoint(profile, source["name"])
+    return api
+
+
+def led_api(ip: str = "192.0.2.2", hw_model: str = "RSLED160") -> Any:
+    """Return a ReefLedAPI with the runtime sources registered and loaded.
+
+    Mirrors `ReefLedAPI._apply_runtime_source_patches()` for a G1 light with
+    per-day preset names, without probing the network.
+    """
+    from custom_components.redsea.reefbeat import ReefLedAPI
+
+    api = ReefLedAPI(ip, False, None, hw_model)  # type: ignore[arg-type]
+    for name in ("/manual", "/acclimation", "/moonphase"):
+        api.add_source(name, "data" if name == "/manual" else "config", "")
+    for day in range(1, 8):
+        api.add_source(f"/preset_name/{day}", "config", "")
+        api.add_source(f"/auto/{day}", "config", "")
+        api.add_source(f"/clouds/{day}", "config", "")
+    return load_api(api, "LED")
+
+
+def scalar_paths(api: Any) -> list[str]:
+    """Return a JSONPath for every scalar field below each registered source.
+
+    This mimics the `value_name` expressions used by the entity descriptions.
+    """
+    out: list[str] = []
+
+    def _walk(node: Any, prefix: str) -> None:
+        if isinstance(node, dict):
+            for key, val in node.items():
+                if isinstance(key, str) and key.isidentifier():
+                    _walk(val, f"{prefix}.{key}")
+        elif isinstance(node, list):
+            for i, val in enumerate(node[:4]):
+                _walk(val, f"{prefix}[{i}]")
+        else:
+            out.append(prefix)
+
+    for source in api.data["sources"]:
+        _walk(source["data"], f"$.sources[?(@.name=='{source['name']}')].data")
+    return out
+
+
+def bench(label: str, func: Callable[[], Any], rounds: int, ops: int) -> float:
+    """Run `func` `rounds` times and print the best time per operation."""
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    per_op_us = best / ops * 1_000_000
+    print(f"{label:<32} {best * 1000:9.2f} ms/round {per_op_us:9.3f} us/op")
+    return best
@@ -0,0 +1,146 @@
+"""Latency and allocations of response decoding on the fixture payloads.
+
+Replays the bodies of every captured endpoint of every fixture profile through
+a minimal stand-in of an aiohttp response and compares, per response:
+    - the former handling: `text()` + `json()` (two UTF-8 decodes, two parses)
+      and a copy of every header into the result
+    - one `read()`, one parse (orjson when installed), lazy headers/text
+
+Allocations are the peak traced by `tracemalloc` over one round.
+
+Usage:
+    python scripts/benchmarks/decode.py [ROUNDS]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import tracemalloc
+from collections.abc import Callable
+from types import ModuleType
+from typing import Any
+
+from common import bench, devices_dir
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from custom_components.redsea.reefbeat import payload
+from custom_components.redsea.reefbeat.api import HttpResult
+
+HEADERS = CIMultiDictProxy(
+    CIMultiDict(
+        {
+            "Content-Type": "application/json",
+            "Content-Length": "0",
+            "Connection": "keep-alive",
+            "Access-Control-Allow-Origin": "*",
+        }
+    )
+)
+
+
+class _Response:
+    """The parts of `aiohttp.ClientResponse` the API uses (body already read)."""
+
+    def __init__(self, raw: bytes) -> None:
+        self._raw = raw
+        self.headers = HEADERS
+
+    async def read(self) -> bytes:
+        return self._raw
+
+    async def text(self) -> str:
+        return self._raw.decode("utf-8")
+
+    async def json(self, content_type: Any = None) -> Any:
+        text = self._raw.decode("utf-8").strip()
+        return json.loads(text) if text else None
+
+
+def _bodies() -> list[bytes]:
+    """Return the raw body of every captured endpoint."""
+    out: list[bytes] = []
+    for root, _dirs, files in os.walk(devices_dir):
+        if "data" in files:
+            with open(os.path.join(root, "data"), "rb") as f:
+                out.append(f.read())
+    return out
+
+
+async def _former(resp: _Response) -> dict[str, Any]:
+    text = await resp.text()
+    json_body: Any | None = None
+    try:
+        json_body = await resp.json(content_type=None)
+    except ValueError:
+        pass
+    result = {"headers": {k: v for k, v in resp.headers.items()}, "text": text}
+    if json_body is not None:
+        result["json"] = json_body
+    return result
+
+
+async def _single(resp: _Response) -> dict[str, Any]:
+    raw = await resp.read()
+    fields: dict[str, Any] = {}
+    body = payload.loads(raw)
+    if body is not payload.NOT_JSON and body is not None:
+        fields["json"] = body
+    return HttpResult(fields, raw, resp.headers)
+
+
+def _allocations(func: Callable[[], Any]) -> tuple[float, float]:
+    """Return (retained, peak) KiB traced over one warmed-up run of `func`.
+
+    Retained is what the results held at the end of the run take; peak adds
+    the transient buffers of decoding.
+    """
+    func()
+    tracemalloc.start()
+    try:
+        results = func()
+        retained, peak = tracemalloc.get_traced_memory()
+        del results
+        return retained / 1024, peak / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    responses = [_Response(raw) for raw in _bodies()]
+    size = sum(len(r._raw) for r in responses)
+    print(f"{len(responses)} bodies, {size / 1024:.0f} KiB, {rounds} rounds")
+
+    loop = asyncio.new_event_loop()
+
+    def _run(handler: Callable[[_Response], Any]) -> Callable[[], list[Any]]:
+        async def _all() -> list[Any]:
+            return [await handler(resp) for resp in responses]
+
+        return lambda: loop.run_until_complete(_all())
+
+    installed = payload.orjson
+    cases: list[tuple[str, Callable[[_Response], Any], ModuleType | None]] = [
+        ("text() + json() + headers", _former, None)
+    ]
+    cases.append(("read() + json.loads, lazy", _single, None))
+    if installed is not None:
+        cases.append(("read() + orjson.loads, lazy", _single, installed))
+
+    times: list[float] = []
+    for label, handler, parser in cases:
+        payload.orjson = parser
+        func = _run(handler)
+        times.append(bench(label, func, rounds, len(responses)))
+        retained, peak = _allocations(func)
+        print(f"{'':<32} retained {retained:7.0f} KiB    peak {peak:7.0f} KiB")
+    payload.orjson = installed
+    print(f"speedup: x{times[0] / times[-1]:.1f}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
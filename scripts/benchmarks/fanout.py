@@ -0,0 +1,127 @@
+"""Per-tick listener fan-out of the coordinators, scoped vs unscoped.
+
+Builds the sensor/select/time entities of a DOSE4, an LED and a RUN device from
+the captured fixtures, registers them on their coordinator with their
+`source_scope` (as `CoordinatorEntity` does) and counts the callbacks run for:
+    - every source changing alone (e.g. only `/wifi` moved)
+    - a typical poll where `/dashboard` and `/wifi` changed
+    - a worst-case poll where every "data" source changed
+
+"unscoped" is the former behaviour: every listener on every changed poll.
+
+Usage:
+    python scripts/benchmarks/fanout.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+from types import SimpleNamespace
+from typing import Any
+
+from common import led_api, load_api
+
+from custom_components.redsea import coordinator, select, sensor, time
+from custom_components.redsea.const import (
+    CONFIG_FLOW_HW_MODEL,
+    CONFIG_FLOW_IP_ADDRESS,
+    DOMAIN,
+)
+from custom_components.redsea.coordinator import (
+    ReefBeatCoordinator,
+    ReefDoseCoordinator,
+    ReefLedCoordinator,
+    ReefRunCoordinator,
+)
+
+DEVICES: list[tuple[str, type[ReefBeatCoordinator], str]] = [
+    ("DOSE4", ReefDoseCoordinator, "RSDOSE4"),
+    ("LED", ReefLedCoordinator, "RSLED160"),
+    ("RUN", ReefRunCoordinator, "RSRUN"),
+]
+
+
+async def _entities(hass: Any, device: ReefBeatCoordinator, entry: Any) -> list[Any]:
+    """Run the platform setups of `device` and return the created entities."""
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = device
+    out: list[Any] = []
+    for platform in (sensor, select, time):
+        await platform.async_setup_entry(
+            hass, entry, lambda ents, *_a: out.extend(ents)
+        )
+    return out
+
+
+def _count(device: ReefBeatCoordinator, calls: list[int], changed: set[str]) -> int:
+    """Return the number of listeners called after a poll changing `changed`."""
+    calls.clear()
+    device._dispatch_scope = frozenset(changed)
+    device.async_update_listeners()
+    return len(calls)
+
+
+async def main() -> None:
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import frame
+
+    # No network access: the APIs are filled from the fixtures.
+    coordinator.async_get_clientsession = lambda _hass: None  # type: ignore[assignment]
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        frame.async_setup(hass)
+        total_scoped = total_unscoped = 0
+        for i, (profile, cls, hw_model) in enumerate(DEVICES):
+            entry = SimpleNamespace(
+                entry_id=f"bench{i}",
+                title=profile,
+                data={
+                    CONFIG_FLOW_IP_ADDRESS: f"192.0.2.{i + 1}",
+                    CONFIG_FLOW_HW_MODEL: hw_model,
+                },
+            )
+            device = cls(hass, entry)  # type: ignore[arg-type]
+            if profile == "LED":
+                device.my_api = led_api()
+            else:
+                load_api(device.my_api, profile)
+            entities = await _entities(hass, device, entry)
+            calls: list[int] = []
+            for entity in entities:
+                device.async_add_listener(
+                    lambda calls=calls: calls.append(1), entity.source_scope
+                )
+
+            sources = [s["name"] for s in device.my_api.data["sources"]]
+            data = {
+                s["name"] for s in device.my_api.data["sources"] if s["type"] == "data"
+            }
+            scoped = sum(1 for e in entities if e.source_scope is not None)
+            print(
+                f"{profile}: {len(entities)} listeners, {scoped} scoped, {len(sources)} sources"
+            )
+
+            singles = [_count(device, calls, {name}) for name in sources]
+            print(
+                f"  one source changed   avg {sum(singles) / len(singles):6.1f}"
+                f"  max {max(singles):4d}  (unscoped {len(entities)})"
+            )
+            poll = _count(device, calls, data)
+            print(f"  data sources changed     {poll:6d}  (unscoped {len(entities)})")
+            typical = _count(device, calls, {"/dashboard", "/wifi"})
+            print(
+                f"  /dashboard + /wifi       {typical:6d}  (unscoped {len(entities)})"
+            )
+            wifi = _count(device, calls, {"/wifi"})
+            print(f"  only /wifi changed       {wifi:6d}  (unscoped {len(entities)})")
+            total_scoped += typical
+            total_unscoped += len(entities)
+        print(
+            f"typical poll, all devices: {total_scoped} callbacks vs {total_unscoped}"
+        )
+        await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
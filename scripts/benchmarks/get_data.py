@@ -0,0 +1,67 @@
+"""Micro-benchmark for `ReefBeatAPI.get_data()`.
+
+Compares, for every scalar field of a fixture device:
+    - `_get_data()`: full JSONPath evaluation on each read
+    - the former eval()-based cache (`eval("self.data[...]")` on each read)
+    - the compiled accessors now used by `get_data()`
+
+Usage:
+    python scripts/benchmarks/get_data.py [PROFILE] [ROUNDS]
+"""
+
+from __future__ import annotations
+
+import sys
+
+from common import bench, load_api, scalar_paths
+
+from custom_components.redsea.reefbeat import ReefDoseAPI, parse
+
+
+def legacy_eval_path(api: ReefDoseAPI, path: str) -> str:
+    """Rebuild the "self.data[...]" string the former eval cache used."""
+    keys: list[str] = []
+    node = parse(path).find(api.data)[0]
+    while node is not None and type(node.path).__name__ != "Root":
+        step = node.path
+        key = step.fields[0] if hasattr(step, "fields") else step.indices[0]
+        keys.append(f"[{key!r}]")
+        node = node.context
+    return "self.data" + "".join(reversed(keys))
+
+
+def main() -> None:
+    profile = sys.argv[1] if len(sys.argv) > 1 else "DOSE4"
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    api = ReefDoseAPI("192.0.2.1", False, None, 4)  # type: ignore[arg-type]
+    load_api(api, profile)
+    paths = scalar_paths(api)
+
+    # Warm the accessor cache and build the legacy eval strings.
+    for path in paths:
+        api.get_data(path, True)
+    eval_db = {path: legacy_eval_path(api, path) for path in paths}
+    print(f"{profile}: {len(paths)} paths, {rounds} rounds")
+
+    def _jsonpath() -> None:
+        for path in paths:
+            api._get_data(path, True)
+
+    def _eval() -> None:
+        scope = {"self": api}
+        for path in paths:
+            eval(eval_db[path], None, scope)
+
+    def _accessor() -> None:
+        for path in paths:
+            api.get_data(path, True)
+
+    slow = bench("_get_data (jsonpath)", _jsonpath, max(1, rounds // 10), len(paths))
+    legacy = bench("eval cache (legacy)", _eval, rounds, len(paths))
+    fast = bench("get_data (accessor)", _accessor, rounds, len(paths))
+    print(f"speedup vs eval: x{legacy / fast:.1f}, vs jsonpath: x{slow / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""End-to-end polling over real sockets, against simulated devices.
+
+Starts virtual devices with `simulator.py` (in process, free ports), then runs
+the initial fetch and ROUNDS polls of each one through its API class, with the
+same per-device session the coordinators use. Devices are polled concurrently,
+like the coordinators of one Home Assistant instance.
+
+Reports, per profile: initial fetch time, poll time (p50/max over the rounds)
+and the request metrics of the APIs (p95 latency, failure rate, retries), then
+the counters of the simulated devices.
+
+The RUN and WAVE fixtures lack some of the endpoints their API polls (the
+simulator answers 404, which the API retries): they are left out of the
+default device set.
+
+Usage:
+    python scripts/benchmarks/http_path.py [PROFILE[:COUNT] ...] [--rounds N] \
+        [fault options of simulator.py]
+
+Example, a flaky LED and two slow dosing pumps:
+    python scripts/benchmarks/http_path.py LED DOSE4:2 --latency 60 \
+        --jitter 40 --drop-rate 0.02 --workers 1 --max-connections 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import defaultdict
+from typing import Any
+
+from simulator import (
+    SimulatedDevice,
+    faults_arguments,
+    faults_from,
+    parse_specs,
+    print_stats,
+    start_devices,
+    stop_devices,
+)
+
+from custom_components.redsea.const import (
+    DEVICE_KEEPALIVE_TIMEOUT,
+    REQUEST_CONCURRENCY,
+)
+from custom_components.redsea.reefbeat import (
+    ReefATOAPI,
+    ReefBeatAPI,
+    ReefDoseAPI,
+    ReefLedAPI,
+    ReefMatAPI,
+    ReefRunAPI,
+    ReefWaveAPI,
+)
+from custom_components.redsea.reefbeat.session import DeviceSession
+
+DEFAULT_DEVICES = ["LED:2", "DOSE4", "DOSE2", "ATO", "MAT"]
+
+
+def _make_api(device: SimulatedDevice, session: Any) -> ReefBeatAPI:
+    """Return the API class of a fixture profile, pointed at `device`."""
+    ip, profile = device.address, device.profile
+    if profile == "LED":
+        return ReefLedAPI(ip, False, session, "RSLED160")
+    if profile.startswith("DOSE"):
+        return ReefDoseAPI(ip, False, session, int(profile[-1]))
+    classes: dict[str, Any] = {
+        "RUN": ReefRunAPI,
+        "WAVE": ReefWaveAPI,
+        "ATO": ReefATOAPI,
+        "MAT": ReefMatAPI,
+    }
+    return classes.get(profile, ReefBeatAPI)(ip, False, session)
+
+
+async def _poll(api: ReefBeatAPI, rounds: int) -> tuple[float, list[float]]:
+    """Return the initial fetch time and the time of each poll (s)."""
+    started = time.perf_counter()
+    await api.get_initial_data()
+    initial = time.perf_counter() - started
+    polls: list[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        try:
+            await api.fetch_data()
+        except Exception:
+            pass
+        polls.append(time.perf_counter() - started)
+    return initial, polls
+
+
+async def _run(args: argparse.Namespace) -> None:
+    devices = await start_devices(
+        parse_specs(args.devices or DEFAULT_DEVICES),
+        faults=faults_from(args),
+        seed=args.seed,
+    )
+    sessions = [
+        DeviceSession(
+            limit=REQUEST_CONCURRENCY, keepalive_timeout=DEVICE_KEEPALIVE_TIMEOUT
+        )
+        for _ in devices
+    ]
+    apis = [_make_api(d, s) for d, s in zip(devices, sessions, strict=True)]
+    try:
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(_poll(api, args.rounds) for api in apis), return_exceptions=True
+        )
+        total = time.perf_counter() - started
+    finally:
+        await asyncio.gather(*(s.close() for s in sessions))
+        await stop_devices(devices)
+
+    by_profile: dict[str, list[tuple[ReefBeatAPI, Any]]] = defaultdict(list)
+    for device, api, result in zip(devices, apis, results, strict=True):
+        by_profile[device.profile].append((api, result))
+
+    print(f"{len(devices)} devices, {args.rounds} polls each, {total:.2f} s total")
+    print(
+        f"{'profile':<8} {'initial ms':>11} {'poll p50':>9} {'poll max':>9}"
+        f" {'req p95':>8} {'fail %':>7} {'retries':>8}"
+    )
+    for profile, runs in by_profile.items():
+        ok = [r for _api, r in runs if not isinstance(r, BaseException)]
+        initial = max((r[0] for r in ok), default=float("nan")) * 1000
+        polls = [p * 1000 for r in ok for p in r[1]] or [float("nan")]
+        p95 = [api.metrics.percentile(95) for api, _r in runs]
+        fail = [api.metrics.failure_rate for api, _r in runs]
+        retries = sum(
+            s["retries"]
+            for api, _r in runs
+            for s in api.metrics.stats()["sources"].values()
+        )
+        print(
+            f"{profile:<8} {initial:>11.1f} {statistics.median(polls):>9.1f}"
+            f" {max(polls):>9.1f} {max((v for v in p95 if v), default=0):>8.1f}"
+            f" {max((v for v in fail if v), default=0):>7.1f} {retries:>8}"
+        )
+        for _api, result in runs:
+            if isinstance(result, BaseException):
+                print(f"{'':<8} initial fetch failed: {result!r}")
+    print()
+    print_stats(devices)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+    parser.add_argument("devices", nargs="*", metavar="PROFILE[:COUNT]")
+    parser.add_argument("--rounds", type=int, default=10)
+    faults_arguments(parser)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Micro-benchmark for the cached `parse()` wrapper.
+
+Compares jsonpath-ng's uncached parser with the process-wide LRU cache for the
+expressions a fixture device uses, and shows the effect on `set_data()` (the
+path taken by every slider/number change).
+
+Usage:
+    python scripts/benchmarks/parse.py [PROFILE] [ROUNDS]
+"""
+
+from __future__ import annotations
+
+import sys
+
+from common import bench, load_api, scalar_paths
+from jsonpath_ng.ext.parser import parse as jsonpath_parse
+
+from custom_components.redsea.reefbeat import ReefDoseAPI, parse, parse_cache_info
+
+
+def main() -> None:
+    profile = sys.argv[1] if len(sys.argv) > 1 else "DOSE4"
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    api = ReefDoseAPI("192.0.2.1", False, None, 4)  # type: ignore[arg-type]
+    load_api(api, profile)
+    paths = scalar_paths(api)
+    print(f"{profile}: {len(paths)} expressions, {rounds} rounds")
+
+    def _uncached() -> None:
+        for path in paths:
+            jsonpath_parse(path)
+
+    def _cached() -> None:
+        for path in paths:
+            parse(path)
+
+    def _set_data() -> None:
+        for path in paths:
+            api.set_data(path, api.get_data(path, True))
+
+    slow = bench("jsonpath_ng.ext.parse", _uncached, rounds, len(paths))
+    fast = bench("parse (LRU cache)", _cached, rounds, len(paths))
+    bench("set_data (cached parse)", _set_data, rounds, len(paths))
+    print(f"parse speedup: x{slow / fast:.0f}, cache: {parse_cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Micro-benchmark for `ReefBeatAPI.set_data()` on entity write paths.
+
+Replays the writes done by number.py (dose head manual/calibration volumes, LED
+acclimation/moon settings) and light.py (LED manual white/blue/moon) and
+compares:
+    - a full jsonpath-ng `update()` per write (the former implementation)
+    - the in-place write through the compiled accessor
+
+Usage:
+    python scripts/benchmarks/set_data.py [ROUNDS]
+"""
+
+from __future__ import annotations
+
+import sys
+
+from common import bench, led_api, load_api
+
+from custom_components.redsea.const import (
+    LED_ACCLIMATION_DURATION_INTERNAL_NAME,
+    LED_BLUE_INTERNAL_NAME,
+    LED_MOON_DAY_INTERNAL_NAME,
+    LED_MOON_INTERNAL_NAME,
+    LED_WHITE_INTERNAL_NAME,
+)
+from custom_components.redsea.reefbeat import ReefDoseAPI, parse
+
+LED_PATHS = [
+    LED_WHITE_INTERNAL_NAME,
+    LED_BLUE_INTERNAL_NAME,
+    LED_MOON_INTERNAL_NAME,
+    LED_MOON_DAY_INTERNAL_NAME,
+    LED_ACCLIMATION_DURATION_INTERNAL_NAME,
+    "$.local.manual_trick.intensity",
+]
+DOSE_PATHS = [
+    f"$.local.head.{head}.{field}"
+    for head in range(1, 5)
+    for field in ("manual_dose", "calibration_dose", "initial_volume")
+] + [
+    "$.sources[?(@.name=='/device-settings')].data.stock_alert_days",
+    "$.sources[?(@.name=='/head/2/settings')].data.container_volume",
+]
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    writes = 50
+
+    led = led_api()
+    dose = load_api(ReefDoseAPI("192.0.2.1", False, None, 4), "DOSE4")  # type: ignore[arg-type]
+    cases = [(led, path) for path in LED_PATHS] + [(dose, path) for path in DOSE_PATHS]
+    ops = len(cases) * writes
+    print(f"{len(cases)} write paths x {writes} writes, {rounds} rounds")
+
+    def _jsonpath_update() -> None:
+        for api, path in cases:
+            for value in range(writes):
+                parse(path).update(api.data, value)
+
+    def _set_data() -> None:
+        for api, path in cases:
+            for value in range(writes):
+                api.set_data(path, value)
+
+    slow = bench("jsonpath update()", _jsonpath_update, rounds, ops)
+    fast = bench("set_data (in place)", _set_data, rounds, ops)
+    print(f"speedup: x{slow / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
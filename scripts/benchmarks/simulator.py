@@ -0,0 +1,334 @@
+"""Local ReefBeat device simulator serving the captured fixtures over HTTP.
+
+Every fixture profile of `tests/fixtures/devices/<PROFILE>` (LED, DOSE2,
+DOSE4, RUN, WAVE, ATO, MAT, CLOUD) can be served by any number of virtual
+devices, each on its own port, so the real HTTP path (sessions, limiter,
+retries, breaker) can be exercised end to end without hardware:
+
+- `GET <path>` returns `<PROFILE>/<path>/data` (`/` is `<PROFILE>/data`),
+  404 when the fixture has no such endpoint,
+- `POST`/`PUT <path>` stores the JSON body (merged into an object payload)
+  so later GETs see it, `DELETE` is accepted; both answer `{"success": true}`.
+
+Faults, common to all devices of a run:
+
+- `latency` + uniform `jitter` (ms) before each response,
+- `error_rate`: share of requests answered with HTTP 500,
+- `drop_rate`: share of requests whose connection is closed without answer,
+- `workers`: requests processed at once (the ESP HTTP servers handle one at a
+  time), others wait for a worker,
+- `max_connections`: requests in flight (processed or waiting) above which new
+  ones are dropped, as the ESP socket pool overflowing does.
+
+Devices keep their own copy of the payloads: writes on one do not show on
+another. Counters of each device are printed on exit.
+
+Usage:
+    python scripts/benchmarks/simulator.py LED:3 DOSE4 WAVE:2 \
+        [--host 127.0.0.1] [--base-port 8100] [--latency 40] [--jitter 20] \
+        [--error-rate 0.01] [--drop-rate 0.01] [--workers 1] \
+        [--max-connections 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+from dataclasses import dataclass, field
+
+from aiohttp import web
+from common import devices_dir
+
+_JSON = "application/json"
+
+
+@dataclass(frozen=True)
+class Faults:
+    """Latency and failures injected by the simulated devices."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    drop_rate: float = 0.0
+    workers: int = 0
+    max_connections: int = 0
+
+
+@dataclass
+class DeviceStats:
+    """Counters of one simulated device."""
+
+    requests: int = 0
+    errors: int = 0
+    drops: int = 0
+    overflows: int = 0
+    not_found: int = 0
+    writes: int = 0
+    peak_in_flight: int = 0
+    in_flight: int = field(default=0, repr=False)
+
+
+def load_profile(profile: str) -> dict[str, bytes]:
+    """Return the raw payload of every endpoint of a fixture profile, by path."""
+    root = os.path.join(devices_dir, profile)
+    if not os.path.isdir(root):
+        raise ValueError(f"Unknown fixture profile: {profile}")
+    out: dict[str, bytes] = {}
+    for path, _dirs, files in os.walk(root):
+        if "data" not in files:
+            continue
+        rel = os.path.relpath(path, root).replace(os.sep, "/")
+        with open(os.path.join(path, "data"), "rb") as f:
+            out["/" if rel == "." else f"/{rel}"] = f.read()
+    return out
+
+
+class SimulatedDevice:
+    """One virtual device serving a fixture profile on its own port."""
+
+    def __init__(
+        self,
+        profile: str,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: Faults | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Create a device (not listening until `start()`).
+
+        Args:
+            profile: Fixture profile served (`LED`, `DOSE4`...).
+            host: Address to listen on.
+            port: Port to listen on, 0 for any free one.
+            faults: Latency and failures to inject.
+            seed: Seed of the fault draws, for reproducible runs.
+        """
+        self.profile = profile
+        self.host = host
+        self.port = port
+        self.faults = faults or Faults()
+        self.stats = DeviceStats()
+        self._payloads = load_profile(profile)
+        self._random = random.Random(seed)
+        self._workers = (
+            asyncio.Semaphore(self.faults.workers) if self.faults.workers else None
+        )
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def address(self) -> str:
+        """Return `host:port`, as given to the API classes as their IP."""
+        return f"{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        """Start listening (binds a free port when `port` is 0)."""
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if not self.port:
+            server = getattr(site, "_server", None)
+            self.port = server.sockets[0].getsockname()[1] if server else 0
+
+    async def stop(self) -> None:
+        """Stop listening and close the open connections."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        stats = self.stats
+        stats.requests += 1
+        if (
+            self.faults.max_connections
+            and stats.in_flight >= self.faults.max_connections
+        ):
+            stats.overflows += 1
+            return self._drop(request)
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            if self._workers is None:
+                return await self._respond(request)
+            async with self._workers:
+                return await self._respond(request)
+        finally:
+            stats.in_flight -= 1
+
+    async def _respond(self, request: web.Request) -> web.StreamResponse:
+        faults = self.faults
+        delay = faults.latency + self._random.uniform(0, faults.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        draw = self._random.random()
+        if draw < faults.drop_rate:
+            self.stats.drops += 1
+            return self._drop(request)
+        if draw < faults.drop_rate + faults.error_rate:
+            self.stats.errors += 1
+            return web.Response(status=500, text="Internal Server Error")
+
+        path = request.path.rstrip("/") or "/"
+        if request.method == "GET":
+            raw = self._payloads.get(path)
+            if raw is None:
+                self.stats.not_found += 1
+                return web.Response(status=404, text="Not Found")
+            ctype = "text/xml" if path.endswith(".xml") else _JSON
+            return web.Response(body=raw, content_type=ctype)
+
+        self.stats.writes += 1
+        if request.method in ("POST", "PUT"):
+            self._store(path, await request.read())
+        return web.json_response({"success": True})
+
+    def _store(self, path: str, body: bytes) -> None:
+        """Keep a written payload, merged into the current one if both are objects."""
+        try:
+            value = json.loads(body) if body else None
+            current = json.loads(self._payloads.get(path, b"null"))
+        except ValueError:
+            return
+        if isinstance(value, dict) and isinstance(current, dict):
+            value = {**current, **value}
+        if value is not None:
+            self._payloads[path] = json.dumps(value).encode()
+
+    @staticmethod
+    def _drop(request: web.Request) -> web.StreamResponse:
+        """Close the connection without answering."""
+        if request.transport is not None:
+            request.transport.close()
+        raise asyncio.CancelledError
+
+
+async def start_devices(
+    specs: list[tuple[str, int]],
+    *,
+    host: str = "127.0.0.1",
+    base_port: int = 0,
+    faults: Faults | None = None,
+    seed: int | None = None,
+) -> list[SimulatedDevice]:
+    """Start `count` devices for each `(profile, count)` of `specs`.
+
+    Ports are consecutive from `base_port`, or picked by the OS when it is 0.
+    """
+    devices: list[SimulatedDevice] = []
+    for profile, count in specs:
+        for _ in range(count):
+            port = base_port + len(devices) if base_port else 0
+            device_seed = None if seed is None else seed + len(devices)
+            devices.append(
+                SimulatedDevice(
+                    profile, host=host, port=port, faults=faults, seed=device_seed
+                )
+            )
+    try:
+        for device in devices:
+            await device.start()
+    except BaseException:
+        await stop_devices(devices)
+        raise
+    return devices
+
+
+async def stop_devices(devices: list[SimulatedDevice]) -> None:
+    """Stop every device of `devices`."""
+    await asyncio.gather(*(device.stop() for device in devices))
+
+
+def parse_specs(values: list[str]) -> list[tuple[str, int]]:
+    """Parse `PROFILE[:COUNT]` arguments."""
+    specs: list[tuple[str, int]] = []
+    for value in values:
+        profile, _sep, count = value.partition(":")
+        specs.append((profile.upper(), int(count) if count else 1))
+    return specs
+
+
+def faults_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the fault options to `parser` (see `faults_from()`)."""
+    group = parser.add_argument_group("faults")
+    group.add_argument("--latency", type=float, default=0.0, help="ms per response")
+    group.add_argument("--jitter", type=float, default=0.0, help="extra ms, uniform")
+    group.add_argument("--error-rate", type=float, default=0.0, help="HTTP 500 share")
+    group.add_argument("--drop-rate", type=float, default=0.0, help="dropped share")
+    group.add_argument(
+        "--workers", type=int, default=0, help="requests processed at once (0: any)"
+    )
+    group.add_argument(
+        "--max-connections",
+        type=int,
+        default=0,
+        help="requests in flight above which new ones are dropped (0: no limit)",
+    )
+    group.add_argument("--seed", type=int, default=None, help="fault draws seed")
+
+
+def faults_from(args: argparse.Namespace) -> Faults:
+    """Return the faults given on the command line."""
+    return Faults(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        workers=args.workers,
+        max_connections=args.max_connections,
+    )
+
+
+def print_stats(devices: list[SimulatedDevice]) -> None:
+    """Print the counters of every device."""
+    print(
+        f"{'device':<16} {'requests':>9} {'500':>6} {'drops':>6} {'overflow':>9}"
+        f" {'404':>6} {'writes':>7} {'peak':>5}"
+    )
+    for device in devices:
+        s = device.stats
+        print(
+            f"{device.profile + '@' + str(device.port):<16} {s.requests:>9}"
+            f" {s.errors:>6} {s.drops:>6} {s.overflows:>9} {s.not_found:>6}"
+            f" {s.writes:>7} {s.peak_in_flight:>5}"
+        )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    devices = await start_devices(
+        parse_specs(args.devices),
+        host=args.host,
+        base_port=args.base_port,
+        faults=faults_from(args),
+        seed=args.seed,
+    )
+    for device in devices:
+        print(f"{device.profile:<6} http://{device.address}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        print_stats(devices)
+        await stop_devices(devices)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+    parser.add_argument(
+        "devices", nargs="+", metavar="PROFILE[:COUNT]", help="e.g. LED:3 DOSE4"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=8100)
+    faults_arguments(parser)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
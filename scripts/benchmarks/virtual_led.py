@@ -0,0 +1,152 @@
+"""Entity refresh of a virtual LED linked to 4 LEDs, memoized vs recomputed.
+
+Builds 4 LED coordinators from the captured fixtures, a virtual LED linked to
+them, and the light/number/sensor entities of the virtual LED. Entities
+recompute their state as on a coordinator update
+(`_handle_coordinator_update()`, state write excluded).
+
+Compares:
+    - the former refresh: every entity, each read re-aggregating the linked
+      LEDs (one `get_data()` per linked LED, more for kelvin paths)
+    - a full generation (fetch or write): memo dropped, every entity
+    - a poll of one linked LED that changed a single source: only the entities
+      and memoized values of that source are refreshed
+
+Usage:
+    python scripts/benchmarks/virtual_led.py [ROUNDS]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+from types import SimpleNamespace
+from typing import Any
+
+from common import bench, led_api
+
+from custom_components.redsea import coordinator, light, number, sensor
+from custom_components.redsea.const import (
+    CONFIG_FLOW_HW_MODEL,
+    CONFIG_FLOW_IP_ADDRESS,
+    DOMAIN,
+    LINKED_LED,
+)
+from custom_components.redsea.coordinator import (
+    ReefLedCoordinator,
+    ReefVirtualLedCoordinator,
+)
+
+LINKED = 4
+
+
+async def _entities(hass: Any, device: Any, entry: Any) -> list[Any]:
+    """Run the platform setups of `device` and return the created entities."""
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = device
+    out: list[Any] = []
+    for platform in (light, number, sensor):
+        await platform.async_setup_entry(
+            hass, entry, lambda ents, *_a, **_kw: out.extend(ents)
+        )
+    return out
+
+
+def _entry(entry_id: str, ip: str, **data: Any) -> Any:
+    return SimpleNamespace(
+        entry_id=entry_id,
+        title=entry_id,
+        data={CONFIG_FLOW_IP_ADDRESS: ip, CONFIG_FLOW_HW_MODEL: "RSLED160", **data},
+    )
+
+
+async def main() -> None:
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import frame
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    # No network access: the APIs are filled from the fixtures.
+    coordinator.async_get_clientsession = lambda _hass: None  # type: ignore[assignment]
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        frame.async_setup(hass)
+        linked: list[str] = []
+        led_coordinators: list[ReefLedCoordinator] = []
+        for i in range(LINKED):
+            entry = _entry(f"led{i}", f"192.0.2.{i + 1}")
+            led = ReefLedCoordinator(hass, entry)  # type: ignore[arg-type]
+            led.my_api = led_api(f"192.0.2.{i + 1}")
+            hass.data.setdefault(DOMAIN, {})[entry.entry_id] = led
+            led_coordinators.append(led)
+            linked.append(f"{i} LED{i}-RSLED160 ({entry.entry_id})")
+
+        entry = _entry("virtual", "192.0.2.100", **{LINKED_LED: linked})
+        vled = ReefVirtualLedCoordinator(hass, entry)  # type: ignore[arg-type]
+        vled._link_leds()
+        entities = await _entities(hass, vled, entry)
+        for entity in entities:
+            # Entity properties do not read the device: the update is the work.
+            entity.hass = hass
+            entity.async_write_ha_state = lambda: None
+
+        # Entities listen with their source scope, as `CoordinatorEntity` does.
+        woken: list[int] = []
+        for entity in entities:
+
+            def _wake(e: Any = entity) -> None:
+                woken.append(1)
+                e._handle_coordinator_update()
+
+            vled.async_add_listener(_wake, getattr(entity, "source_scope", None))
+        polled = led_coordinators[0]
+        memoized = vled.get_data
+        aggregate = vled._aggregate_value
+        computed: list[str] = []
+
+        def _counting(name: str, is_None_possible: bool = False) -> Any:
+            computed.append(name)
+            return aggregate(name, is_None_possible)
+
+        vled._aggregate_value = _counting  # type: ignore[method-assign]
+
+        def _former() -> None:
+            vled.async_update_listeners()
+
+        def _full() -> None:
+            vled._invalidate()
+            vled.async_update_listeners()
+
+        def _poll(changed: str) -> Any:
+            def _run() -> None:
+                polled._dispatch_scope = frozenset({changed})
+                polled.async_update_listeners()
+
+            return _run
+
+        def _count(func: Any) -> str:
+            woken.clear()
+            computed.clear()
+            func()
+            return f"{len(woken)} entities woken, {len(computed)} values computed"
+
+        print(f"{LINKED} linked LEDs, {len(entities)} entities")
+        vled.get_data = _counting  # type: ignore[method-assign]
+        counts = _count(_former)
+        former = bench("recomputed, every entity", _former, rounds, 1)
+        print(f"{'':<32} {counts}")
+        vled.get_data = memoized  # type: ignore[method-assign]
+        counts = _count(_full)
+        bench("memoized, full generation", _full, rounds, 1)
+        print(f"{'':<32} {counts}")
+        for changed in ("/manual", "/acclimation", "/wifi"):
+            counts = _count(_poll(changed))
+            best = bench(f"memoized, {changed} poll", _poll(changed), rounds, 1)
+            print(f"{'':<32} {counts}, x{former / best:.1f}")
+
+        vled._unlink_leds()
+        await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
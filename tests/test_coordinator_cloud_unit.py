@@ -54,6 +54,9 @@ class _FakeCloudAPI:
         self.fetched += 1
         return self.data
 
+    def add_source(self, name: str, source_type: str, data: Any = "") -> None:
+        self.data["sources"].append({"name": name, "type": source_type, "data": data})
+
     async def http_send(self, action: str, payload: Any, method: str = "post") -> Any:
         self.sent.append((action, payload, method))
         return {"ok": True}
@@ -86,6 +86,9 @@ class _FakeAPI:
     async def fetch_data(self) -> dict[str, Any] | None:
         return self.fetch_data_result
 
+    def pop_changed_sources(self) -> set[str]:
+        return set()
+
     def get_data(self, name: str, is_None_possible: bool = False) -> Any:
         return self.get_data_map.get(name)
 
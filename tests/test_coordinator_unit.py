@@ -2,24 +2,40 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass, field
+from datetime import timedelta
 from typing import Any, cast
+from unittest.mock import AsyncMock
 
 import pytest
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_CLOSE,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
+from custom_components.redsea import async_remove_entry
 from custom_components.redsea.const import (
     CONFIG_FLOW_CONFIG_TYPE,
     CONFIG_FLOW_HW_MODEL,
     CONFIG_FLOW_IP_ADDRESS,
     DOMAIN,
+    SNAPSHOT_SAVE_DELAY,
 )
 from custom_components.redsea.coordinator import (
     ReefBeatCloudLinkedCoordinator,
     ReefBeatCoordinator,
+    ReefLedCoordinator,
 )
+from custom_components.redsea.entity import ReefBeatEntity
+from custom_components.redsea.reefbeat import DeviceOfflineError, ReefBeatAPI
+from custom_components.redsea.reefbeat.session import DeviceSession
 
 
 @dataclass
@@ -33,12 +49,16 @@ class _FakeAPI:
     _timeout: int = 1
     quick_refresh: str | None = None
     data: dict[str, Any] = field(default_factory=dict)
+    changed: set[str] = field(default_factory=lambda: {"/dashboard"})
 
     async def fetch_data(self) -> dict[str, Any] | None:
         if self.fetch_data_exc is not None:
             raise self.fetch_data_exc
         return self.fetch_data_result
 
+    def pop_changed_sources(self) -> set[str]:
+        return set(self.changed)
+
     async def fetch_config(self, config_path: str | None = None) -> None:
         return None
 
@@ -110,6 +130,21 @@ async def test_coordinator_async_update_data_timeout_wraps(hass: HomeAssistant)
         await coordinator._async_update_data()
 
 
+@pytest.mark.asyncio
+async def test_coordinator_async_update_data_offline_wraps(hass: HomeAssistant) -> None:
+    entry = _make_entry(title="Test", ip="192.0.2.10", hw_model="RSLED50")
+    coordinator = ReefBeatCoordinator(hass, cast(Any, entry))
+    assert coordinator.offline is False
+
+    api = _FakeAPI(fetch_data_exc=DeviceOfflineError("device offline"))
+    coordinator.my_api = cast(Any, api)
+    cast(Any, api).offline = True
+
+    with pytest.raises(UpdateFailed, match=r"\(192\.0\.2\.10\): device offline"):
+        await coordinator._async_update_data()
+    assert coordinator.offline is True
+
+
 @pytest.mark.asyncio
 async def test_coordinator_async_update_data_generic_exception_wraps(
     hass: HomeAssistant,
@@ -123,6 +158,277 @@ async def test_coordinator_async_update_data_generic_exception_wraps(
         await coordinator._async_update_data()
 
 
+@pytest.mark.asyncio
+async def test_refresh_skips_listeners_when_no_source_changed(
+    hass: HomeAssistant,
+) -> None:
+    entry = _make_entry(title="Test", ip="192.0.2.10", hw_model="RSDOSE4")
+    coordinator = ReefBeatCoordinator(hass, cast(Any, entry))
+    api = _FakeAPI(fetch_data_result={"sources": []})
+    coordinator.my_api = cast(Any, api)
+
+    calls: list[int] = []
+    unsub = coordinator.async_add_listener(lambda: calls.append(1))
+
+    await coordinator.async_refresh()
+    assert coordinator.changed_sources == {"/dashboard"}
+    assert len(calls) == 1
+
+    api.changed = set()
+    await coordinator.async_refresh()
+    assert len(calls) == 1
+
+    # Explicit notifications are never skipped.
+    coordinator.async_update_listeners()
+    assert len(calls) == 2
+
+    # After a failed poll, an unchanged one must still notify (availability).
+    api.fetch_data_exc = ValueError("boom")
+    await coordinator.async_refresh()
+    assert len(calls) == 3
+    api.fetch_data_exc = None
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success is True
+    assert len(calls) == 4
+    unsub()
+
+
+@pytest.mark.asyncio
+async def test_refresh_dispatches_only_to_listeners_of_changed_sources(
+    hass: HomeAssistant,
+) -> None:
+    entry = _make_entry(title="Test", ip="192.0.2.10", hw_model="RSDOSE4")
+    coordinator = ReefBeatCoordinator(hass, cast(Any, entry))
+    api = _FakeAPI(fetch_data_result={"sources": []})
+    coordinator.my_api = cast(Any, api)
+
+    calls: list[str] = []
+    unsubs = [
+        coordinator.async_add_listener(lambda: calls.append("all")),
+        coordinator.async_add_listener(
+            lambda: calls.append("head"), frozenset({"/head/1/settings"})
+        ),
+        coordinator.async_add_listener(
+            lambda: calls.append("wifi"), frozenset({"/wifi", "/dashboard"})
+        ),
+    ]
+
+    await coordinator.async_refresh()
+    assert sorted(calls) == ["all", "wifi"]
+
+    calls.clear()
+    api.changed = {"/wifi"}
+    await coordinator.async_refresh()
+    assert sorted(calls) == ["all", "wifi"]
+
+    calls.clear()
+    api.changed = {"/head/1/settings"}
+    await coordinator.async_refresh()
+    assert sorted(calls) == ["all", "head"]
+
+    # Explicit notifications reach every listener.
+    calls.clear()
+    coordinator.async_update_listeners()
+    assert sorted(calls) == ["all", "head", "wifi"]
+
+    # Removed listeners leave the scoped fan-out too.
+    unsubs.pop(2)()
+    calls.clear()
+    api.changed = {"/wifi"}
+    await coordinator.async_refresh()
+    assert calls == ["all"]
+
+    for unsub in unsubs:
+        unsub()
+    assert not coordinator._scoped_listeners
+
+
+@pytest.mark.asyncio
+async def test_coordinator_owns_a_device_session_per_model(hass: HomeAssistant) -> None:
+    wave = ReefBeatCoordinator(
+        hass, cast(Any, _make_entry(title="W", ip="192.0.2.11", hw_model="RSWAVE45"))
+    )
+    dose = ReefBeatCoordinator(
+        hass, cast(Any, _make_entry(title="D", ip="192.0.2.12", hw_model="RSDOSE4"))
+    )
+    assert isinstance(wave._session, DeviceSession)
+    assert isinstance(dose._session, DeviceSession)
+    assert (wave._session._limit, wave._session._keepalive_timeout) == (2, 2.0)
+    assert (dose._session._limit, dose._session._keepalive_timeout) == (4, 5.0)
+    assert dose.connection_stats == {
+        "requests": 0,
+        "connections": 0,
+        "reused": 0,
+        "stale_retries": 0,
+        "reuse_rate": None,
+    }
+
+    await dose.async_shutdown()
+    assert dose._unsub_close is None and dose._session.closed
+
+
+@pytest.mark.asyncio
+async def test_device_session_is_closed_with_hass_or_on_failed_setup(
+    hass: HomeAssistant,
+) -> None:
+    entry = _make_entry(title="D", ip="192.0.2.12", hw_model="RSDOSE4")
+    entry.add_to_hass(hass)
+    coordinator = ReefBeatCoordinator(hass, cast(Any, entry))
+    assert coordinator._unsub_close is None
+
+    coordinator.my_api.get_initial_data = AsyncMock(  # type: ignore[method-assign]
+        side_effect=OSError("unreachable")
+    )
+    with pytest.raises(OSError):
+        await coordinator.async_setup()
+    assert coordinator._unsub_close is None
+    assert coordinator._session.closed
+
+    coordinator = ReefBeatCoordinator(hass, cast(Any, entry))
+    coordinator.my_api.get_initial_data = AsyncMock()  # type: ignore[method-assign]
+    await coordinator.async_setup()
+    assert coordinator._unsub_close is not None
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert coordinator._unsub_close is None
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_starts_from_snapshot_then_fetches_in_background(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    entry = _make_entry(title="D", ip="192.0.2.12", hw_model="RSDOSE4")
+    entry.add_to_hass(hass)
+    hass_storage[f"redsea_snapshot_{entry.entry_id}"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"redsea_snapshot_{entry.entry_id}",
+        "data": {
+            "hw_model": "RSDOSE4",
+            "saved_at": 0,
+            "state": {
+                "sources": [
+                    {"name": "/dashboard", "type": "data", "data": {"mode": "auto"}}
+                ]
+            },
+        },
+    }
+    coordinator = ReefBeatCoordinator(hass, cast(Any, entry))
+    device_answers = asyncio.Event()
+    initial_fetches: list[bool] = []
+
+    async def _get_initial_data() -> dict[str, Any]:
+        initial_fetches.append(True)
+        await device_answers.wait()
+        return coordinator.my_api.data
+
+    coordinator.my_api.get_initial_data = _get_initial_data  # type: ignore[method-assign]
+
+    # Setup does not wait for the device: entities start from the snapshot.
+    await coordinator.async_setup()
+    assert coordinator.stale
+    assert (
+        coordinator.get_data("$.sources[?(@.name=='/dashboard')].data.mode") == "auto"
+    )
+    entity = ReefBeatEntity(coordinator)
+    entity.hass = hass
+    entity.entity_id = "sensor.redsea_test"
+    entity.async_write_ha_state()
+    state = hass.states.get("sensor.redsea_test")
+    assert state is not None and state.attributes.get("stale") is True
+
+    device_answers.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert initial_fetches == [True]
+    assert not coordinator.stale and coordinator.last_update_success
+    # The attributes cached while stale are computed again.
+    entity.async_write_ha_state()
+    state = hass.states.get("sensor.redsea_test")
+    assert state is not None and "stale" not in state.attributes
+    assert entity.extra_state_attributes is None
+    assert coordinator._snapshot is not None and coordinator._snapshot._save_scheduled
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_removed_entry_leaves_no_snapshot_behind(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    entry = _make_entry(title="D", ip="192.0.2.12", hw_model="RSDOSE4")
+    entry.add_to_hass(hass)
+    coordinator = ReefBeatCoordinator(hass, cast(Any, entry))
+    coordinator.my_api.get_initial_data = AsyncMock()  # type: ignore[method-assign]
+    monkeypatch.setattr(ReefBeatAPI, "layout", property(lambda _s: {"fw": "1.0"}))
+
+    # Saves pending once set up: snapshot in SNAPSHOT_SAVE_DELAY, layout now.
+    await coordinator.async_setup()
+    snapshot_key = f"redsea_snapshot_{entry.entry_id}"
+    layout_key = f"redsea_layout_{entry.entry_id}"
+    assert coordinator._snapshot is not None and coordinator._snapshot._save_scheduled
+
+    # Unload, then remove (as Home Assistant does).
+    await coordinator.async_shutdown()
+    assert snapshot_key in hass_storage and layout_key in hass_storage
+    await async_remove_entry(hass, cast(Any, entry))
+    assert snapshot_key not in hass_storage and layout_key not in hass_storage
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1)
+    )
+    await hass.async_block_till_done()
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    assert snapshot_key not in hass_storage and layout_key not in hass_storage
+
+
+@pytest.mark.asyncio
+async def test_led_coordinator_uses_and_saves_cached_layout(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    entry = _make_entry(title="L", ip="192.0.2.13", hw_model="RSLED90")
+    entry.add_to_hass(hass)
+    key = f"redsea_layout_{entry.entry_id}"
+    hass_storage[key] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": key,
+        "data": {
+            "hw_model": "RSLED90",
+            "layout": {"rsled90": True, "preset_name_is_single": True},
+        },
+    }
+    coordinator = ReefLedCoordinator(hass, cast(Any, entry))
+
+    async def _no_probe(path: str) -> int:
+        raise AssertionError(f"probed {path}")
+
+    async def _fake_initial(self: ReefBeatAPI) -> dict[str, Any]:
+        self.sources.get("/firmware").update(data={"version": "1.4"})  # type: ignore[union-attr]
+        return self.data
+
+    monkeypatch.setattr(coordinator.my_api, "_probe_path", _no_probe)
+    monkeypatch.setattr(ReefBeatAPI, "get_initial_data", _fake_initial)
+
+    await coordinator.async_setup()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    assert "/" in coordinator.my_api.sources
+    assert hass_storage[key]["data"]["layout"] == {
+        "rsled90": True,
+        "preset_name_is_single": True,
+        "firmware": "1.4",
+    }
+    assert coordinator._layouts is not None
+    await coordinator.async_shutdown()
+
+
 @pytest.mark.asyncio
 async def test_coordinator_serial_property_returns_title(hass: HomeAssistant) -> None:
     entry = _make_entry(title="MyDevice", ip="192.0.2.10", hw_model="RSLED50")
@@ -340,6 +646,142 @@ async def test_async_request_refresh_with_config_fetches_config(
     assert called == 1
 
 
+@pytest.mark.asyncio
+async def test_push_values_merges_pushes_of_the_same_source(
+    hass: HomeAssistant,
+) -> None:
+    entry = _make_entry(title="Test", ip="192.0.2.10", hw_model="RSLED50")
+    coordinator = ReefBeatCoordinator(hass, cast(Any, entry))
+
+    class _RecordingAPI(_FakeAPI):
+        def __init__(self) -> None:
+            super().__init__()
+            self.pushed: list[tuple[str, str, Any]] = []
+
+        async def push_values(
+            self, source: str, method: str = "put", *args: Any
+        ) -> None:
+            self.pushed.append((source, method, self.get_data_map.get(source)))
+
+    api = _RecordingAPI()
+    coordinator.my_api = cast(Any, api)
+
+    async def _drag(value: int) -> None:
+        coordinator.set_data("/configuration", value)
+        await coordinator.push_values("/configuration", "put")
+
+    await asyncio.gather(
+        *(_drag(v) for v in range(5)), coordinator.push_values("/mode", "post")
+    )
+
+    # One request per source, carrying the last written value.
+    assert sorted(api.pushed) == [("/configuration", "put", 4), ("/mode", "post", None)]
+    assert coordinator._writes.stats == {"requested": 6, "sent": 2, "superseded": 4}
+
+
+@pytest.mark.asyncio
+async def test_joined_push_is_sent_when_the_first_caller_is_cancelled(
+    hass: HomeAssistant,
+) -> None:
+    entry = _make_entry(title="Test", ip="192.0.2.10", hw_model="RSLED50")
+    coordinator = ReefBeatCoordinator(hass, cast(Any, entry))
+
+    class _RecordingAPI(_FakeAPI):
+        def __init__(self) -> None:
+            super().__init__()
+            self.pushed: list[Any] = []
+
+        async def push_values(
+            self, source: str, method: str = "put", *args: Any
+        ) -> None:
+            self.pushed.append(self.get_data_map.get(source))
+
+    api = _RecordingAPI()
+    coordinator.my_api = cast(Any, api)
+
+    coordinator.set_data("/configuration", 1)
+    first = asyncio.ensure_future(coordinator.push_values("/configuration", "put"))
+    await _settle()
+    coordinator.set_data("/configuration", 2)
+    joined = asyncio.ensure_future(coordinator.push_values("/configuration", "put"))
+    await _settle()
+    first.cancel()
+
+    await joined
+    assert first.cancelled()
+    assert api.pushed == [2]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refresh_requests_share_one_targeted_refresh(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    entry = _make_entry(title="Test", ip="192.0.2.10", hw_model="RSLED50")
+    coordinator = ReefBeatCoordinator(hass, cast(Any, entry))
+    api = _FakeAPI()
+    coordinator.my_api = cast(Any, api)
+
+    release = asyncio.Event()
+
+    async def _fake_sleep(_: float) -> None:
+        await release.wait()
+
+    refreshed: list[Any] = []
+
+    async def _fake_super_refresh(self: DataUpdateCoordinator[Any]) -> None:
+        # fetch_data() consumes quick_refresh.
+        refreshed.append(api.quick_refresh)
+        api.quick_refresh = None
+
+    monkeypatch.setattr(asyncio, "sleep", _fake_sleep, raising=True)
+    monkeypatch.setattr(
+        DataUpdateCoordinator, "async_request_refresh", _fake_super_refresh
+    )
+
+    calls = [
+        asyncio.ensure_future(coordinator.async_request_refresh(source, wait=2))
+        for source in ("/manual", "/mode", "/manual")
+    ]
+    await _settle()
+    release.set()
+    await asyncio.gather(*calls)
+
+    assert refreshed == [{"/manual", "/mode"}]
+
+    # A full refresh request wins over targeted ones.
+    release.clear()
+    calls = [
+        asyncio.ensure_future(coordinator.async_request_refresh("/manual", wait=2)),
+        asyncio.ensure_future(coordinator.async_request_refresh(wait=2)),
+    ]
+    await _settle()
+    release.set()
+    await asyncio.gather(*calls)
+    assert refreshed[-1] is None
+
+    # A cancelled caller does not drop the refresh the others joined.
+    release.clear()
+    first = asyncio.ensure_future(coordinator.async_request_refresh("/mode", wait=2))
+    joined = asyncio.ensure_future(coordinator.async_request_refresh("/manual", wait=2))
+    await _settle()
+    first.cancel()
+    await _settle()
+    release.set()
+    await joined
+    assert first.cancelled()
+    assert refreshed[-1] == {"/manual", "/mode"}
+
+
+async def _settle() -> None:
+    """Let freshly scheduled tasks run up to their first suspension point."""
+    loop = asyncio.get_running_loop()
+    for _ in range(3):
+        tick = loop.create_future()
+        loop.call_soon(tick.set_result, None)
+        await tick
+
+
 @pytest.mark.asyncio
 async def test_clean_message_updates_listeners(hass: HomeAssistant) -> None:
     entry = _make_entry(title="Test", ip="192.0.2.10", hw_model="RSLED50")
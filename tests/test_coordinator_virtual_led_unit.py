@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass, field
 from typing import Any, cast
 
 import pytest
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
@@ -156,6 +158,8 @@ async def test_virtual_led_only_g1_flag_detects_g2(hass: HomeAssistant) -> None:
 
     vled = coord.ReefVirtualLedCoordinator(hass, cast(Any, entry))
     assert vled.only_g1 is False
+    # Requests go through the linked LEDs: no connection pool of its own.
+    assert vled.connection_stats is None
 
 
 def test_virtual_led_init_running_calls_link_leds(hass: HomeAssistant) -> None:
@@ -224,6 +228,54 @@ def test_virtual_led_link_leds_empty_and_single_linked(hass: HomeAssistant) -> N
     assert len(v1._linked) == 1  # type: ignore[attr-defined]
 
 
+@pytest.mark.asyncio
+async def test_virtual_led_follows_linked_updates_and_fetches_only_stale_ones(
+    hass: HomeAssistant,
+) -> None:
+    hass.data.setdefault(DOMAIN, {})
+    leds: list[coord.ReefLedCoordinator] = []
+    fetched: list[str] = []
+    for i in (1, 2):
+        led_entry = _make_entry(title=f"LED{i}", ip=f"192.0.2.{i}", hw_model="RSLED50")
+        led = coord.ReefLedCoordinator(hass, cast(Any, led_entry))
+
+        async def _fetch_data(name: str = f"LED{i}") -> dict[str, Any]:
+            fetched.append(name)
+            return {name: "fetched"}
+
+        led.my_api.fetch_data = _fetch_data  # type: ignore[method-assign]
+        hass.data[DOMAIN][f"id{i}"] = led
+        leds.append(led)
+
+    entry = _make_entry(
+        title="VLED",
+        ip="192.0.2.10",
+        hw_model="RSLED50",
+        linked=["0 LED1-RSLED50 (id1)", "1 LED2-RSLED50 (id2)"],
+    )
+    hass.state = "RUNNING"  # type: ignore[assignment]
+    vled = coord.ReefVirtualLedCoordinator(hass, cast(Any, entry))
+    updates: list[Any] = []
+    vled.async_add_listener(lambda: updates.append(vled.data))
+
+    # A linked LED poll refreshes the virtual entities from its data.
+    leds[0].last_poll = coord.monotonic()
+    leds[0].async_set_updated_data({"LED1": "polled"})
+    assert updates == [{"LED1": "polled"}]
+
+    # Only the LED that never polled is fetched by the virtual update.
+    assert await vled._async_update_data() == {  # type: ignore[attr-defined]
+        "LED1": "polled",
+        "LED2": "fetched",
+    }
+    assert fetched == ["LED2"]
+
+    await vled.async_shutdown()
+    assert not leds[0]._listeners  # type: ignore[attr-defined]
+    for led in leds:
+        await led.async_shutdown()
+
+
 @pytest.mark.asyncio
 async def test_virtual_led_async_update_data_aggregates_and_ignores_errors(
     hass: HomeAssistant,
@@ -281,6 +333,129 @@ def test_virtual_led_get_data_dispatches_by_type_and_fallback(
     assert vled.get_data("$.u") == [1, 2]
 
 
+@pytest.mark.asyncio
+async def test_virtual_led_get_data_is_memoized_until_linked_data_changes(
+    hass: HomeAssistant,
+) -> None:
+    entry = _make_entry(title="VLED", ip="192.0.2.10", hw_model="RSLED50", linked=[])
+    hass.state = "STARTING"  # type: ignore[assignment]
+
+    vled = coord.ReefVirtualLedCoordinator(hass, cast(Any, entry))
+    l1 = _LinkedLed(title="A", is_g1=True, get_map={"$.i": 1, "$.b": True})
+    l2 = _LinkedLed(title="B", is_g1=True, get_map={"$.i": 3, "$.b": True})
+    vled._linked = [l1, l2]  # type: ignore[attr-defined]
+
+    assert vled.get_data("$.i") == 2
+    l1.get_map["$.i"] = 5
+    assert vled.get_data("$.i") == 2
+
+    # A linked LED update starts a new generation.
+    vled._async_linked_updated()  # type: ignore[attr-defined]
+    assert vled.get_data("$.i") == 4
+
+    # So does a write broadcast to the linked LEDs.
+    assert vled.get_data("$.b") is True
+    l2.get_map["$.b"] = False
+    vled.set_data("$.other", 1)
+    assert vled.get_data("$.b") is False
+
+
+@pytest.mark.asyncio
+async def test_virtual_led_linked_update_only_drops_the_sources_it_changed(
+    hass: HomeAssistant,
+) -> None:
+    hass.data.setdefault(DOMAIN, {})
+    values = {"manual": 1, "wifi": 3}
+    leds: list[coord.ReefLedCoordinator] = []
+    for i in (1, 2):
+        led_entry = _make_entry(title=f"LED{i}", ip=f"192.0.2.{i}", hw_model="RSLED50")
+        led = coord.ReefLedCoordinator(hass, cast(Any, led_entry))
+        led.my_api.get_data = lambda name, _none=False: values[name.split("'")[1][1:]]  # type: ignore[method-assign]
+        hass.data[DOMAIN][f"id{i}"] = led
+        leds.append(led)
+
+    entry = _make_entry(
+        title="VLED",
+        ip="192.0.2.10",
+        hw_model="RSLED50",
+        linked=["0 LED1-RSLED50 (id1)", "1 LED2-RSLED50 (id2)"],
+    )
+    hass.state = "RUNNING"  # type: ignore[assignment]
+    vled = coord.ReefVirtualLedCoordinator(hass, cast(Any, entry))
+    woken: list[str] = []
+    for name in ("manual", "wifi"):
+        vled.async_add_listener(
+            lambda name=name: woken.append(name), frozenset({f"/{name}"})
+        )
+
+    manual = "$.sources[?(@.name=='/manual')].data.white"
+    wifi = "$.sources[?(@.name=='/wifi')].data.rssi"
+    assert (vled.get_data(manual), vled.get_data(wifi)) == (1, 3)
+    values.update(manual=5, wifi=7)
+
+    # A poll of LED1 that changed /manual only.
+    leds[0]._dispatch_scope = frozenset({"/manual"})  # type: ignore[attr-defined]
+    leds[0].async_update_listeners()
+
+    assert woken == ["manual"]
+    assert (vled.get_data(manual), vled.get_data(wifi)) == (5, 3)
+
+    await vled.async_shutdown()
+    for led in leds:
+        await led.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_virtual_led_broadcasts_concurrently_and_reports_failures(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    entry = _make_entry(title="VLED", ip="192.0.2.10", hw_model="RSLED50", linked=[])
+    hass.state = "STARTING"  # type: ignore[assignment]
+    vled = coord.ReefVirtualLedCoordinator(hass, cast(Any, entry))
+    monkeypatch.setattr(coord, "VIRTUAL_LED_MAX_WAITING_TIME", 0.2)
+
+    started: list[str] = []
+
+    class _Led(_LinkedLed):
+        async def press(self, action: str) -> None:
+            started.append(self.title)
+            await asyncio.sleep({"slow": 1, "broken": 0.01}.get(self.title, 0.05))
+            if self.title == "broken":
+                raise RuntimeError("boom")
+            self.pressed.append(action)
+
+    ok = _Led(title="ok", is_g1=True)
+    vled._linked = [  # type: ignore[attr-defined]
+        _Led(title="broken", is_g1=True),
+        _Led(title="slow", is_g1=True),
+        ok,
+    ]
+
+    with pytest.raises(HomeAssistantError, match="broken"):
+        await vled.press("go")
+
+    # Every LED got the command at once; the failures did not stop the others.
+    assert started == ["broken", "slow", "ok"]
+    assert ok.pressed == ["go"]
+    assert vled.last_broadcast is not None
+    assert vled.last_broadcast["action"] == "press go"
+    assert vled.last_broadcast["results"] == {
+        "broken": "RuntimeError: boom",
+        "slow": "pending",
+        "ok": "ok",
+    }
+
+    # The slow LED was not cancelled: its outcome is recorded once done.
+    slow = vled._linked[1]  # type: ignore[attr-defined]
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert slow.pressed == ["go"]
+    assert vled.last_broadcast["results"]["slow"] == "ok"
+
+    vled._linked = [ok]  # type: ignore[attr-defined]
+    await vled.press("again")
+    assert vled.last_broadcast["results"] == {"ok": "ok"}
+
+
 def test_virtual_led_get_data_dict_passthrough(hass: HomeAssistant) -> None:
     entry = _make_entry(title="VLED", ip="192.0.2.10", hw_model="RSLED50", linked=[])
     hass.state = "STARTING"  # type: ignore[assignment]
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from datetime import timedelta
 from types import SimpleNamespace
 from typing import Any, cast
 from unittest.mock import AsyncMock
 
 import pytest
 from homeassistant.core import HomeAssistant
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
 import custom_components.redsea.coordinator as coord
 from custom_components.redsea.const import (
@@ -15,6 +21,7 @@ from custom_components.redsea.const import (
     CONFIG_FLOW_HW_MODEL,
     CONFIG_FLOW_IP_ADDRESS,
     DOMAIN,
+    WAVE_SCHEDULE_PATH,
     WAVES_LIBRARY,
 )
 
@@ -71,6 +78,46 @@ async def test_wave_get_set_current_value_uses_current_interval(
     assert schedule[1]["val"] == 42
 
 
+@pytest.mark.asyncio
+async def test_wave_refreshes_schedule_entities_at_segment_boundaries(
+    hass: HomeAssistant,
+    local_wave_config_entry: MockConfigEntry,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    coordinator = coord.ReefWaveCoordinator(hass, cast(Any, local_wave_config_entry))
+    schedule = [{"st": 0, "name": "a"}, {"st": 600, "name": "b"}]
+    coordinator.my_api = cast(
+        Any, _FakeWaveAPI(get_data_map={WAVE_SCHEDULE_PATH: schedule})
+    )
+
+    class _FixedDateTime:
+        @classmethod
+        def now(cls):  # type: ignore[no-untyped-def]
+            return SimpleNamespace(hour=9, minute=59, second=30, microsecond=0)
+
+    monkeypatch.setattr(coord, "datetime", _FixedDateTime, raising=True)
+
+    woken: list[str] = []
+    coordinator.async_add_listener(lambda: woken.append("auto"), frozenset({"/auto"}))
+    coordinator.async_add_listener(lambda: woken.append("wifi"), frozenset({"/wifi"}))
+    assert coordinator.get_current_value(WAVE_SCHEDULE_PATH, "name") == "a"
+
+    # Unchanged poll: nobody woken, the boundary timer is armed.
+    coordinator._dispatch_scope = frozenset()  # type: ignore[attr-defined]
+    coordinator.async_update_listeners()
+    assert woken == []
+
+    # "b" is in effect from 10:01 (past its 10:00 start): 90 s from 09:59:30.
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=85))
+    await hass.async_block_till_done()
+    assert woken == []
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=91))
+    await hass.async_block_till_done()
+    assert woken == ["auto"]
+
+    await coordinator.async_shutdown()
+
+
 @dataclass
 class _FakeWaveAPI:
     get_data_map: dict[str, Any] = field(default_factory=dict)
@@ -78,6 +125,8 @@ class _FakeWaveAPI:
     deleted: list[str] = field(default_factory=list)
     http_calls: list[tuple[str, Any]] = field(default_factory=list)
     fetched_config: list[str | None] = field(default_factory=list)
+    uploads: list[tuple[str, list[dict[str, Any]]]] = field(default_factory=list)
+    upload_ok: bool = True
 
     async def fetch_config(self, config_path: str | None = None) -> None:
         self.fetched_config.append(config_path)
@@ -95,6 +144,14 @@ class _FakeWaveAPI:
     async def http_send(self, path: str, payload: Any) -> None:
         self.http_calls.append((path, payload))
 
+    async def upload_schedule(self, uid: str, intervals: list[dict[str, Any]]) -> bool:
+        self.uploads.append((uid, list(intervals)))
+        return self.upload_ok
+
+    @property
+    def layout(self) -> dict[str, Any] | None:
+        return {"upload_batch": 2, "firmware": None}
+
 
 @dataclass
 class _FakeCloud:
@@ -188,22 +245,24 @@ async def test_wave_set_wave_local_api_calls_http_sequence(
 
     await wave.set_wave()
 
-    # Local API writes should use the /auto init/complete/apply handshake,
-    # with one POST /auto per interval (small-JSON-buffer firmware fix).
-    assert [p for (p, _pl) in api.http_calls] == [
-        "/auto/init",
-        "/auto",
-        "/auto",
-        "/auto/complete",
-        "/auto/apply",
-    ]
-
-    # Each interval is pushed individually, wrapped in {"intervals": [...]}.
-    auto_payloads = [pl for (p, pl) in api.http_calls if p == "/auto"]
-    assert [pl["intervals"][0]["wave_uid"] for pl in auto_payloads] == ["w0", "w1"]
+    # The whole schedule is uploaded by the API (batched /auto handshake).
+    assert len(api.uploads) == 1
+    uid, intervals = api.uploads[0]
+    assert uid == "uuid-1"
+    assert [i["wave_uid"] for i in intervals] == ["w0", "w1"]
     # The matching slot (w1, current at 10:30) gets the rebuilt wave but keeps
     # its own start time; the non-matching slot (w0) is left untouched.
-    assert auto_payloads[1]["intervals"][0]["st"] == 600
+    assert intervals[1]["st"] == 600
+    assert intervals[1]["type"] == "gy"
+    assert intervals[0] == {"st": 0, "wave_uid": "w0"}
+    wave.async_request_refresh.assert_awaited_once()
+
+    # A schedule the device did not take is reported, not refreshed.
+    api.upload_ok = False
+    wave.async_request_refresh.reset_mock()
+    with pytest.raises(HomeAssistantError):
+        await wave.set_wave()
+    wave.async_request_refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -645,7 +704,6 @@ async def test_wave_set_wave_local_api_preserves_start_key(
     await wave.set_wave()
 
     # The matching slot keeps both st and start equal to its own start time.
-    auto_payloads = [pl for (p, pl) in api.http_calls if p == "/auto"]
-    w1 = auto_payloads[1]["intervals"][0]
+    w1 = api.uploads[0][1][1]
     assert w1["st"] == 600
     assert w1["start"] == 600
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import Any, cast
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.redsea.const import (
+    CONFIG_FLOW_CLOUD_PASSWORD,
+    CONFIG_FLOW_CLOUD_USERNAME,
+    CONFIG_FLOW_CONFIG_TYPE,
+    CONFIG_FLOW_HW_MODEL,
+    CONFIG_FLOW_IP_ADDRESS,
+    DOMAIN,
+)
+from custom_components.redsea.coordinator import ReefBeatCoordinator
+from custom_components.redsea.diagnostics import async_get_config_entry_diagnostics
+
+
+def _make_entry(**extra: Any) -> MockConfigEntry:
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="Dose",
+        data={
+            CONFIG_FLOW_IP_ADDRESS: "192.0.2.12",
+            CONFIG_FLOW_HW_MODEL: "RSDOSE4",
+            CONFIG_FLOW_CONFIG_TYPE: False,
+            **extra,
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_report_transport_metrics(hass: HomeAssistant) -> None:
+    entry = _make_entry()
+    device = ReefBeatCoordinator(hass, cast(Any, entry))
+    device.my_api.metrics.record("/dashboard", elapsed=0.12, size=512)
+    device.my_api.metrics.record("/wifi", elapsed=10, error="timeout", timed_out=True)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = device
+
+    diag = await async_get_config_entry_diagnostics(hass, cast(Any, entry))
+
+    assert diag["entry"]["data"][CONFIG_FLOW_IP_ADDRESS] == "192.0.2.12"
+    assert {"name": "/dashboard", "type": "data"} in diag["device"]["sources"]
+    transport = diag["transport"]
+    requests = transport["requests"]
+    assert requests["failure_rate"] == 50.0
+    assert requests["sources"]["/dashboard"]["bytes"] == 512
+    assert requests["sources"]["/wifi"]["last_error"] == "timeout"
+    assert transport["breaker"]["state"] == "closed"
+    assert transport["limiter"]["limit"] == 4
+    assert transport["connections"]["reuse_rate"] is None
+    assert set(transport) >= {"scheduler", "coalesced_gets", "writes"}
+    assert "hits" in diag["jsonpath_cache"]
+
+    await device.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_redact_credentials_without_device(
+    hass: HomeAssistant,
+) -> None:
+    entry = _make_entry(
+        **{
+            CONFIG_FLOW_CLOUD_USERNAME: "me@example.com",
+            CONFIG_FLOW_CLOUD_PASSWORD: "x",
+        }
+    )
+
+    diag = await async_get_config_entry_diagnostics(hass, cast(Any, entry))
+
+    assert diag["entry"]["data"][CONFIG_FLOW_CLOUD_USERNAME] == "**REDACTED**"
+    assert diag["entry"]["data"][CONFIG_FLOW_CLOUD_PASSWORD] == "**REDACTED**"
+    assert "transport" not in diag
@@ -8,7 +8,12 @@ import pytest
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from custom_components.redsea.entity import ReefBeatRestoreEntity, RestoreSpec
+from custom_components.redsea.entity import (
+    ReefBeatEntity,
+    ReefBeatRestoreEntity,
+    RestoreSpec,
+    scope_of_paths,
+)
 
 
 @dataclass
@@ -139,3 +144,46 @@ async def test_restore_entity_sets_attribute_on_success(
     # _attr_dummy is set dynamically by the restore spec, so it isn't a
     # statically-known attribute — read it via getattr to satisfy pyright.
     assert getattr(ent, "_attr_dummy") == 12  # noqa: B009
+
+
+def test_scope_of_paths_collects_source_names() -> None:
+    assert scope_of_paths(
+        [
+            "$.sources[?(@.name=='/head/1/settings')].data.name",
+            None,
+            "",
+            '$.sources[?(@.name=="/dashboard")].data.heads.1.state',
+        ]
+    ) == frozenset({"/head/1/settings", "/dashboard"})
+    # Any path outside of a single source disables scoping.
+    assert scope_of_paths(["$.sources[?(@.name=='/x')].data", "$.local.a"]) is None
+    assert scope_of_paths(["type"]) is None
+    assert scope_of_paths([None]) is None
+
+
+@pytest.mark.asyncio
+async def test_entity_registers_source_scope_as_listener_context(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def _noop(self: Any) -> None:
+        return None
+
+    monkeypatch.setattr(CoordinatorEntity, "async_added_to_hass", _noop)
+
+    @dataclass
+    class _Desc:
+        value_name: str = "$.sources[?(@.name=='/mode')].data.mode"
+        with_attr_value: str | None = None
+
+    class _Scoped(ReefBeatEntity):
+        _scope_fields = ("value_name", "with_attr_value")
+
+    ent = _Scoped(cast(Any, _FakeCoordinator()))
+    ent.entity_description = cast(Any, _Desc())
+    await ent.async_added_to_hass()
+    assert ent.coordinator_context == frozenset({"/mode"})
+
+    unscoped = ReefBeatEntity(cast(Any, _FakeCoordinator()))
+    unscoped.entity_description = cast(Any, _Desc())
+    await unscoped.async_added_to_hass()
+    assert unscoped.coordinator_context is None
@@ -1,13 +1,33 @@
 from __future__ import annotations
 
+import asyncio
+import json
 from dataclasses import dataclass, field
+from types import SimpleNamespace
 from typing import Any, cast
 
+import aiohttp
 import pytest
 from typing_extensions import Self
 
 import custom_components.redsea.reefbeat.api as api_mod
-from custom_components.redsea.reefbeat.api import ReefBeatAPI
+from custom_components.redsea.const import HTTP_MAX_RETRY
+from custom_components.redsea.reefbeat.accessor import (
+    Accessor,
+    FilterStep,
+    FindAccessor,
+)
+from custom_components.redsea.reefbeat.api import ReefBeatAPI, SourceMatch
+from custom_components.redsea.reefbeat.breaker import (
+    CircuitBreaker,
+    DeviceOfflineError,
+    backoff_delay,
+)
+from custom_components.redsea.reefbeat.limiter import POLL, USER, RequestLimiter
+from custom_components.redsea.reefbeat.metrics import RequestMetrics
+from custom_components.redsea.reefbeat.payload import NOT_JSON, decode_body, loads
+from custom_components.redsea.reefbeat.scheduler import SourceScheduler
+from custom_components.redsea.reefbeat.session import DeviceSession
 
 # tests/conftest.py has an autouse fixture that monkeypatches `ReefBeatAPI._http_get`
 # to serve fixture data. For unit-testing the real implementation in api.py, keep
@@ -37,6 +57,14 @@ class _FakeResponse:
     ) -> None:
         return None
 
+    def release(self) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        if self.body_json is not None and not self.json_raises:
+            return json.dumps(self.body_json).encode()
+        return self.body_text.encode()
+
     async def text(self) -> str:
         return self.body_text
 
@@ -92,7 +120,7 @@ def _make_secure_api(session: _FakeSession) -> ReefBeatAPI:
     )
 
 
-def test_get_data_caches_eval_path() -> None:
+def test_get_data_caches_compiled_accessor() -> None:
     session = _FakeSession()
     api = _make_api(session)
 
@@ -101,7 +129,189 @@ def test_get_data_caches_eval_path() -> None:
 
     key = "$.sources[?(@.name=='/manual')].data.white"
     assert api.get_data(key) == 12
-    assert key in api._data_db
+    assert isinstance(api._data_db[key], Accessor)
+
+    # The accessor reads through to the live state on later calls.
+    api.data["sources"][6]["data"]["white"] = 42
+    assert api.get_data(key) == 42
+
+
+def test_get_accessor_compiles_fields_indexes_filters_and_local_paths() -> None:
+    session = _FakeSession()
+    api = _make_api(session)
+    api.add_source("/auto/3", "config", {"intervals": [{"st": 0}, {"st": 60}]})
+    api.data["local"]["head"] = {"1": {"name": "Ca"}}
+
+    acc = api.get_accessor("$.sources[?(@.name=='/auto/3')].data.intervals[1].st")
+    assert acc.steps[0] == "sources"
+    assert isinstance(acc.steps[1], FilterStep)
+    assert acc.steps[2:] == ("data", "intervals", 1, "st")
+    assert acc.get(api.data) == 60
+
+    acc_local = api.get_accessor("$.local.head.'1'.name")
+    assert acc_local.steps == ("local", "head", "1", "name")
+    assert api.get_data("$.local.head.'1'.name") == "Ca"
+
+    with pytest.raises(KeyError):
+        api.get_accessor("$.sources[?(@.name=='/nope')].data").get(api.data)
+
+
+def test_get_data_follows_filtered_element_after_reordering() -> None:
+    session = _FakeSession()
+    api = _make_api(session)
+    api.add_source("/a", "data", {"v": "a"})
+    api.add_source("/b", "data", {"v": "b"})
+    api.add_source(
+        "/probes", "data", [{"uid": "p1", "value": 1}, {"uid": "p2", "value": 2}]
+    )
+
+    key_b = "$.sources[?(@.name=='/b')].data.v"
+    key_p2 = "$.sources[?(@.name=='/probes')].data[?(@.uid=='p2')].value"
+    assert api.get_data(key_b) == "b"
+    assert api.get_data(key_p2) == 2
+
+    # Removing an earlier source shifts every following index.
+    api.remove_source("/a")
+    assert api.get_data(key_b) == "b"
+
+    # A new payload with another probe order (p1 unplugged).
+    api.data["sources"][-1]["data"] = [
+        {"uid": "p3", "value": 3},
+        {"uid": "p2", "value": 4},
+    ]
+    assert api.get_data(key_p2) == 4
+
+    api.remove_source("/b")
+    assert api.get_data(key_b, is_None_possible=True) is None
+
+
+def test_get_accessor_numeric_filter_and_fallback() -> None:
+    session = _FakeSession()
+    api = _make_api(session)
+    api.add_source(
+        "/ports", "data", [{"number": "1", "on": False}, {"number": 3, "on": True}]
+    )
+
+    assert (
+        api.get_data("$.sources[?(@.name=='/ports')].data[?(@.number==1)].on") is False
+    )
+    assert (
+        api.get_data("$.sources[?(@.name=='/ports')].data[?(@.number==3)].on") is True
+    )
+
+    # Wildcards are outside of the compiled subset: full jsonpath find() fallback.
+    acc = api.get_accessor("$.sources[*].name")
+    assert isinstance(acc, FindAccessor)
+    assert acc.get(api.data) == "/device-info"
+
+
+def test_source_registry_indexes_by_name_and_type() -> None:
+    session = _FakeSession()
+    api = _make_api(session)
+    api.add_source("/manual", "data", {"white": 12})
+    api.add_source("/auto/1", "config", "")
+
+    assert api.sources.get("/manual") is api.data["sources"][6]
+    assert api.sources.get("/nope") is None
+    assert "/auto/1" in api.sources
+    assert [s["name"] for s in api.sources.of_type("config")] == [
+        "/firmware",
+        "/cloud",
+        "/auto/1",
+    ]
+    assert [s["name"] for s in api.sources.not_of_type("device-info", "config")] == [
+        "/mode",
+        "/wifi",
+        "/dashboard",
+        "/manual",
+    ]
+
+    # remove_source() rebinds the list; direct list edits are picked up too.
+    api.remove_source("/manual")
+    assert api.sources.get("/manual") is None
+    api.data["sources"].append({"name": "/x", "type": "data", "data": ""})
+    assert api.sources.get("/x") is not None
+    api.data["sources"] = [{"name": "/y", "type": "preview", "data": 1}]
+    assert len(api.sources) == 1
+    assert api.sources.of_type("data") == []
+
+
+@pytest.mark.asyncio
+async def test_fetches_pass_source_entries_to_call_url(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _FakeSession()
+    api = _make_api(session)
+
+    seen: list[Any] = []
+
+    async def _call_url(_session: Any, source: Any) -> None:
+        seen.append(source)
+
+    monkeypatch.setattr(api, "_call_url", _call_url)
+    await api.fetch_config("/cloud")
+
+    assert len(seen) == 1
+    assert isinstance(seen[0], SourceMatch)
+    # The wrapped value is the live entry, so fetched payloads land in self.data.
+    assert seen[0].value is api.sources.get("/cloud")
+
+
+def test_parse_is_cached_and_reports_hits() -> None:
+    expr = "$.sources[?(@.name=='/parse-cache-test')].data.value"
+    before = api_mod.parse_cache_info()
+
+    first = api_mod.parse(expr)
+    assert api_mod.parse(expr) is first
+
+    after = api_mod.parse_cache_info()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+    assert 0 < after["size"] <= after["maxsize"]
+
+
+def test_set_data_writes_in_place_through_accessor(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _FakeSession()
+    api = _make_api(session)
+    api.add_source("/manual", "data", {"white": 12, "blue": 3})
+    api.data["local"]["head"] = {"1": {"manual_dose": 0}}
+
+    # Paths compiled on first write are cached too.
+    api.set_data("$.local.head.'1'.manual_dose", 5)
+    assert api.data["local"]["head"]["1"]["manual_dose"] == 5
+    assert "$.local.head.'1'.manual_dose" in api._data_db
+
+    def _no_parse(_expr: str) -> Any:
+        raise AssertionError("jsonpath update should not be used")
+
+    key = "$.sources[?(@.name=='/manual')].data.white"
+    api.get_data(key)
+    monkeypatch.setattr(api_mod, "parse", _no_parse)
+
+    api.set_data(key, 40)
+    assert api.data["sources"][6]["data"] == {"white": 40, "blue": 3}
+
+    # The same handle keeps working after the sources list is rebuilt.
+    api.remove_source("/cloud")
+    api.set_data(key, 41)
+    assert api.get_data(key) == 41
+
+
+def test_set_data_falls_back_to_jsonpath_update() -> None:
+    session = _FakeSession()
+    api = _make_api(session)
+    api.add_source("/dup", "data", {"v": 1})
+    api.add_source("/dup", "data", {"v": 2})
+
+    # Several matches: every match is updated, like jsonpath-ng does.
+    api.set_data("$.sources[?(@.name=='/dup')].data.v", 3)
+    assert [s["data"]["v"] for s in api.sources.named("/dup")] == [3, 3]
+
+    # Missing keys are not created.
+    api.set_data("$.sources[?(@.name=='/dup')].data.new", 1)
+    assert "new" not in api.sources.named("/dup")[0]["data"]
 
 
 def test_set_data_clears_cached_path_on_update_failure(
@@ -111,7 +321,7 @@ def test_set_data_clears_cached_path_on_update_failure(
     api = _make_api(session)
 
     bad_path = "$.sources[0].data.foo"
-    api._data_db[bad_path] = "self.data['sources'][0]['data']['foo']"
+    api._data_db[bad_path] = Accessor(bad_path, ("sources", 0, "data", "foo"))
 
     class _Expr:
         def update(self, data: Any, value: Any) -> Any:
@@ -230,8 +440,8 @@ async def test_http_send_400_is_not_retried(monkeypatch: pytest.MonkeyPatch) ->
 
     # Ensure only the first (400) response was used.
     assert [c[0] for c in session.calls] == ["post"]
-    # One sleep can still occur on the failed attempt.
-    assert len(sleeps) == 1
+    # No retry follows, so no backoff delay either.
+    assert sleeps == []
 
 
 @pytest.mark.asyncio
@@ -266,6 +476,46 @@ async def test_http_get_success_and_failure(monkeypatch: pytest.MonkeyPatch) ->
     assert res2 is None
 
 
+@pytest.mark.asyncio
+async def test_http_result_builds_headers_and_text_lazily() -> None:
+    session = _FakeSession(
+        responses={
+            "get": [_FakeResponse(status=200, body_json={"ok": True})],
+            "post": [_FakeResponse(status=400, body_text="bad", headers={"X-Id": "1"})],
+        }
+    )
+    api = _make_api(session)
+
+    res = await api.http_get("/dashboard")
+    assert res is not None and res["json"] == {"ok": True}
+    assert set(dict.keys(res)) == {
+        "ok",
+        "method",
+        "url",
+        "status",
+        "reason",
+        "elapsed_ms",
+        "json",
+    }
+    assert "text" in res and "headers" in res
+    assert res["text"] == '{"ok": true}'
+    assert res.get("headers") == {"Content-Type": "application/json"}
+
+    bad = await api._http_send(api._base_url + "/x", {"a": 1}, "post")
+    assert bad is not None and "json" not in bad
+    assert bad.get("text", "") == "bad" and bad["headers"] == {"X-Id": "1"}
+    assert api.data["message"]["alert"] == {"message": "bad"}
+    assert bad.get("missing", 0) == 0
+
+
+def test_payload_decoding_parses_once_with_text_fallback() -> None:
+    assert loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+    assert loads(b"") is NOT_JSON
+    assert loads(b"not json") is NOT_JSON
+    assert decode_body(b"[1]") == [1]
+    assert decode_body(b"OK \xff") == "OK \ufffd"
+
+
 @pytest.mark.asyncio
 async def test__http_get_handles_missing_endpoint_and_client_error(
     monkeypatch: pytest.MonkeyPatch,
@@ -289,9 +539,9 @@ async def test__http_get_handles_missing_endpoint_and_client_error(
         raise aiohttp.ClientError("boom")
 
     monkeypatch.setattr(session, "get", _raise)
-    assert (
-        await api._http_get(cast(Any, session), _Match({"name": "/dashboard"})) is False
-    )
+    # Left to the caller, which retries and then tells the breaker.
+    with pytest.raises(aiohttp.ClientError):
+        await api._http_get(cast(Any, session), _Match({"name": "/dashboard"}))
 
 
 @pytest.mark.asyncio
@@ -334,6 +584,400 @@ async def test__http_get_parses_non_json_content_type_and_sets_source_data() ->
     assert m2.value["data"] == "not json"
 
 
+@pytest.mark.asyncio
+async def test__call_url_reports_changed_sources_by_payload_fingerprint(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _FakeSession(
+        responses={
+            "get": [
+                _FakeResponse(status=200, body_text='{"a": 1}', body_json={"a": 1})
+                for _ in range(3)
+            ]
+            + [_FakeResponse(status=200, body_text='{"a": 2}', body_json={"a": 2})]
+        }
+    )
+    api = _make_api(session)
+    monkeypatch.setattr(ReefBeatAPI, "_http_get", _ORIG_HTTP_GET, raising=True)
+    api.add_source("/x", "data", "")
+    source = SourceMatch(api.sources.get("/x"))  # type: ignore[arg-type]
+
+    await api._call_url(cast(Any, session), source)
+    assert api.pop_changed_sources() == {"/x"}
+
+    # Same bytes: stored again, but not reported.
+    await api._call_url(cast(Any, session), source)
+    assert api.pop_changed_sources() == set()
+    assert api.get_data("$.sources[?(@.name=='/x')].data.a") == 1
+
+    # A local write makes the next identical payload count as a change.
+    api.set_data("$.sources[?(@.name=='/x')].data.a", 5)
+    await api._call_url(cast(Any, session), source)
+    assert api.pop_changed_sources() == {"/x"}
+    assert api.get_data("$.sources[?(@.name=='/x')].data.a") == 1
+
+    await api._call_url(cast(Any, session), source)
+    assert api.pop_changed_sources() == {"/x"}
+
+
+def test_invalidate_fingerprint_by_name_path_or_all() -> None:
+    session = _FakeSession()
+    api = _make_api(session)
+    api._fingerprints = {"/a": b"1", "/b": b"2", "/c": b"3"}
+
+    api.invalidate_fingerprint("$.local.head.'1'.manual_dose")
+    assert set(api._fingerprints) == {"/a", "/b", "/c"}
+
+    api.invalidate_fingerprint('$.sources[?(@.name=="/a")].data.x')
+    api.invalidate_fingerprint("/b")
+    assert set(api._fingerprints) == {"/c"}
+
+    api.invalidate_fingerprint()
+    assert api._fingerprints == {}
+
+
+def test_source_scheduler_periods_backoff_and_reset() -> None:
+    sched = SourceScheduler({"/wifi": 2, "/auto/*": 0}, backoff_after=2, backoff_max=4)
+    assert sched.period("/dashboard") == 1
+    assert sched.period("/auto/3") == 0
+
+    def _poll() -> set[str]:
+        due = {s["name"] for s in sched.select(sources)}
+        for name in due:
+            sched.record(name, changed=False)
+        return due
+
+    sources = [{"name": n} for n in ("/dashboard", "/wifi", "/auto/3")]
+    # First poll fetches everything, on-demand sources only once.
+    assert _poll() == {"/dashboard", "/wifi", "/auto/3"}
+    assert _poll() == {"/dashboard"}
+    # /wifi keeps returning the same payload: it backs off (x4 max), while
+    # /dashboard, polled every time, stays due on every poll.
+    assert _poll() == {"/dashboard", "/wifi"}
+    history = [_poll() for _ in range(11)]
+    assert all("/dashboard" in due for due in history)
+    assert sum("/wifi" in due for due in history) == 1
+    backoff = sched.stats()["backoff"]
+    assert backoff["/wifi"] >= 2 and "/dashboard" not in backoff
+
+    sched.reset("/auto/3")
+    sched.wake()
+    assert _poll() == {"/dashboard", "/wifi", "/auto/3"}
+
+
+@pytest.mark.asyncio
+async def test_fetch_data_only_fetches_due_sources(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _FakeSession()
+    api = _make_api(session)
+    fetched: list[str] = []
+
+    async def _call_url(_session: Any, source: Any) -> None:
+        fetched.append(source.value["name"])
+        api.scheduler.record(source.value["name"], True)
+
+    monkeypatch.setattr(api, "_call_url", _call_url)
+
+    await api.fetch_data()
+    assert set(fetched) == {"/mode", "/wifi", "/dashboard"}
+
+    fetched.clear()
+    await api.fetch_data()
+    assert set(fetched) == {"/mode", "/dashboard"}
+
+    # A local write on /wifi makes it due again.
+    fetched.clear()
+    api.set_data("$.sources[?(@.name=='/wifi')].data", {"ssid": "x"})
+    await api.fetch_data()
+    assert set(fetched) == {"/mode", "/wifi", "/dashboard"}
+
+    # Quick refreshes bypass the scheduler.
+    fetched.clear()
+    api.quick_refresh = "/wifi"
+    await api.fetch_data()
+    assert fetched == ["/wifi"]
+
+
+def test_circuit_breaker_opens_probes_and_closes() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(
+        failure_threshold=2,
+        reset_timeout=10,
+        reset_timeout_max=25,
+        jitter=0,
+        clock=lambda: now[0],
+    )
+    assert breaker.acquire() and not breaker.offline
+
+    breaker.record_failure()
+    assert not breaker.offline
+    breaker.record_failure()
+    assert breaker.offline and breaker.state == "open"
+    assert not breaker.acquire()
+
+    # After the reset timeout a single probe goes through.
+    now[0] = 10
+    assert breaker.state == "half_open"
+    assert breaker.acquire()
+    assert not breaker.acquire()
+
+    # A failed probe re-opens it for twice as long (capped).
+    breaker.record_failure()
+    assert breaker.stats()["retry_in"] == 20
+    now[0] = 30
+    assert breaker.acquire()
+    breaker.record_failure()
+    assert breaker.stats()["retry_in"] == 25
+
+    now[0] = 55
+    assert breaker.acquire()
+    breaker.record_success()
+    assert breaker.stats() == {
+        "state": "closed",
+        "failures": 0,
+        "opened": 0,
+        "rejected": 2,
+        "retry_in": None,
+    }
+
+    assert [backoff_delay(n, 2, cap=10, jitter=0) for n in range(1, 5)] == [2, 4, 8, 10]
+    assert 1.6 <= backoff_delay(1, 2, jitter=0.2) <= 2.4
+
+
+@pytest.mark.asyncio
+async def test_fetch_data_fails_fast_and_probes_offline_device(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(ReefBeatAPI, "_http_get", _ORIG_HTTP_GET, raising=True)
+
+    async def _no_sleep(_delay: float) -> None:
+        return None
+
+    monkeypatch.setattr(api_mod.asyncio, "sleep", _no_sleep)
+
+    class _Device(_FakeSession):
+        down = True
+        glitches = 0
+
+        def get(self, url: str, *args: Any, **kwargs: Any) -> _FakeResponse:
+            self.calls.append(("get", url, None))
+            if self.glitches:
+                self.glitches -= 1
+                raise asyncio.TimeoutError
+            if self.down:
+                raise aiohttp.ClientConnectionError("unreachable")
+            return _FakeResponse(status=200, body_json={"ok": True})
+
+    session = _Device()
+    api = _make_api(session)
+    now = [0.0]
+    api.breaker = CircuitBreaker(
+        failure_threshold=3, reset_timeout=30, jitter=0, clock=lambda: now[0]
+    )
+
+    # A short glitch hitting every source of a poll does not open the breaker.
+    session.down = False
+    session.glitches = 3
+    await api.fetch_data()
+    assert len(session.calls) == 6
+    assert not api.offline and not api._in_error
+    assert api.breaker.stats()["failures"] == 0
+
+    # Requests whose tries all fail are counted, one each.
+    session.down = True
+    session.calls.clear()
+    await api.fetch_data()
+    assert len(session.calls) == 2 * HTTP_MAX_RETRY
+    assert api._in_error and not api.offline
+    assert api.breaker.stats()["failures"] == 2
+    await api.fetch_data()
+    assert api.offline
+
+    # While open, polls fail without any request.
+    session.calls.clear()
+    with pytest.raises(DeviceOfflineError, match="next probe in 30"):
+        await api.fetch_data()
+    assert session.calls == []
+
+    # Once due, a single cheap request probes the device, then the poll goes on.
+    now[0] = 30
+    session.down = False
+    await api.fetch_data()
+    urls = [url for _method, url, _payload in session.calls]
+    assert urls[0].endswith("/device-info")
+    # (/wifi, polled every few polls, is not due on this one.)
+    assert sorted(u.rsplit("/", 1)[1] for u in urls[1:]) == ["dashboard", "mode"]
+    assert not api.offline
+
+
+@pytest.mark.asyncio
+async def test_request_limiter_serves_user_lane_first() -> None:
+    limiter = RequestLimiter(1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def _request(name: str, lane: int) -> None:
+        async with limiter.slot(lane):
+            order.append(name)
+            if name == "first":
+                await release.wait()
+
+    first = asyncio.create_task(_request("first", POLL))
+    await asyncio.sleep(0)
+    waiting = [
+        asyncio.create_task(_request(name, lane))
+        for name, lane in (("poll1", POLL), ("lost", POLL), ("poll2", POLL))
+    ] + [asyncio.create_task(_request("write", USER))]
+    await asyncio.sleep(0)
+    assert limiter.active == 1 and limiter.queued == 4
+
+    # A cancelled waiter does not keep a slot.
+    waiting[1].cancel()
+    release.set()
+    await asyncio.gather(first, *waiting, return_exceptions=True)
+
+    assert order == ["first", "write", "poll1", "poll2"]
+    stats = limiter.stats()
+    assert stats["active"] == 0 and stats["queued"] == 0
+    assert stats["max_queued"] == 4
+    assert stats["user"]["queued"] == 1
+    assert stats["poll"]["requests"] == 3 and stats["poll"]["queued"] == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_data_caps_requests_in_flight() -> None:
+    api = _make_api(_FakeSession())
+    api.limiter.limit = 2
+    for i in range(6):
+        api.add_source(f"/extra/{i}", "data", "")
+    in_flight = peak = 0
+
+    async def _http_get(_session: Any, _source: Any) -> bool:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return True
+
+    api._http_get = _http_get  # type: ignore[method-assign]
+    await api.fetch_data()
+
+    assert peak == 2
+    assert api.limiter.stats()["poll"]["requests"] == 9
+
+
+def test_request_metrics_histogram_percentiles_and_failure_rate() -> None:
+    metrics = RequestMetrics(buckets=(50, 100), window=4)
+    metrics.record("/a", elapsed=0.010, size=100)
+    metrics.record("/a", elapsed=0.080, size=50)
+    metrics.record("/a", elapsed=0.300, error="HTTP 500 Internal Server Error")
+    metrics.record("/b", elapsed=5.0, error="timeout", timed_out=True)
+    metrics.record_retry("/b")
+
+    stats = metrics.stats()
+    a, b = stats["sources"]["/a"], stats["sources"]["/b"]
+    assert a["requests"] == 3 and a["failures"] == 1 and a["bytes"] == 150
+    assert a["latency_ms"] == {"<=50": 1, "<=100": 1, ">100": 1}
+    assert a["last_error"] == "HTTP 500 Internal Server Error"
+    # A timeout has no latency: it is counted, not put in the histogram.
+    assert b["timeouts"] == 1 and b["retries"] == 1 and b["latency_avg_ms"] is None
+    assert sum(b["latency_ms"].values()) == 0
+    # Percentiles only cover successful requests, the failure rate all of them.
+    assert stats["latency_p50_ms"] == 10.0 and stats["latency_p95_ms"] == 80.0
+    assert stats["failure_rate"] == 50.0
+
+    # The window slides: old failures age out.
+    for _ in range(4):
+        metrics.record("/a", elapsed=0.020)
+    assert metrics.failure_rate == 0.0 and metrics.percentile(95) == 20.0
+
+
+@pytest.mark.asyncio
+async def test__call_url_records_per_source_metrics(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(ReefBeatAPI, "_http_get", _ORIG_HTTP_GET, raising=True)
+
+    async def _no_sleep(_delay: float) -> None:
+        return None
+
+    monkeypatch.setattr(api_mod.asyncio, "sleep", _no_sleep)
+
+    class _Flaky(_FakeSession):
+        def get(self, url: str, *args: Any, **kwargs: Any) -> _FakeResponse:
+            self.calls.append(("get", url, None))
+            if len(self.calls) == 1:
+                raise asyncio.TimeoutError
+            if len(self.calls) == 2:
+                return _FakeResponse(status=503, reason="Busy")
+            return _FakeResponse(status=200, body_json={"mode": "auto"})
+
+    api = _make_api(_Flaky())
+    entry = api.sources.named("/mode")[0]
+    await api._call_url(api._session, SourceMatch(entry))
+
+    mode = api.metrics.stats()["sources"]["/mode"]
+    assert mode["requests"] == 3
+    assert mode["failures"] == 2 and mode["timeouts"] == 1 and mode["retries"] == 2
+    assert mode["bytes"] == len(b'{"mode": "auto"}')
+    assert mode["last_error"] == "HTTP 503 Busy"
+    assert sum(mode["latency_ms"].values()) == 2
+
+
+@pytest.mark.asyncio
+async def test_device_session_resends_on_stale_pooled_connection() -> None:
+    session = DeviceSession(limit=2, keepalive_timeout=5)
+
+    class _Client:
+        """Pool of one connection that the device closes while idle."""
+
+        closed = False
+
+        def __init__(self) -> None:
+            self.pooled = False
+            self.stale = False
+            self.sent: list[str] = []
+
+        async def request(
+            self, method: str, url: str, trace_request_ctx: Any, **_kw: Any
+        ) -> _FakeResponse:
+            self.sent.append(method)
+            ctx = SimpleNamespace(trace_request_ctx=trace_request_ctx)
+            if self.pooled:
+                self.pooled = False
+                await session._on_connection_reuse(cast(Any, None), ctx, None)
+                if self.stale:
+                    raise aiohttp.ServerDisconnectedError()
+            else:
+                await session._on_connection_create()
+            self.pooled = True
+            return _FakeResponse(status=200, body_json={"ok": True})
+
+    client = _Client()
+    session._session = cast(Any, client)
+
+    for _ in range(2):
+        async with session.get("http://192.0.2.1/dashboard") as resp:
+            assert resp.status == 200
+    assert session.reuse_rate == 50.0
+
+    # The device dropped the idle connection: the GET goes out again at once.
+    client.stale = True
+    async with session.get("http://192.0.2.1/dashboard") as resp:
+        assert resp.status == 200
+    assert client.sent == ["GET"] * 4
+    assert session.stats["stale_retries"] == 1
+
+    # A POST may have been processed: the failure is left to the caller.
+    client.pooled = True
+    with pytest.raises(aiohttp.ServerDisconnectedError):
+        async with session.post("http://192.0.2.1/mode", json={}):
+            pass
+    assert session.stats["stale_retries"] == 1
+
+
 @pytest.mark.asyncio
 async def test__http_get_secure_401_triggers_connect_and_retries() -> None:
     session = _FakeSession(
@@ -505,6 +1149,48 @@ def test_add_source_when_sources_missing_or_not_list() -> None:
     assert api.get_data("$.sources[?(@.name=='/y')].data.b") == 2
 
 
+@pytest.mark.asyncio
+async def test__call_url_coalesces_concurrent_gets(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _FakeSession()
+    api = _make_api(session)
+    release = asyncio.Event()
+    gets: list[str] = []
+
+    async def _http_get(_session: Any, source: Any) -> bool:
+        gets.append(source.value["name"])
+        await release.wait()
+        return True
+
+    monkeypatch.setattr(api, "_http_get", _http_get)
+    wifi = SourceMatch(api.sources.get("/wifi"))  # type: ignore[arg-type]
+    mode = SourceMatch(api.sources.get("/mode"))  # type: ignore[arg-type]
+
+    calls = [
+        asyncio.create_task(api._call_url(cast(Any, session), src))
+        for src in (wifi, wifi, mode, wifi)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*calls)
+
+    assert sorted(gets) == ["/mode", "/wifi"]
+    assert api.get_stats == {"calls": 4, "coalesced": 2}
+    assert api._inflight == {}
+
+    # A GET started before a request was sent to the device is not joined.
+    release.clear()
+    first = asyncio.create_task(api._call_url(cast(Any, session), wifi))
+    await asyncio.sleep(0)
+    api._send_generation += 1
+    second = asyncio.create_task(api._call_url(cast(Any, session), wifi))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(first, second)
+    assert gets.count("/wifi") == 3
+
+
 @pytest.mark.asyncio
 async def test__call_url_retries_and_sets_error(
     monkeypatch: pytest.MonkeyPatch,
@@ -542,9 +1228,12 @@ async def test_get_initial_data_success_and_in_error(
     api = _make_api(session)
 
     called: list[str] = []
+    offline = False
 
     async def _call_url(_session: Any, source: Any) -> None:
         called.append(str(source.value.get("name")))
+        if offline:
+            api._in_error = True
 
     async def _fetch_config(config_path: str | None = None) -> None:
         called.append(f"config:{config_path}")
@@ -568,10 +1257,14 @@ async def test_get_initial_data_success_and_in_error(
     assert "config:None" in called
     assert "data" in called
 
-    api._in_error = True
+    offline = True
     with pytest.raises(Exception, match=r"Initialization failed"):
         await api.get_initial_data()
 
+    # A later attempt is not failed by the error of the previous one.
+    offline = False
+    await api.get_initial_data()
+
 
 @pytest.mark.asyncio
 async def test_fetch_config_and_fetch_data_queries(
@@ -661,7 +1354,7 @@ async def test_press_delete_and_http_send_variants(
     assert res_bad is None
 
 
-def test_get_data_missing_logs_and_eval_error_paths(
+def test_get_data_missing_logs_and_accessor_error_paths(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     session = _FakeSession()
@@ -683,8 +1376,8 @@ def test_get_data_missing_logs_and_eval_error_paths(
     assert api.get_data("$.still.missing", is_None_possible=True) is None
     assert errs == []
 
-    # Cached eval path that fails: returns None when is_None_possible
-    api._data_db["$.bad"] = "self.data['nope']"
+    # Cached accessor that fails: returns None when is_None_possible
+    api._data_db["$.bad"] = Accessor("$.bad", ("nope",))
     assert api.get_data("$.bad", is_None_possible=True) is None
 
     with pytest.raises(Exception):
@@ -703,7 +1396,7 @@ def test_add_remove_source_cache_and_live_config_update_helpers() -> None:
         api.get_data("$.sources[?(@.name=='/x')].data.a", is_None_possible=True) is None
     )
 
-    api._data_db["k"] = "v"
+    api._data_db["k"] = Accessor("k", ("local",))
     api.clear_cache()
     assert api._data_db == {}
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
 from typing import Any, cast
 
@@ -7,6 +8,7 @@ import pytest
 from typing_extensions import Self
 
 from custom_components.redsea.const import (
+    DEFAULT_TIMEOUT,
     HW_G1_LED_IDS,
     LED_BLUE_INTERNAL_NAME,
     LED_INTENSITY_INTERNAL_NAME,
@@ -15,6 +17,7 @@ from custom_components.redsea.const import (
     LED_WHITE_INTERNAL_NAME,
     VIRTUAL_LED,
 )
+from custom_components.redsea.reefbeat import led as led_module
 from custom_components.redsea.reefbeat.led import ReefLedAPI
 
 
@@ -182,12 +185,17 @@ async def test_probe_path_returns_status_on_success(monkeypatch: Any) -> None:
         async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
             return
 
+    timeouts: list[Any] = []
+
     class _Session:
-        def get(self, *_: Any, **__: Any) -> _Resp:
+        def get(self, *_: Any, **kwargs: Any) -> _Resp:
+            timeouts.append(kwargs.get("timeout"))
             return _Resp()
 
     monkeypatch.setattr(api, "_session", _Session())
     assert await api._probe_path("/ok") == 204
+    # Bounded on its own: the device session has no overall timeout.
+    assert timeouts[0].total == DEFAULT_TIMEOUT
 
 
 @pytest.mark.asyncio
@@ -218,6 +226,252 @@ async def test_apply_runtime_source_patches_preset_name_per_day(
         assert f"/preset_name/{day}" in source_names
 
 
+@pytest.mark.asyncio
+async def test_restore_snapshot_reapplies_firmware_layout(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    previous = _make_led_api(hw="RSLED90")
+
+    async def _rsled90_probe(path: str) -> int:
+        return 404
+
+    monkeypatch.setattr(previous, "_probe_path", _rsled90_probe)
+    await previous._apply_runtime_source_patches()
+    previous.sources.get("/").update(data={"hwid": "abc"})  # type: ignore[union-attr]
+    previous.sources.get("/auto/3").update(data={"intervals": []})  # type: ignore[union-attr]
+    snapshot = previous.snapshot()
+    assert [s["name"] for s in snapshot["sources"]] == ["/", "/auto/3"]
+
+    api = _make_led_api(hw="RSLED90")
+    assert api.restore_snapshot(snapshot) is True
+    assert api._rsled90_patch is True
+    assert "/dashboard" not in api.sources
+    assert api.limiter.limit == 2
+    assert api.get_data("$.sources[?(@.name=='/')].data.hwid") == "abc"
+    assert api.get_data("$.sources[?(@.name=='/auto/3')].data") == {"intervals": []}
+
+    # The probes of the deferred initial fetch do not register sources twice.
+    monkeypatch.setattr(api, "_probe_path", _rsled90_probe)
+    await api._apply_runtime_source_patches()
+    names = [s["name"] for s in cast(list[dict[str, Any]], api.data["sources"])]
+    assert len(names) == len(set(names))
+    assert _make_led_api(hw="RSLED90").restore_snapshot({"sources": []}) is False
+
+
+def _patch_initial_fetch(
+    monkeypatch: pytest.MonkeyPatch, api: ReefLedAPI, firmware: str
+) -> list[str]:
+    """Fake the device: initial fetch reports `firmware`, fetched names recorded."""
+    fetched: list[str] = []
+
+    async def _fake_initial(self: Any) -> dict[str, Any]:
+        self.sources.get("/firmware").update(data={"version": firmware})
+        return self.data
+
+    async def _fake_call_url(session: Any, source: Any) -> None:
+        fetched.append(source.value["name"])
+        source.value["data"] = {"ok": True}
+
+    monkeypatch.setattr(ReefLedAPI.__mro__[1], "get_initial_data", _fake_initial)
+    monkeypatch.setattr(api, "_call_url", _fake_call_url)
+    return fetched
+
+
+@pytest.mark.asyncio
+async def test_cached_layout_skips_probes_until_firmware_changes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    probed: list[str] = []
+
+    async def _rsled90_probe(path: str) -> int:
+        probed.append(path)
+        return 404
+
+    api = _make_led_api(hw="RSLED90")
+    monkeypatch.setattr(api, "_probe_path", _rsled90_probe)
+    assert api.layout is None
+    assert api.use_layout({"rsled90": "yes"}) is False
+    layout = {"rsled90": True, "preset_name_is_single": False, "firmware": "2.1"}
+    assert api.use_layout(layout) is True
+    assert api._rsled90_patch is True
+    assert "/" in api.sources and "/preset_name/7" in api.sources
+
+    _patch_initial_fetch(monkeypatch, api, "2.1")
+    await api.get_initial_data()
+    assert probed == []
+    assert api.layout == layout
+
+    # Same cache, new firmware: the device is probed and new sources fetched.
+    api = _make_led_api(hw="RSLED90")
+    api.use_layout({**layout, "rsled90": False})
+    monkeypatch.setattr(api, "_probe_path", _rsled90_probe)
+    fetched = _patch_initial_fetch(monkeypatch, api, "2.2")
+    await api.get_initial_data()
+    assert probed == ["/dashboard", "/preset_name"]
+    assert api.layout == layout | {"firmware": "2.2"}
+    assert "/dashboard" not in api.sources
+    assert api.limiter.limit == 2
+    assert "/" in fetched
+
+
+@pytest.mark.asyncio
+async def test_cached_layout_reprobes_when_a_layout_source_is_gone(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    api = _make_led_api(hw="RSLED160")
+    api.use_layout(
+        {"rsled90": False, "preset_name_is_single": False, "firmware": "2.1"}
+    )
+    api._source_not_found("/auto/1")
+    assert api._reprobe is False
+    api._source_not_found("/preset_name/1")
+    assert api._reprobe is True
+
+    async def _probe(path: str) -> int:
+        return 200
+
+    monkeypatch.setattr(api, "_probe_path", _probe)
+    fetched = _patch_initial_fetch(monkeypatch, api, "2.1")
+    await api.fetch_data()
+
+    assert api._reprobe is False
+    assert api.layout == {
+        "rsled90": False,
+        "preset_name_is_single": True,
+        "firmware": None,
+    }
+    assert "/preset_name/1" not in api.sources
+    assert "/preset_name" in fetched
+    # Probed layouts are not re-probed on 404s.
+    api._source_not_found("/preset_name")
+    assert api._reprobe is False
+
+
+@pytest.mark.asyncio
+async def test_per_day_sources_are_loaded_a_few_per_poll(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    api = _make_led_api(hw="RSLED50")
+
+    async def _probe(path: str) -> int:
+        return 200
+
+    monkeypatch.setattr(api, "_probe_path", _probe)
+    monkeypatch.setattr(led_module, "_weekday", lambda: 3)
+    fetched: list[str] = []
+
+    async def _fake_call_url(session: Any, source: Any) -> None:
+        fetched.append(source.value["name"])
+        source.value["data"] = {"from": len(fetched)}
+
+    monkeypatch.setattr(api, "_call_url", _fake_call_url)
+
+    await api.get_initial_data()
+    assert [s["name"] for s in api.sources.of_type("lazy")][:2] == [
+        "/auto/1",
+        "/clouds/1",
+    ]
+    assert not {"/auto/1", "/clouds/1"} & set(fetched)
+    assert {"/auto/3", "/clouds/3", "/preset_name"} <= set(fetched)
+
+    # The initial data also loads the first of the other days, from tomorrow.
+    assert {"/auto/4", "/clouds/4", "/auto/5"} <= set(fetched)
+    assert "/clouds/5" not in fetched
+
+    # Reading a day not loaded yet gives no value (and logs no error).
+    caplog.clear()
+    assert api.get_data("$.sources[?(@.name=='/auto/6')].data.name") is None
+    assert not [r for r in caplog.records if r.levelno >= logging.ERROR]
+
+    # The next polls load a few more sources each.
+    fetched.clear()
+    await api.fetch_data()
+    assert [n for n in fetched if n.count("/") == 2] == [
+        "/auto/6",
+        "/clouds/5",
+        "/clouds/6",
+    ]
+    for _ in range(5):
+        await api.fetch_data()
+    assert all(api._is_loaded(n) for d in range(1, 8) for n in api._day_sources(d))
+
+    # Loaded: not fetched again, until a config refresh marks them stale.
+    fetched.clear()
+    await api.fetch_data()
+    assert not [n for n in fetched if n.count("/") == 2]
+    await api.fetch_config()
+    assert {"/auto/3", "/clouds/3"} <= set(fetched)
+    assert "/auto/6" not in fetched
+    assert api.get_data("$.sources[?(@.name=='/auto/6')].data") is not None
+    fetched.clear()
+    await api.fetch_data()
+    assert len([n for n in fetched if n.count("/") == 2]) == 3
+
+
+@pytest.mark.asyncio
+async def test_per_day_sources_are_refreshed_slowly_in_live_config_mode(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    api = _make_led_api(hw="RSLED50")
+    api.set_live_config_update(True)
+    api._apply_layout(False, True)
+    monkeypatch.setattr(led_module, "_weekday", lambda: 3)
+    fetched: list[str] = []
+
+    async def _fake_call_url(session: Any, source: Any) -> None:
+        name = source.value["name"]
+        fetched.append(name)
+        source.value["data"] = {"from": name}
+        api.scheduler.record(name, False)
+
+    monkeypatch.setattr(api, "_call_url", _fake_call_url)
+
+    def _day_fetches() -> list[str]:
+        return [n for n in fetched if n.count("/") == 2]
+
+    for _ in range(7):
+        await api.fetch_data()
+    assert len(set(_day_fetches())) == 14
+    assert len(_day_fetches()) == 14
+
+    # Loaded sources come back once their polling period elapsed.
+    period = api.scheduler.period("/auto/4")
+    assert period > 1
+    fetched.clear()
+    for _ in range(period - 7):
+        await api.fetch_data()
+    assert not _day_fetches()
+    for _ in range(7):
+        await api.fetch_data()
+    assert "/auto/4" in _day_fetches()
+
+
+@pytest.mark.asyncio
+async def test_preset_name_is_refreshed_in_live_config_mode(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    api = _make_led_api(hw="RSLED50")
+    api.set_live_config_update(True)
+    api._apply_layout(False, True)
+    fetched: list[str] = []
+
+    async def _fake_call_url(session: Any, source: Any) -> None:
+        name = source.value["name"]
+        fetched.append(name)
+        source.value["data"] = {"name": "Reef"}
+        api.scheduler.record(name, False)
+
+    monkeypatch.setattr(api, "_call_url", _fake_call_url)
+
+    period = api.scheduler.period("/preset_name")
+    assert period > 0
+    for _ in range(period + 1):
+        await api.fetch_data()
+
+    # A rename made in the app is picked up without a config refresh.
+    assert fetched.count("/preset_name") == 2
+
+
 def test_update_acclimation_copies_fields_when_present() -> None:
     api = _make_led_api(hw=VIRTUAL_LED)
     api.add_source(
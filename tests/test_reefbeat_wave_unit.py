@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+import pytest
+
+from custom_components.redsea.const import WAVE_UPLOAD_BATCH_MAX, WAVE_UPLOAD_REPROBE
+from custom_components.redsea.reefbeat.wave import ReefWaveAPI
+
+
+class _FakeResponse:
+    """Minimal aiohttp response stub for unit tests."""
+
+    reason = ""
+    headers: dict[str, str] = {"Content-Type": "application/json"}
+
+    def __init__(self, status: int) -> None:
+        self.status = status
+
+    async def __aenter__(self) -> _FakeResponse:
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        if self.status >= 400:
+            return b'{"error": "could not parse the received JSON"}'
+        return b"{}"
+
+
+@dataclass
+class _FakeDevice:
+    """Wave taking at most `max_intervals` schedule intervals per request."""
+
+    max_intervals: int
+    sent: list[tuple[str, Any]] = field(default_factory=list)
+
+    def post(self, url: str, *, json: Any = None, **_kw: Any) -> _FakeResponse:
+        action = url.split("192.0.2.40", 1)[1]
+        self.sent.append((action, json))
+        if action == "/auto" and len(json["intervals"]) > self.max_intervals:
+            return _FakeResponse(400)
+        return _FakeResponse(200)
+
+
+def _api(max_intervals: int) -> tuple[Any, list]:
+    """Return a wave API whose device parses at most `max_intervals` at once."""
+    device = _FakeDevice(max_intervals)
+    api = ReefWaveAPI(
+        ip="192.0.2.40", live_config_update=False, session=cast(Any, device)
+    )
+    return api, device.sent
+
+
+def _intervals(count: int) -> list[dict[str, Any]]:
+    return [{"st": 60 * i, "wave_uid": f"w{i}"} for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_upload_schedule_sends_whole_schedule_to_newer_firmware() -> None:
+    api, sent = _api(max_intervals=WAVE_UPLOAD_BATCH_MAX)
+
+    assert await api.upload_schedule("uid-1", _intervals(5)) is True
+
+    assert [action for action, _payload in sent] == [
+        "/auto/init",
+        "/auto",
+        "/auto/complete",
+        "/auto/apply",
+    ]
+    assert sent[0][1] == {"uid": "uid-1"}
+    assert len(sent[1][1]["intervals"]) == 5
+    # Only the size actually accepted is learned.
+    assert api.layout == {"upload_batch": 5, "firmware": None}
+    assert api.last_schedule_upload["ok"] is True
+    assert api.last_schedule_upload["requests"] == 4
+
+
+@pytest.mark.asyncio
+async def test_upload_schedule_learns_and_reuses_the_batch_size() -> None:
+    api, sent = _api(max_intervals=2)
+    intervals = _intervals(5)
+
+    assert await api.upload_schedule("uid-1", intervals) is True
+
+    # Rejected batches are sent again, halved; accepted ones are not resent.
+    chunks = [p["intervals"] for action, p in sent if action == "/auto"]
+    assert [len(c) for c in chunks] == [5, 2, 2, 1]
+    assert [i for c in chunks[1:] for i in c] == intervals
+    assert api.layout == {"upload_batch": 2, "firmware": None}
+
+    # The learned size is used from the start, including by the next run.
+    fresh, fresh_sent = _api(max_intervals=2)
+    assert fresh.use_layout(cast(dict[str, Any], api.layout)) is True
+    assert await fresh.upload_schedule("uid-2", intervals) is True
+    chunks = [p["intervals"] for action, p in fresh_sent if action == "/auto"]
+    assert [len(c) for c in chunks] == [2, 2, 1]
+
+    # Learned again once the firmware changed.
+    fresh_sent.clear()
+    fresh.set_data("$.sources[?(@.name=='/firmware')].data", {"version": "2.0"})
+    assert await fresh.upload_schedule("uid-3", intervals) is True
+    chunks = [p["intervals"] for action, p in fresh_sent if action == "/auto"]
+    assert [len(c) for c in chunks] == [5, 2, 2, 1]
+    assert fresh.layout == {"upload_batch": 2, "firmware": "2.0"}
+
+
+@pytest.mark.asyncio
+async def test_upload_schedule_probes_a_larger_batch_again() -> None:
+    api, sent = _api(max_intervals=2)
+    intervals = _intervals(5)
+    assert await api.upload_schedule("uid-1", intervals) is True
+    assert api.layout == {"upload_batch": 2, "firmware": None}
+
+    # The rejection was a one-off: the size grows back, one probe at a time.
+    api._session.max_intervals = WAVE_UPLOAD_BATCH_MAX
+    for _ in range(WAVE_UPLOAD_REPROBE - 1):
+        assert await api.upload_schedule("uid-2", intervals) is True
+    assert api.layout == {"upload_batch": 2, "firmware": None}
+
+    sent.clear()
+    assert await api.upload_schedule("uid-3", intervals) is True
+    chunks = [p["intervals"] for action, p in sent if action == "/auto"]
+    assert [len(c) for c in chunks] == [4, 1]
+    assert api.layout == {"upload_batch": 4, "firmware": None}
+
+    # A rejected probe falls back to the size still accepted.
+    api._session.max_intervals = 4
+    for _ in range(WAVE_UPLOAD_REPROBE - 1):
+        assert await api.upload_schedule("uid-4", intervals) is True
+    sent.clear()
+    assert await api.upload_schedule("uid-5", intervals) is True
+    chunks = [p["intervals"] for action, p in sent if action == "/auto"]
+    assert [len(c) for c in chunks] == [5, 4, 1]
+    assert api.layout == {"upload_batch": 4, "firmware": None}
+
+
+@pytest.mark.asyncio
+async def test_upload_schedule_is_not_applied_when_an_interval_fails() -> None:
+    api, sent = _api(max_intervals=0)
+
+    assert await api.upload_schedule("uid-1", _intervals(2)) is False
+
+    assert [action for action, _payload in sent] == ["/auto/init", "/auto", "/auto"]
+    assert api.layout is None
+    assert api.last_schedule_upload["ok"] is False
+    assert api.use_layout({"upload_batch": 0}) is False
+
+
+@pytest.mark.asyncio
+async def test_upload_schedule_rejected_batch_is_not_retried_nor_reported(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    api, sent = _api(max_intervals=2)
+
+    assert await api.upload_schedule("uid-1", _intervals(3)) is True
+
+    chunks = [p["intervals"] for action, p in sent if action == "/auto"]
+    assert [len(c) for c in chunks] == [3, 1, 1, 1]
+    assert not [r for r in caplog.records if r.levelno >= logging.ERROR]
+    assert not api.data["message"].get("alert")
+    assert not api.offline
+
+
+@pytest.mark.asyncio
+async def test_upload_schedule_retries_a_batch_the_device_did_not_answer(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    api, sent = _api(max_intervals=WAVE_UPLOAD_BATCH_MAX)
+    once: list[str] = []
+
+    async def _http_send_once(action: str, payload: Any = None) -> None:
+        once.append(action)
+
+    monkeypatch.setattr(api, "http_send_once", _http_send_once)
+
+    assert await api.upload_schedule("uid-1", _intervals(5)) is True
+
+    # Sent again through the retrying path, at the same size.
+    assert once == ["/auto"]
+    chunks = [p["intervals"] for action, p in sent if action == "/auto"]
+    assert [len(c) for c in chunks] == [5]
+    assert api.layout == {"upload_batch": 5, "firmware": None}
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from custom_components.redsea.schedule import (
+    MINUTES_PER_DAY,
+    ScheduleIndex,
+    ScheduleIndexes,
+)
+
+
+def _linear(schedule: list[dict[str, Any]], minute: int) -> int:
+    """The former scan: last segment started before `minute`."""
+    idx = 0
+    for i, prog in enumerate(schedule[1:], start=1):
+        if int(prog["st"]) < minute:
+            idx = i
+        else:
+            break
+    return idx
+
+
+@pytest.mark.parametrize(
+    "starts",
+    [[0, 600, 900], [120, 600, 600, 1400], [300, 100, 900], [0]],
+)
+def test_index_matches_linear_scan_and_transitions(starts: list[int]) -> None:
+    schedule = [{"st": st} for st in starts]
+    index = ScheduleIndex(schedule)
+    linear = [_linear(schedule, minute) for minute in range(MINUTES_PER_DAY)]
+
+    for minute, current in enumerate(linear):
+        assert index.index_at(minute) == current
+
+        change = next(
+            (m for m in range(minute + 1, MINUTES_PER_DAY) if linear[m] != current),
+            None,
+        )
+        if change is None and linear[0] != current:
+            change = MINUTES_PER_DAY
+        assert index.next_transition(minute) == change
+
+
+def test_empty_schedule_and_cache_rebuild() -> None:
+    assert ScheduleIndex([]).current(600) is None
+    assert ScheduleIndex([]).next_transition(600) is None
+
+    indexes = ScheduleIndexes()
+    first = [{"st": 0, "v": 1}, {"st": 600, "v": 2}]
+    index = indexes.get("$.s", first)
+    assert indexes.get("$.s", first) is index
+    assert index.current(700) == {"st": 600, "v": 2}
+
+    # A new payload object (fetched) is indexed again.
+    assert indexes.get("$.s", [{"st": 0, "v": 3}]).current(700) == {"st": 0, "v": 3}
+    indexes.clear()
+    assert indexes.get("$.s", first) is not index
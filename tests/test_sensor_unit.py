@@ -261,6 +261,23 @@ def test_wifi_quality_without_signal_is_unavailable(signal: Any) -> None:
     assert entity.available is False
 
 
+def test_request_metric_sensors_read_none_without_metrics() -> None:
+    descs = {
+        d.key: d for d in sensor_platform.COMMON_SENSORS if d.key.startswith("request_")
+    }
+    assert set(descs) == {
+        "request_latency_p50",
+        "request_latency_p95",
+        "request_failure_rate",
+    }
+    device = SimpleNamespace(request_metrics=None)
+    for desc in descs.values():
+        assert isinstance(desc, ReefBeatSensorEntityDescription)
+        assert desc.value_fn is not None
+        assert desc.exists_fn(cast(Any, device)) is False
+        assert desc.value_fn(cast(Any, device)) is None
+
+
 def test_handle_coordinator_update_updates_and_calls_base(monkeypatch: Any) -> None:
     called: list[str] = []
 
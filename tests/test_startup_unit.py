@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Any, cast
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.redsea.reefbeat import ReefBeatAPI
+from custom_components.redsea.startup import (
+    DATA_STARTUP,
+    StartupOrchestrator,
+    async_join_startup,
+    async_leave_startup,
+    async_remove_setup_time,
+)
+
+
+async def _run(
+    orchestrator: StartupOrchestrator,
+    entry_id: str,
+    log: list[tuple[str, str]],
+    delays: dict[str, float] | None = None,
+) -> None:
+    gate = orchestrator.join(entry_id)
+    assert gate is not None
+    for phase in ("device-info", "config", "data"):
+        async with gate.phase(phase):
+            log.append((entry_id, phase))
+            await asyncio.sleep((delays or {}).get(phase, 0))
+    gate.close(1.0)
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_runs_each_phase_for_all_entries_first(
+    hass: HomeAssistant,
+) -> None:
+    orchestrator = StartupOrchestrator(hass, ["a", "b", "c"], concurrency=3)
+    log: list[tuple[str, str]] = []
+
+    await asyncio.gather(
+        _run(orchestrator, "a", log),
+        _run(orchestrator, "b", log, {"device-info": 0.05}),
+        _run(orchestrator, "c", log),
+    )
+
+    phases = [phase for _entry, phase in log]
+    assert phases == ["device-info"] * 3 + ["config"] * 3 + ["data"] * 3
+    assert orchestrator.setup_times == {"a": 1.0, "b": 1.0, "c": 1.0}
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_budget_serves_fastest_entries_first(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    hass_storage["redsea_startup"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "redsea_startup",
+        "data": {"setup_times": {"slow": 9.0, "fast": 0.5}},
+    }
+    orchestrator = StartupOrchestrator(
+        hass, ["slow", "new", "fast", "busy"], concurrency=1
+    )
+    await orchestrator.async_load()
+    hass.data[DATA_STARTUP] = orchestrator
+    log: list[tuple[str, str]] = []
+
+    # "busy" holds the only slot while the others queue up.
+    busy = async_join_startup(hass, "busy")
+    assert busy is not None
+    async with busy.phase("device-info"):
+        tasks = [
+            asyncio.create_task(_run(orchestrator, entry_id, log))
+            for entry_id in ("slow", "new", "fast")
+        ]
+        await asyncio.sleep(0)
+        # Entries outside of the startup fetch directly.
+        assert async_join_startup(hass, "reloaded") is None
+    busy.close(2.0)
+    await asyncio.gather(*tasks)
+
+    assert [entry for entry, phase in log if phase == "device-info"] == [
+        "fast",
+        "slow",
+        "new",
+    ]
+    assert DATA_STARTUP not in hass.data
+    await hass.async_block_till_done()
+    assert orchestrator.stats()["setup_times"]["busy"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_stops_waiting_for_failed_and_missing_entries(
+    hass: HomeAssistant,
+) -> None:
+    orchestrator = StartupOrchestrator(hass, ["ok", "failed", "missing"], phase_wait=30)
+    hass.data[DATA_STARTUP] = orchestrator
+    log: list[tuple[str, str]] = []
+
+    task = asyncio.create_task(_run(orchestrator, "ok", log))
+    await asyncio.sleep(0)
+    assert log == [("ok", "device-info")]
+
+    # Coordinator creation failed: no initial fetch to wait for.
+    async_leave_startup(hass, "failed")
+    # Home Assistant started without setting up the last one.
+    orchestrator.async_started()
+    await asyncio.wait_for(task, 1)
+
+    assert [phase for _entry, phase in log] == ["device-info", "config", "data"]
+    assert DATA_STARTUP not in hass.data
+
+
+@pytest.mark.asyncio
+async def test_removed_entry_setup_time_is_deleted(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    hass_storage["redsea_startup"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "redsea_startup",
+        "data": {"setup_times": {"gone": 2.0, "kept": 0.5}},
+    }
+
+    await async_remove_setup_time(hass, "gone")
+    assert hass_storage["redsea_startup"]["data"] == {"setup_times": {"kept": 0.5}}
+
+    # Not saved again by a startup still running.
+    orchestrator = StartupOrchestrator(hass, ["gone", "kept"])
+    await orchestrator.async_load()
+    hass_storage["redsea_startup"]["data"]["setup_times"]["gone"] = 2.0
+    hass.data[DATA_STARTUP] = orchestrator
+    await async_remove_setup_time(hass, "gone")
+    gate = orchestrator.join("kept")
+    assert gate is not None
+    gate.close(1.0)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert hass_storage["redsea_startup"]["data"] == {"setup_times": {"kept": 1.0}}
+
+
+@pytest.mark.asyncio
+async def test_get_initial_data_runs_each_step_in_its_startup_phase(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    api = ReefBeatAPI(
+        ip="192.0.2.1", live_config_update=False, session=cast(Any, object())
+    )
+    called: list[str] = []
+
+    class _Gate:
+        @asynccontextmanager
+        async def phase(self, name: str) -> AsyncIterator[None]:
+            called.append(f"enter:{name}")
+            yield
+            called.append(f"exit:{name}")
+
+    async def _call_url(_session: Any, source: Any) -> None:
+        called.append(str(source.value["name"]))
+
+    async def _fetch_config(config_path: str | None = None) -> None:
+        called.append("config")
+
+    async def _fetch_data() -> dict[str, Any]:
+        called.append("data")
+        return api.data
+
+    monkeypatch.setattr(api, "_call_url", _call_url)
+    monkeypatch.setattr(api, "fetch_config", _fetch_config)
+    monkeypatch.setattr(api, "fetch_data", _fetch_data)
+    api.startup_gate = _Gate()
+
+    await api.get_initial_data()
+
+    assert called == [
+        "enter:device-info",
+        "/device-info",
+        "exit:device-info",
+        "enter:config",
+        "config",
+        "exit:config",
+        "enter:data",
+        "data",
+        "exit:data",
+    ]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any, Mapping, MutableMapping
 
 from homeassistant.core import HomeAssistant
@@ -25,3 +26,7 @@ class MockConfigEntry:
         source: str | None = ...,
     ) -> None: ...
     def add_to_hass(self, hass: HomeAssistant) -> None: ...
+
+def async_fire_time_changed(
+    hass: HomeAssistant, datetime_: datetime | None = ..., fire_all: bool = ...
+) -> None: ...